@@ -0,0 +1,64 @@
+"""Benchmark polling an order book with and without :class:`bitex.changes.ChangeDetector`.
+
+Polls an order book served by :class:`bitex.memory.InMemoryAdapter`, whose
+body changes only every `--change-every` polls, and parses each response via
+:meth:`json`. Reports the time per poll, and how many responses were unchanged::
+
+    python benchmarks/bench_changes.py --levels 500 --change-every 10
+"""
+# Built-in
+import argparse
+import json
+import time
+from typing import List, Optional
+
+# Home-brew
+from bitex.changes import ChangeDetector
+from bitex.memory import InMemoryAdapter
+from bitex.session import BitexSession
+
+
+def books(levels: int, count: int) -> List[bytes]:
+    return [
+        json.dumps(
+            {
+                "bids": [[f"{9500 - i * 0.1 + n:.1f}", "1.5"] for i in range(levels)],
+                "asks": [[f"{9500.1 + i * 0.1 + n:.1f}", "1.5"] for i in range(levels)],
+            }
+        ).encode()
+        for n in range(count)
+    ]
+
+
+def run(changes: Optional[ChangeDetector], bodies: List[bytes], polls: int, every: int) -> float:
+    adapter = InMemoryAdapter()
+    polled = iter(range(polls))
+    adapter.route("uberex", "book", handler=lambda request: bodies[next(polled) // every])
+    session = BitexSession(changes=changes)
+    session.trust_env = False
+    adapter.install(session)
+    session.freeze()
+    started = time.perf_counter()
+    for _ in range(polls):
+        session.request("GET", "uberex://BTCUSD/book").json()
+    return (time.perf_counter() - started) / polls
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--levels", type=int, default=500)
+    parser.add_argument("--polls", type=int, default=2000)
+    parser.add_argument("--change-every", type=int, default=10)
+    args = parser.parse_args()
+
+    bodies = books(args.levels, args.polls // args.change_every + 1)
+    changes = ChangeDetector()
+    print(f"{'detection':<10} {'us/poll':>8} {'unchanged':>9}")
+    for name, detector in (("off", None), ("on", changes)):
+        seconds = run(detector, bodies, args.polls, args.change_every)
+        unchanged = changes.stats()["unchanged"] if detector else 0
+        print(f"{name:<10} {seconds * 1e6:>8.1f} {unchanged:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Benchmark the JSON codecs of :mod:`bitex.codec` on realistic payloads.
+
+Decodes a synthetic order book (price/size levels encoded as strings, as most
+exchanges do) and a list of trades (numbers encoded as JSON numbers), with every
+installed codec and number mode::
+
+    python benchmarks/bench_codec.py --levels 1000 --trades 1000
+"""
+# Built-in
+import argparse
+import json
+import random
+import timeit
+
+# Home-brew
+from bitex.codec import CODECS, NUMBER_MODES
+
+
+def order_book(levels: int) -> bytes:
+    mid = 38091.5
+    book = {
+        "bids": [
+            [f"{mid - i * 0.1:.1f}", f"{random.uniform(0, 5):.8f}", 1590000000 + i]
+            for i in range(levels)
+        ],
+        "asks": [
+            [f"{mid + i * 0.1:.1f}", f"{random.uniform(0, 5):.8f}", 1590000000 + i]
+            for i in range(levels)
+        ],
+    }
+    return json.dumps({"error": [], "result": {"XXBTZUSD": book}}).encode()
+
+
+def trades(count: int) -> bytes:
+    return json.dumps(
+        [
+            {
+                "id": 1000000 + i,
+                "price": round(38091.5 + random.uniform(-50, 50), 1),
+                "amount": round(random.uniform(0, 5), 8),
+                "timestamp": 1590000000.123 + i,
+                "side": random.choice(("buy", "sell")),
+            }
+            for i in range(count)
+        ]
+    ).encode()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--levels", type=int, default=1000)
+    parser.add_argument("--trades", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    payloads = {"book": order_book(args.levels), "trades": trades(args.trades)}
+    print(f"{'payload':<8} {'codec':<8} {'numbers':<8} {'bytes':>9} {'µs/decode':>10} {'MB/s':>8}")
+    for payload_name, payload in payloads.items():
+        for codec_name, codec_class in CODECS.items():
+            for numbers in NUMBER_MODES:
+                codec = codec_class(numbers)
+                seconds = timeit.timeit(lambda: codec.loads(payload), number=args.repeat)
+                per_call = seconds / args.repeat
+                print(
+                    f"{payload_name:<8} {codec_name:<8} {numbers:<8} {len(payload):>9} "
+                    f"{per_call * 1e6:>10.1f} {len(payload) / per_call / 1e6:>8.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
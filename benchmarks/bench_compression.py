@@ -0,0 +1,117 @@
+"""Benchmark the bandwidth/CPU trade-off of the encodings of :mod:`bitex.compression`.
+
+Compresses recorded payloads (or a synthetic order book and list of trades, if
+none are given) with every available encoding, and decodes them the way
+:mod:`requests` reads a response body: streamed through urllib3 in 10 KiB
+chunks. Reports the compression ratio, the decoding time, and the total time
+to transfer and decode each payload at the given bandwidth::
+
+    python benchmarks/bench_compression.py recorded/kraken-book.json --mbits 50
+"""
+# Built-in
+import argparse
+import gzip
+import io
+import json
+import pathlib
+import random
+import timeit
+import zlib
+from typing import Callable, Dict
+
+# Third-party
+import urllib3.response
+from urllib3.response import HTTPResponse
+
+# Home-brew
+from bitex.compression import available_encodings
+
+
+def compressors() -> Dict[str, Callable[[bytes], bytes]]:
+    available = {
+        "identity": bytes,
+        "gzip": gzip.compress,
+        "deflate": zlib.compress,
+    }
+    if "br" in available_encodings():
+        available["br"] = urllib3.response.brotli.compress
+    if "zstd" in available_encodings():
+        try:
+            from compression import zstd
+        except ImportError:
+            import zstandard as zstd
+        available["zstd"] = zstd.compress
+    return available
+
+
+def order_book(levels: int) -> bytes:
+    mid = 38091.5
+    book = {
+        side: [
+            [f"{mid + sign * i * 0.1:.1f}", f"{random.uniform(0, 5):.8f}", 1590000000 + i]
+            for i in range(levels)
+        ]
+        for side, sign in (("bids", -1), ("asks", 1))
+    }
+    return json.dumps({"error": [], "result": {"XXBTZUSD": book}}).encode()
+
+
+def trades(count: int) -> bytes:
+    return json.dumps(
+        [
+            {
+                "id": 1000000 + i,
+                "price": round(38091.5 + random.uniform(-50, 50), 1),
+                "amount": round(random.uniform(0, 5), 8),
+                "timestamp": 1590000000.123 + i,
+                "side": random.choice(("buy", "sell")),
+            }
+            for i in range(count)
+        ]
+    ).encode()
+
+
+def read(body: bytes, encoding: str) -> bytes:
+    raw = HTTPResponse(
+        body=io.BytesIO(body),
+        headers={"Content-Encoding": encoding},
+        status=200,
+        preload_content=False,
+    )
+    return b"".join(raw.stream(10 * 1024, decode_content=True))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("payloads", nargs="*", type=pathlib.Path)
+    parser.add_argument("--levels", type=int, default=5000)
+    parser.add_argument("--trades", type=int, default=5000)
+    parser.add_argument("--mbits", type=float, default=50.0, help="Bandwidth in Mbit/s.")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    if args.payloads:
+        payloads = {path.name: path.read_bytes() for path in args.payloads}
+    else:
+        payloads = {"book": order_book(args.levels), "trades": trades(args.trades)}
+    bytes_per_second = args.mbits * 1e6 / 8
+
+    print(
+        f"{'payload':<16} {'encoding':<9} {'bytes':>10} {'ratio':>6} "
+        f"{'ms/decode':>10} {'ms total':>9}"
+    )
+    for name, payload in payloads.items():
+        for encoding, compress in compressors().items():
+            body = compress(payload)
+            assert read(body, encoding) == payload
+            seconds = timeit.timeit(lambda: read(body, encoding), number=args.repeat)
+            decode = seconds / args.repeat
+            total = len(body) / bytes_per_second + decode
+            print(
+                f"{name:<16} {encoding:<9} {len(body):>10} {len(payload) / len(body):>6.1f} "
+                f"{decode * 1e3:>10.3f} {total * 1e3:>9.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Benchmark building one table from many rows via :class:`bitex.frame.FrameBuilder`.
+
+Compares accumulating ticker rows, as returned by :meth:`key_value_dict`, in
+a list of dicts and converting them into typed columns afterwards, against
+appending them to a :class:`FrameBuilder`. Generating the rows is included. Reports the time taken and the
+peak memory traced by :mod:`tracemalloc`, for 1e3 to 1e6 rows. If pandas is
+installed, both are finalized into a :class:`pandas.DataFrame`::
+
+    python benchmarks/bench_frame.py --rows 1000 10000 100000 1000000
+"""
+# Built-in
+import argparse
+import time
+import tracemalloc
+from array import array
+from typing import Any, Callable, Dict, Iterator, Tuple
+
+# Home-brew
+from bitex.frame import FrameBuilder
+
+try:
+    # Third-party
+    import pandas
+except ImportError:
+    pandas = None
+
+
+NUMERIC = ("bid", "bid_size", "ask", "ask_size", "last")
+
+
+def rows(count: int) -> Iterator[Dict[str, Any]]:
+    for i in range(count):
+        yield {
+            "pair": "BTCUSD",
+            "bid": f"{9500 + i % 1000 / 10:.1f}",
+            "bid_size": "1.5",
+            "ask": f"{9500.1 + i % 1000 / 10:.1f}",
+            "ask_size": "2.25",
+            "last": f"{9500 + i % 1000 / 10:.1f}",
+            "timestamp": 1590000000 + i,
+        }
+
+
+def list_of_dicts(count: int) -> Any:
+    collected = list(rows(count))
+    if pandas is not None:
+        df = pandas.DataFrame(collected)
+        return df.astype({name: float for name in NUMERIC})
+    columns = {name: [row[name] for row in collected] for name in collected[0]}
+    for name in NUMERIC:
+        columns[name] = array("d", map(float, columns[name]))
+    return columns
+
+
+def frame_builder(count: int) -> Any:
+    builder = FrameBuilder()
+    builder.extend(rows(count))
+    if pandas is not None:
+        return builder.to_pandas()
+    return builder.to_columns()
+
+
+def measure(build: Callable[[int], Any], count: int) -> Tuple[float, int]:
+    """Return the seconds taken by `build`, and its peak traced memory, in separate runs."""
+    started = time.perf_counter()
+    build(count)
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    result = build(count)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del result
+    return elapsed, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000, 1000000])
+    args = parser.parse_args()
+
+    print(f"finalized into {'pandas.DataFrame' if pandas is not None else 'columns'}")
+    print(f"{'rows':>8} {'method':<14} {'seconds':>8} {'peak MiB':>9}")
+    for count in args.rows:
+        for name, build in (("list of dicts", list_of_dicts), ("FrameBuilder", frame_builder)):
+            elapsed, peak = measure(build, count)
+            print(f"{count:>8} {name:<14} {elapsed:>8.3f} {peak / 2 ** 20:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
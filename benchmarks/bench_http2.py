@@ -0,0 +1,152 @@
+"""Benchmark :class:`bitex.http2.BitexHTTP2Adapter` against :class:`bitex.BitexHTTPAdapter`.
+
+Starts a local server speaking both HTTP/1.1 and cleartext HTTP/2 (prior
+knowledge), then issues the same number of concurrent requests through a
+:class:`bitex.BitexSession` using either adapter. Reports request latency
+percentiles and the number of TCP connections the server accepted.
+
+Requires the `http2` extra (``pip install bitex-framework[http2]``)::
+
+    python benchmarks/bench_http2.py --requests 2000 --concurrency 50
+"""
+# Built-in
+import argparse
+import asyncio
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Third-party
+import h2.config
+import h2.connection
+import h2.events
+
+# Home-brew
+from bitex import BitexHTTPAdapter, BitexSession
+from bitex.http2 import BitexHTTP2Adapter
+
+PREFACE = b"PRI * HTTP/2.0\r\n\r\nSM\r\n\r\n"
+BODY = b'{"bids": [["3809.0", "1.0"]], "asks": [["3809.1", "2.0"]]}' * 20
+
+
+class LocalServer:
+    """Tiny asyncio server answering every request with :data:`BODY`."""
+
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+        self.connections = 0
+        self.port = None
+        self._loop = asyncio.new_event_loop()
+        self._started = threading.Event()
+
+    def start(self) -> None:
+        threading.Thread(target=self._run, daemon=True).start()
+        self._started.wait()
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        server = self._loop.run_until_complete(
+            asyncio.start_server(self._handle, "127.0.0.1", 0)
+        )
+        self.port = server.sockets[0].getsockname()[1]
+        self._started.set()
+        self._loop.run_forever()
+
+    async def _handle(self, reader, writer) -> None:
+        self.connections += 1
+        start = await reader.readexactly(len(PREFACE))
+        if start == PREFACE:
+            await self._serve_h2(start, reader, writer)
+        else:
+            await self._serve_h1(start, reader, writer)
+
+    async def _serve_h1(self, data, reader, writer) -> None:
+        while True:
+            while b"\r\n\r\n" not in data:
+                chunk = await reader.read(65536)
+                if not chunk:
+                    return writer.close()
+                data += chunk
+            _, data = data.split(b"\r\n\r\n", 1)
+            await asyncio.sleep(self.delay)
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                b"Content-Length: %d\r\n\r\n%s" % (len(BODY), BODY)
+            )
+            await writer.drain()
+
+    async def _serve_h2(self, data, reader, writer) -> None:
+        conn = h2.connection.H2Connection(h2.config.H2Configuration(client_side=False))
+        conn.initiate_connection()
+        lock = asyncio.Lock()
+
+        async def respond(stream_id):
+            await asyncio.sleep(self.delay)
+            async with lock:
+                conn.send_headers(
+                    stream_id,
+                    [
+                        (":status", "200"),
+                        ("content-type", "application/json"),
+                        ("content-length", str(len(BODY))),
+                    ],
+                )
+                conn.send_data(stream_id, BODY, end_stream=True)
+                writer.write(conn.data_to_send())
+                await writer.drain()
+
+        while True:
+            for event in conn.receive_data(data):
+                if isinstance(event, h2.events.RequestReceived):
+                    asyncio.ensure_future(respond(event.stream_id))
+            writer.write(conn.data_to_send())
+            await writer.drain()
+            data = await reader.read(65536)
+            if not data:
+                return writer.close()
+
+
+def run(adapter, url: str, requests: int, concurrency: int):
+    session = BitexSession()
+    session.mount("http://", adapter)
+
+    def timed_get(_):
+        start = time.perf_counter()
+        session.get(url).content
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(concurrency) as pool:
+        start = time.perf_counter()
+        latencies = sorted(pool.map(timed_get, range(requests)))
+        elapsed = time.perf_counter() - start
+    session.close()
+    return latencies, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--delay", type=float, default=0.005, help="server-side latency (s)")
+    args = parser.parse_args()
+
+    print(f"{'transport':<10} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'connections':>12}")
+    for name, adapter in (
+        ("HTTP/1.1", BitexHTTPAdapter(pool_maxsize=args.concurrency)),
+        ("HTTP/2", BitexHTTP2Adapter(prior_knowledge=True)),
+    ):
+        server = LocalServer(args.delay)
+        server.start()
+        url = f"http://127.0.0.1:{server.port}/ticker"
+        latencies, elapsed = run(adapter, url, args.requests, args.concurrency)
+        p50 = statistics.median(latencies) * 1000
+        p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+        print(
+            f"{name:<10} {args.requests / elapsed:>8.0f} {p50:>8.2f} {p99:>8.2f} "
+            f"{server.connections:>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
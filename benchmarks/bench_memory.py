@@ -0,0 +1,75 @@
+"""Benchmark the request rate of a session on :class:`bitex.memory.InMemoryAdapter`.
+
+Sends ticker requests through a :class:`BitexSession` whose transport is an
+in-memory adapter, so only the client-side overhead of preparing requests and
+building responses is measured. Compares a default session against one with
+:attr:`trust_env` disabled, one that is additionally frozen, and sending a
+prepared request to the adapter directly::
+
+    python benchmarks/bench_memory.py --requests 100000
+"""
+# Built-in
+import argparse
+import time
+from typing import Callable, Dict
+
+# Home-brew
+from bitex.memory import InMemoryAdapter
+from bitex.request import BitexRequest
+from bitex.session import BitexSession
+
+TICKER = b'{"pair": "BTCUSD", "bid": "9500.1", "ask": "9500.2", "timestamp": 1590000000}'
+
+
+def session_with(adapter: InMemoryAdapter, trust_env: bool, frozen: bool) -> BitexSession:
+    session = BitexSession()
+    session.trust_env = trust_env
+    adapter.install(session)
+    return session.freeze() if frozen else session
+
+
+def run(session: BitexSession, requests: int, parse: bool) -> float:
+    started = time.perf_counter()
+    for _ in range(requests):
+        response = session.request("GET", "uberex://BTCUSD/ticker")
+        if parse:
+            response.json()
+    return requests / (time.perf_counter() - started)
+
+
+def replay(adapter: InMemoryAdapter, session: BitexSession, requests: int, parse: bool) -> float:
+    prepared = session.prepare_request(BitexRequest(method="GET", url="uberex://BTCUSD/ticker"))
+    started = time.perf_counter()
+    for _ in range(requests):
+        response = adapter.send(prepared)
+        if parse:
+            response.json()
+    return requests / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=100000)
+    parser.add_argument("--parse", action="store_true", help="Also parse the JSON bodies.")
+    args = parser.parse_args()
+
+    adapter = InMemoryAdapter()
+    adapter.route("uberex", "ticker", handler=lambda request: TICKER)
+    setups: Dict[str, Callable[[], BitexSession]] = {
+        "default": lambda: session_with(adapter, trust_env=True, frozen=False),
+        "trust_env=False": lambda: session_with(adapter, trust_env=False, frozen=False),
+        "frozen": lambda: session_with(adapter, trust_env=False, frozen=True),
+    }
+    print(f"{'session':<16} {'req/s':>9} {'us/request':>11}")
+    for name, setup in setups.items():
+        session = setup()
+        # Warm up the caches of the session and the adapter.
+        run(session, min(args.requests, 1000), args.parse)
+        rate = run(session, args.requests, args.parse)
+        print(f"{name:<16} {rate:>9.0f} {1e6 / rate:>11.1f}")
+    rate = replay(adapter, session, args.requests, args.parse)
+    print(f"{'adapter only':<16} {rate:>9.0f} {1e6 / rate:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
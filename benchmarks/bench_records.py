@@ -0,0 +1,69 @@
+"""Benchmark memory use and construction speed of :mod:`bitex.records`.
+
+Compares the slotted record classes against the equivalent output of
+:meth:`BitexResponse.key_value_dict` (a dict per record) and
+:meth:`BitexResponse.triples` (a labelled tuple per value)::
+
+    python benchmarks/bench_records.py --count 100000
+"""
+# Built-in
+import argparse
+import time
+import tracemalloc
+from typing import Any, Callable, List
+
+# Home-brew
+from bitex.records import Ticker, Trade
+
+FIELDS = ("pair", "timestamp", "trade_id", "price", "size", "side")
+
+
+def as_record(i: int) -> Any:
+    return Trade("BTCUSD", 1590000000 + i, i, 3809.1 + i, 0.5, "buy")
+
+
+def as_dict(i: int) -> Any:
+    return dict(zip(FIELDS, ("BTCUSD", 1590000000 + i, i, 3809.1 + i, 0.5, "buy")))
+
+
+def as_triples(i: int) -> Any:
+    ts = 1590000000 + i
+    return [
+        (ts, "pair", "BTCUSD"),
+        (ts, "trade_id", i),
+        (ts, "price", 3809.1 + i),
+        (ts, "size", 0.5),
+        (ts, "side", "buy"),
+    ]
+
+
+def as_ticker(i: int) -> Any:
+    return Ticker("BTCUSD", 1590000000 + i, 3809.1 + i, 0.5, 3809.4 + i, 1.5, 3809.2 + i, 100.0)
+
+
+def measure(factory: Callable[[int], Any], count: int) -> None:
+    start = time.perf_counter()
+    objects: List[Any] = [factory(i) for i in range(count)]
+    elapsed = time.perf_counter() - start
+    del objects
+    # Measure memory in a separate pass, as tracing slows down construction.
+    tracemalloc.start()
+    objects = [factory(i) for i in range(count)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    print(f"{factory.__name__:<12} {size / count:>10.1f} {elapsed / count * 1e9:>10.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100000)
+    args = parser.parse_args()
+
+    print(f"{'format':<12} {'B/record':>10} {'ns/record':>10}")
+    for factory in (as_record, as_dict, as_triples, as_ticker):
+        measure(factory, args.count)
+
+
+if __name__ == "__main__":
+    main()
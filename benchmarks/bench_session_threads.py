@@ -0,0 +1,90 @@
+"""Benchmark a shared, frozen :class:`BitexSession` against one session per thread.
+
+Starts a local HTTP server returning a small JSON ticker, and sends requests to
+it from several worker threads; either all via one session frozen with
+:meth:`BitexSession.freeze`, or each via its own session. Reports the requests
+per second, and the number of TCP connections the server accepted::
+
+    python benchmarks/bench_session_threads.py --threads 16 --requests 200
+"""
+# Built-in
+import argparse
+import http.server
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+# Home-brew
+from bitex.session import BitexSession
+
+BODY = b'{"pair": "BTCUSD", "bid": "9500.1", "ask": "9500.2", "timestamp": 1590000000}'
+
+
+class TickerHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; don't wait for delayed ACKs in between.
+    disable_nagle_algorithm = True
+    connections = 0
+    lock = threading.Lock()
+
+    def setup(self) -> None:
+        super().setup()
+        with TickerHandler.lock:
+            TickerHandler.connections += 1
+
+    def do_GET(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def run(threads: int, requests: int, session_for: Callable[[int], BitexSession], url: str):
+    TickerHandler.connections = 0
+
+    def work(worker: int) -> None:
+        session = session_for(worker)
+        for _ in range(requests):
+            session.request("GET", url).json()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(work, range(threads)))
+    elapsed = time.perf_counter() - started
+    return threads * requests / elapsed, TickerHandler.connections
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), TickerHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/ticker"
+
+    shared = BitexSession().freeze()
+    per_thread = [BitexSession() for _ in range(args.threads)]
+    setups = {"shared, frozen": lambda worker: shared, "per thread": per_thread.__getitem__}
+
+    print(f"{'session':<16} {'threads':>7} {'req/s':>9} {'connections':>11}")
+    try:
+        for name, session_for in setups.items():
+            rate, connections = run(args.threads, args.requests, session_for, url)
+            print(f"{name:<16} {args.threads:>7} {rate:>9.0f} {connections:>11}")
+    finally:
+        server.shutdown()
+        shared.close()
+        for session in per_thread:
+            session.close()
+
+
+if __name__ == "__main__":
+    main()
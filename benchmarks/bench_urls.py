@@ -0,0 +1,84 @@
+"""Benchmark the resolution of short-hand URLs via :mod:`bitex.urls`.
+
+Compares the ad-hoc resolution typical of plugins (matching the short-hand,
+formatting the symbol and the URL on every request) against compiled URL
+templates, with cold and warm caches::
+
+    python benchmarks/bench_urls.py --instruments 50
+"""
+# Built-in
+import argparse
+import itertools
+import timeit
+from typing import Callable, List
+
+# Home-brew
+from bitex.request import BitexPreparedRequest
+from bitex.urls import SymbolFormat, URLRegistry, URLTemplates
+
+BASE = "https://api.uberex.com/v1"
+PATHS = {"ticker": "/ticker/{symbol}", "book": "/depth?symbol={symbol}", "trades": "/trades"}
+ALIASES = {"BTC": "XBT"}
+
+
+def ad_hoc(url: str) -> str:
+    match = BitexPreparedRequest.search_url_for_shorthand(url)
+    instrument = match["instrument"].lstrip("/")
+    base, quote = instrument.split("/")
+    symbol = "-".join(ALIASES.get(c, c) for c in (base, quote)).lower()
+    return "{}{}".format(BASE, PATHS[match["endpoint"]].format(symbol=symbol))
+
+
+def compiled() -> URLRegistry:
+    urls = URLRegistry()
+    urls._templates = {}
+    urls.register(
+        "uberex",
+        URLTemplates(
+            BASE,
+            {endpoint: "{base}" + path for endpoint, path in PATHS.items()},
+            symbols=SymbolFormat(separator="-", case="lower", aliases=ALIASES),
+        ),
+    )
+    return urls
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--instruments", type=int, default=50)
+    parser.add_argument("--number", type=int, default=100000)
+    args = parser.parse_args()
+
+    quotes = ("USD", "EUR", "GBP", "JPY", "CAD")
+    bases = [f"C{i:02d}" for i in range(max(args.instruments // len(quotes), 1))]
+    shorthands: List[str] = [
+        f"uberex:{base}/{quote}/{endpoint}"
+        for base, quote, endpoint in itertools.product(bases, quotes, PATHS)
+    ]
+    urls = compiled()
+    assert all(ad_hoc(url) == urls.resolve(url).url for url in shorthands)
+
+    def cycle(resolve: Callable[[str], object]) -> Callable[[], object]:
+        it = itertools.cycle(shorthands)
+        return lambda: resolve(next(it))
+
+    def cold(url: str) -> object:
+        # Resolve without the caches of the registry and the templates.
+        urls._resolved.clear()
+        urls.templates()["uberex"]._cache.clear()
+        return urls.resolve(url)
+
+    cases = {
+        "ad hoc": cycle(ad_hoc),
+        "compiled, cold": cycle(cold),
+        "compiled, warm": cycle(urls.resolve),
+    }
+    print(f"{len(shorthands)} short-hands")
+    print(f"{'resolution':<16} {'ns/request':>11}")
+    for name, fn in cases.items():
+        seconds = timeit.timeit(fn, number=args.number)
+        print(f"{name:<16} {seconds / args.number * 1e9:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
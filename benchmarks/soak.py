@@ -0,0 +1,194 @@
+"""Soak test: detect memory, object and file descriptor leaks of long-running sessions.
+
+Drives requests against a mock exchange in a local process, through a real
+:class:`bitex.session.BitexSession`. The requests cover short-hand resolution
+via :mod:`bitex.urls`, the plugin lookups, :meth:`BitexHTTPAdapter.build_response`,
+gzip decoding and JSON parsing. After warming up, it takes a sample every
+`--interval` requests:
+
+- the memory traced by :mod:`tracemalloc`,
+- the number of live objects, per type,
+- the number of open file descriptors.
+
+Once all requests are sent, growth since the first sample is compared
+against the thresholds. If any is exceeded, the largest allocation sites and
+object types are reported, and the exit status is 1::
+
+    python benchmarks/soak.py --requests 1000000 --threads 4
+    python benchmarks/soak.py --requests 20000 --interval 2000  # Quick check.
+"""
+# Built-in
+import argparse
+import collections
+import gc
+import gzip
+import http.server
+import json
+import multiprocessing
+import os
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from typing import Counter, NamedTuple
+
+# Home-brew
+from bitex.compression import Compression
+from bitex.session import BitexSession
+from bitex.urls import URLTemplates, registry
+
+TICKER = json.dumps({"bid": "9500.1", "ask": "9500.2", "timestamp": 1590000000}).encode()
+BOOK = gzip.compress(
+    json.dumps({"bids": [["9500.1", "1.5"]] * 100, "asks": [["9500.2", "1.5"]] * 100}).encode()
+)
+SHORTHANDS = ("soak:BTCUSD/ticker", "soak:BTCUSD/book", "soak:ETHUSD/ticker")
+
+
+class MockExchangeHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; don't wait for delayed ACKs in between.
+    disable_nagle_algorithm = True
+
+    def do_GET(self) -> None:
+        if self.path.startswith("/depth"):
+            body, headers = BOOK, {"Content-Encoding": "gzip"}
+        else:
+            body, headers = TICKER, {}
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def serve(ports: "multiprocessing.Queue") -> None:
+    """Run the mock exchange, putting its port on `ports`."""
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), MockExchangeHandler)
+    server.daemon_threads = True
+    ports.put(server.server_address[1])
+    server.serve_forever()
+
+
+class Sample(NamedTuple):
+    requests: int
+    traced: int
+    objects: Counter[str]
+    fds: int
+    snapshot: tracemalloc.Snapshot
+
+
+def open_fds() -> int:
+    """Return the number of open file descriptors of this process; -1 if unknown."""
+    for path in ("/proc/self/fd", "/dev/fd"):
+        if os.path.isdir(path):
+            return len(os.listdir(path))
+    return -1
+
+
+def take_sample(requests: int) -> Sample:
+    gc.collect()
+    objects = collections.Counter(type(obj).__name__ for obj in gc.get_objects())
+    traced = tracemalloc.get_traced_memory()[0]
+    return Sample(requests, traced, objects, open_fds(), tracemalloc.take_snapshot())
+
+
+def send(session: BitexSession, count: int, threads: int) -> None:
+    def work(worker: int) -> None:
+        for i in range(worker, count, threads):
+            response = session.request("GET", SHORTHANDS[i % len(SHORTHANDS)])
+            response.raise_for_status()
+            response.json()
+
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(work, range(threads)))
+
+
+def report(baseline: Sample, sample: Sample, top: int) -> None:
+    print("Largest allocation growth:")
+    for stat in sample.snapshot.compare_to(baseline.snapshot, "lineno")[:top]:
+        print(f"  {stat}")
+    print("Largest object count growth:")
+    growth = sample.objects.copy()
+    growth.subtract(baseline.objects)
+    for name, count in growth.most_common(top):
+        print(f"  {name}: {count:+d}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1000000)
+    parser.add_argument("--warmup", type=int, default=5000)
+    parser.add_argument("--interval", type=int, default=50000)
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--frozen", action="store_true", help="Freeze the session.")
+    parser.add_argument("--max-memory-growth", type=float, default=4.0, help="MiB")
+    parser.add_argument("--max-object-growth", type=int, default=1000, help="Per type.")
+    parser.add_argument("--max-fd-growth", type=int, default=4)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    # The mock exchange runs in a separate process, so only the client is measured.
+    ports: "multiprocessing.Queue" = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, args=(ports,), daemon=True)
+    server.start()
+    base = f"http://127.0.0.1:{ports.get(timeout=10)}"
+    registry.register(
+        "soak",
+        URLTemplates(base, {"ticker": "{base}/ticker/{symbol}", "book": "{base}/depth/{symbol}"}),
+    )
+    session = BitexSession(compression=Compression())
+    if args.frozen:
+        session.freeze()
+
+    try:
+        send(session, args.warmup, args.threads)
+        tracemalloc.start()
+        baseline = last = take_sample(0)
+        print(f"{'requests':>10} {'req/s':>7} {'traced MiB':>10} {'objects':>9} {'fds':>4}")
+        sent = 0
+        while sent < args.requests:
+            count = min(args.interval, args.requests - sent)
+            started = time.perf_counter()
+            send(session, count, args.threads)
+            rate = count / (time.perf_counter() - started)
+            sent += count
+            # Only the first and the latest sample are kept, to not skew the measurements.
+            last = take_sample(sent)
+            print(
+                f"{sent:>10} {rate:>7.0f} {last.traced / 2 ** 20:>10.2f} "
+                f"{sum(last.objects.values()):>9} {last.fds:>4}"
+            )
+    finally:
+        server.terminate()
+        session.close()
+        registry.unregister("soak")
+
+    memory_growth = (last.traced - baseline.traced) / 2 ** 20
+    object_growth = max(
+        (last.objects[name] - baseline.objects[name] for name in last.objects), default=0
+    )
+    fd_growth = last.fds - baseline.fds
+    failures = [
+        f"{label} grew by {growth:g} (threshold {threshold:g})"
+        for label, growth, threshold in (
+            ("traced memory (MiB)", memory_growth, args.max_memory_growth),
+            ("objects of a single type", object_growth, args.max_object_growth),
+            ("open file descriptors", fd_growth, args.max_fd_growth),
+        )
+        if growth > threshold
+    ]
+    if failures:
+        print("FAILED: " + "; ".join(failures))
+        report(baseline, last, args.top)
+        return 1
+    print(f"OK: {memory_growth:+.2f} MiB, {object_growth:+d} objects, {fd_growth:+d} fds")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
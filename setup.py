@@ -23,6 +23,9 @@ setup(
         'dev': ['black', 'isort', 'flake8'],
         'test': ['pytest', 'pytest-cov', 'tox'],
         'ci': ['twine'],
+        'http2': ['httpx[http2]'],
+        'speedups': ['orjson'],
+        'frame': ['numpy', 'pandas'],
     },
 
     # For a list of valid classifiers, see https://pypi.org/classifiers/
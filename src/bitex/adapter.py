@@ -1,4 +1,7 @@
 """Custom :class:`requests.HTTPAdapter` for :mod:`bitex-framework`."""
+# Built-in
+from typing import Any, Dict, Optional, Tuple, Union
+
 # Third-party
 from requests.adapters import HTTPAdapter
 from requests.cookies import extract_cookies_to_jar
@@ -7,6 +10,8 @@ from requests.utils import get_encoding_from_headers
 from urllib3.response import HTTPResponse
 
 # Home-brew
+from bitex.deadline import Deadline
+from bitex.dns import DNSCache, pinned_pool_classes
 from bitex.plugins import list_loaded_plugins
 from bitex.request import BitexPreparedRequest
 from bitex.response import BitexResponse
@@ -18,8 +23,58 @@ class BitexHTTPAdapter(HTTPAdapter):
     It replaces :class:`requests.Response` as the default response class when
     building the response, with either an adequate plugin-supplied class or
     :mod:`bitex-framework` 's own default :class:`BitexResponse` class.
+
+    :param DNSCache dns_cache:
+        If given, new connections use the host addresses cached by it, instead
+        of resolving host names each time. See :mod:`bitex.dns`.
+    :param Any kwargs: Passed on to :class:`requests.adapters.HTTPAdapter`.
     """
 
+    #: Classes announced by plugins, if looked up once by :meth:`BitexSession.freeze`.
+    plugins: Optional[Dict[str, Dict[str, Any]]] = None
+
+    def __init__(self, dns_cache: Optional[DNSCache] = None, **kwargs: Any) -> None:
+        # Must be set before the parent initializes the pool manager.
+        self.dns_cache = dns_cache
+        super(BitexHTTPAdapter, self).__init__(**kwargs)
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize the pool manager, pinning host addresses if we have a DNS cache."""
+        super(BitexHTTPAdapter, self).init_poolmanager(*args, **kwargs)
+        if getattr(self, "dns_cache", None) is not None:
+            self.poolmanager.pool_classes_by_scheme = pinned_pool_classes(self.dns_cache)
+
+    def send(
+        self,
+        request: BitexPreparedRequest,
+        stream: bool = False,
+        timeout: Union[None, float, Tuple[float, float]] = None,
+        verify: Union[bool, str] = True,
+        cert: Any = None,
+        proxies: Any = None,
+    ) -> BitexResponse:
+        """Send `request`, within its deadline if it has one.
+
+        The signature is identical to :meth:`requests.adapters.HTTPAdapter.send`.
+        The time spent is accounted to stage ``send`` of the request's
+        :class:`bitex.deadline.Deadline`, and the connect and read timeouts are
+        clamped to the time remaining.
+        """
+        deadline = getattr(request, "deadline", None)
+        if not isinstance(deadline, Deadline):
+            return super(BitexHTTPAdapter, self).send(
+                request, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies
+            )
+        with deadline.stage("send"):
+            return super(BitexHTTPAdapter, self).send(
+                request,
+                stream=stream,
+                timeout=deadline.clamp(timeout),
+                verify=verify,
+                cert=cert,
+                proxies=proxies,
+            )
+
     def build_response(self, req: BitexPreparedRequest, resp: HTTPResponse) -> BitexResponse:
         """Build a :class:`BitexResponse` from the given `req` and `resp`.
 
@@ -35,11 +90,16 @@ class BitexHTTPAdapter(HTTPAdapter):
             The :class:`BitexPreparedRequest` used to generate the response.
         :param HTTPResponse resp: The urllib3 response object.
         """
-        if req.exchange in list_loaded_plugins():
-            response = list_loaded_plugins()[req.exchange]["Response"]()
+        plugins = self.plugins if self.plugins is not None else list_loaded_plugins()
+        if req.exchange in plugins:
+            response = plugins[req.exchange]["Response"]()
         else:
             response = BitexResponse()
 
+        compression = getattr(req, "compression", None)
+        if compression is not None:
+            compression.instrument(req.exchange, resp)
+
         # Fallback to None if there's no status_code, for whatever reason.
         response.status_code = getattr(resp, "status", None)
 
@@ -62,5 +122,6 @@ class BitexHTTPAdapter(HTTPAdapter):
         # Give the Response some context.
         response.request = req
         response.connection = self
+        response.codec = getattr(req, "codec", None)
 
         return response
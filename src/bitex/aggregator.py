@@ -0,0 +1,311 @@
+"""Cross-exchange consolidated best bid/offer and depth aggregation.
+
+A :class:`MarketAggregator` consumes :class:`bitex.response.BitexResponse` objects
+of several exchanges and maintains a consolidated view per pair::
+
+    >>>aggregator = MarketAggregator(max_age=5.0)
+    >>>aggregator.update(session.ticker("kraken", "BTCUSD"))
+    >>>aggregator.update(session.ticker("bitstamp", "BTCUSD"))
+    >>>aggregator.best_bid("BTCUSD")
+    ('bitstamp', 3809.4, 1.2)
+
+Ticker responses are read via :meth:`BitexResponse.key_value_dict`, which is
+expected to supply the `pair`, `bid` and `ask` keys, and optionally `bid_size`
+and `ask_size`. Order books are fed via :meth:`MarketAggregator.update_book`.
+
+Best prices are kept in heaps per side, so an update costs O(log n) in the
+number of venues, and querying the best venue is O(1) (amortized, as outdated
+heap entries are discarded lazily on access). A heap is rebuilt from the
+latest quotes whenever outdated entries make up more than half of it, so it
+never holds more than about twice as many entries as there are venues.
+Depth levels are kept in a sorted list of prices per side: a new price is
+located in O(log n), but inserting or removing it shifts the list, which
+costs O(n) in the number of price levels. Venues which have not sent an
+update within `max_age` seconds are considered stale and excluded from all
+consolidated views.
+"""
+# Built-in
+import bisect
+import heapq
+import itertools
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+# Home-brew
+from bitex.response import BitexResponse
+
+#: Constant for the bid side of a book.
+BID = "bid"
+
+#: Constant for the ask side of a book.
+ASK = "ask"
+
+Number = Union[str, int, float]
+BestQuote = Tuple[str, float, Optional[float]]
+DepthLevel = Tuple[float, float, Dict[str, float]]
+
+
+class VenueQuote:
+    """Latest top-of-book quote of a single venue."""
+
+    __slots__ = ("bid", "bid_size", "ask", "ask_size", "updated", "seq")
+
+    def __init__(self, bid, bid_size, ask, ask_size, updated: float, seq: int) -> None:
+        self.bid = bid
+        self.bid_size = bid_size
+        self.ask = ask
+        self.ask_size = ask_size
+        self.updated = updated
+        self.seq = seq
+
+
+class ConsolidatedPair:
+    """Consolidated best bid/offer and depth of a single pair across venues.
+
+    :param float max_age:
+        Seconds after which a venue's data is considered stale, or `None` to
+        never expire venue data.
+    :param Callable clock: Monotonic clock used for staleness tracking.
+    """
+
+    def __init__(
+        self, max_age: Optional[float] = None, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.max_age = max_age
+        self.clock = clock
+        self.quotes: Dict[str, VenueQuote] = {}
+        self._seq = itertools.count()
+        self._heaps: Dict[str, List[Tuple[float, int, str]]] = {BID: [], ASK: []}
+        # Depth: sorted price keys per side, and the size per venue at each price.
+        self._prices: Dict[str, List[float]] = {BID: [], ASK: []}
+        self._levels: Dict[str, Dict[float, Dict[str, float]]] = {BID: {}, ASK: {}}
+        self._venue_levels: Dict[str, Dict[str, List[float]]] = {BID: {}, ASK: {}}
+        self._book_updated: Dict[str, float] = {}
+
+    def is_stale(self, updated: float, now: Optional[float] = None) -> bool:
+        """Check if data last updated at `updated` is older than :attr:`max_age`."""
+        if self.max_age is None:
+            return False
+        return (now if now is not None else self.clock()) - updated > self.max_age
+
+    def update_quote(
+        self,
+        venue: str,
+        bid: Optional[Number] = None,
+        ask: Optional[Number] = None,
+        bid_size: Optional[Number] = None,
+        ask_size: Optional[Number] = None,
+    ) -> None:
+        """Replace the top-of-book quote of `venue`."""
+        seq = next(self._seq)
+        quote = VenueQuote(
+            None if bid is None else float(bid),
+            None if bid_size is None else float(bid_size),
+            None if ask is None else float(ask),
+            None if ask_size is None else float(ask_size),
+            self.clock(),
+            seq,
+        )
+        self.quotes[venue] = quote
+        # Bids are stored negated, since heapq implements a min-heap.
+        if quote.bid is not None:
+            heapq.heappush(self._heaps[BID], (-quote.bid, seq, venue))
+        if quote.ask is not None:
+            heapq.heappush(self._heaps[ASK], (quote.ask, seq, venue))
+        for side in (BID, ASK):
+            if len(self._heaps[side]) > 2 * len(self.quotes) + 8:
+                self._rebuild(side)
+
+    def _rebuild(self, side: str) -> None:
+        """Rebuild the heap of `side` from the latest quote of each venue."""
+        heap = []
+        for venue, quote in self.quotes.items():
+            price = quote.bid if side == BID else quote.ask
+            if price is not None:
+                heap.append((-price if side == BID else price, quote.seq, venue))
+        heapq.heapify(heap)
+        self._heaps[side] = heap
+
+    def remove_venue(self, venue: str) -> None:
+        """Drop all data of `venue` from the consolidated views."""
+        # Heap entries become outdated and are discarded on access.
+        self.quotes.pop(venue, None)
+        self._book_updated.pop(venue, None)
+        for side in (BID, ASK):
+            self._remove_levels(side, venue)
+
+    def _best(self, side: str) -> Optional[BestQuote]:
+        heap = self._heaps[side]
+        now = self.clock()
+        while heap:
+            key, seq, venue = heap[0]
+            quote = self.quotes.get(venue)
+            if quote is not None and quote.seq == seq and not self.is_stale(quote.updated, now):
+                if side == BID:
+                    return venue, quote.bid, quote.bid_size
+                return venue, quote.ask, quote.ask_size
+            # Outdated or stale entry; a fresh update of the venue pushes a new one.
+            heapq.heappop(heap)
+        return None
+
+    def best_bid(self) -> Optional[BestQuote]:
+        """Return ``(venue, price, size)`` of the highest non-stale bid, if any."""
+        return self._best(BID)
+
+    def best_ask(self) -> Optional[BestQuote]:
+        """Return ``(venue, price, size)`` of the lowest non-stale ask, if any."""
+        return self._best(ASK)
+
+    def update_book(
+        self,
+        venue: str,
+        bids: Iterable[Tuple[Number, Number]],
+        asks: Iterable[Tuple[Number, Number]],
+    ) -> None:
+        """Replace the order book levels of `venue`.
+
+        :param bids: Iterable of ``(price, size)`` tuples.
+        :param asks: Iterable of ``(price, size)`` tuples.
+        """
+        for side, levels in ((BID, bids), (ASK, asks)):
+            self._remove_levels(side, venue)
+            prices = self._prices[side]
+            side_levels = self._levels[side]
+            # Bids are stored negated, so both sides sort best-first.
+            sign = -1.0 if side == BID else 1.0
+            venue_prices = []
+            for price, size in levels:
+                key = sign * float(price)
+                level = side_levels.get(key)
+                if level is None:
+                    level = side_levels[key] = {}
+                    bisect.insort(prices, key)
+                level[venue] = float(size)
+                venue_prices.append(key)
+            self._venue_levels[side][venue] = venue_prices
+        self._book_updated[venue] = self.clock()
+
+    def _remove_levels(self, side: str, venue: str) -> None:
+        prices = self._prices[side]
+        side_levels = self._levels[side]
+        for key in self._venue_levels[side].pop(venue, ()):
+            level = side_levels.get(key)
+            if level is None:
+                # Duplicate price in the venue's previous book.
+                continue
+            level.pop(venue, None)
+            if not level:
+                del side_levels[key]
+                del prices[bisect.bisect_left(prices, key)]
+
+    def depth(self, side: str, levels: Optional[int] = None) -> List[DepthLevel]:
+        """Return the consolidated depth of the given `side`, best price first.
+
+        Each level is a tuple of ``(price, total_size, {venue: size})``. Stale
+        venues are excluded.
+
+        :param str side: Either :data:`BID` or :data:`ASK`.
+        :param int levels: Maximum number of levels to return; all by default.
+        """
+        now = self.clock()
+        fresh = {
+            venue
+            for venue, updated in self._book_updated.items()
+            if not self.is_stale(updated, now)
+        }
+        sign = -1.0 if side == BID else 1.0
+        result = []
+        for key in self._prices[side]:
+            level = self._levels[side][key]
+            sizes = {venue: size for venue, size in level.items() if venue in fresh}
+            if sizes:
+                result.append((sign * key, sum(sizes.values()), sizes))
+                if levels is not None and len(result) >= levels:
+                    break
+        return result
+
+    def stale_venues(self) -> List[str]:
+        """Return the venues whose quote or book data is stale."""
+        now = self.clock()
+        stale = {venue for venue, q in self.quotes.items() if self.is_stale(q.updated, now)}
+        stale.update(
+            venue for venue, updated in self._book_updated.items() if self.is_stale(updated, now)
+        )
+        return sorted(stale)
+
+
+class MarketAggregator:
+    """Maintain :class:`ConsolidatedPair` views for any number of pairs.
+
+    :param float max_age:
+        Seconds after which a venue's data is considered stale, or `None` to
+        never expire venue data.
+    :param Callable clock: Monotonic clock used for staleness tracking.
+    """
+
+    def __init__(
+        self, max_age: Optional[float] = None, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.max_age = max_age
+        self.clock = clock
+        self.pairs: Dict[str, ConsolidatedPair] = {}
+
+    def __getitem__(self, pair: str) -> ConsolidatedPair:
+        """Return the consolidated view of `pair`, creating it if necessary."""
+        try:
+            return self.pairs[pair]
+        except KeyError:
+            consolidated = self.pairs[pair] = ConsolidatedPair(self.max_age, self.clock)
+            return consolidated
+
+    def update(self, response: BitexResponse, venue: Optional[str] = None) -> None:
+        """Update the consolidated quote using the ticker data of `response`.
+
+        :param BitexResponse response: A ticker response.
+        :param str venue:
+            Name of the venue; defaults to the exchange of the response's request.
+        """
+        data = response.key_value_dict()
+        venue = venue or response.request.exchange
+        self[data["pair"]].update_quote(
+            venue,
+            bid=data.get("bid"),
+            ask=data.get("ask"),
+            bid_size=data.get("bid_size"),
+            ask_size=data.get("ask_size"),
+        )
+
+    def update_book(
+        self,
+        venue: str,
+        pair: str,
+        bids: Iterable[Tuple[Number, Number]],
+        asks: Iterable[Tuple[Number, Number]],
+    ) -> None:
+        """Replace the order book levels of `venue` for `pair`.
+
+        The best level of each side also updates the venue's top-of-book quote.
+        """
+        bids, asks = list(bids), list(asks)
+        consolidated = self[pair]
+        consolidated.update_book(venue, bids, asks)
+        best_bid = max(bids, key=lambda level: float(level[0]), default=(None, None))
+        best_ask = min(asks, key=lambda level: float(level[0]), default=(None, None))
+        consolidated.update_quote(
+            venue, bid=best_bid[0], bid_size=best_bid[1], ask=best_ask[0], ask_size=best_ask[1]
+        )
+
+    def best_bid(self, pair: str) -> Optional[BestQuote]:
+        """Return ``(venue, price, size)`` of the best bid for `pair`, if any."""
+        return self[pair].best_bid()
+
+    def best_ask(self, pair: str) -> Optional[BestQuote]:
+        """Return ``(venue, price, size)`` of the best ask for `pair`, if any."""
+        return self[pair].best_ask()
+
+    def depth(self, pair: str, side: str, levels: Optional[int] = None) -> List[DepthLevel]:
+        """Return the consolidated depth of `side` for `pair`.
+
+        See :meth:`ConsolidatedPair.depth`.
+        """
+        return self[pair].depth(side, levels)
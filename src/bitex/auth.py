@@ -1,17 +1,22 @@
 """Basic auth class for :mod:`bitex-framework`."""
 # Built-in
-import json
 import logging
 import time
+from typing import TYPE_CHECKING, Optional
 from urllib.parse import parse_qs
 
 # Third-party
 import requests
 
 # Home-brew
+from bitex.codec import get_codec
 from bitex.request import BitexPreparedRequest
 from bitex.types import DecodedParams
 
+if TYPE_CHECKING:  # pragma: no cover
+    # Home-brew
+    from bitex.clock import ClockSync
+
 # Init Logging Facilities
 log = logging.getLogger(__name__)
 
@@ -26,6 +31,14 @@ class BitexAuth(requests.auth.AuthBase):
     :param str secret: API Secret.
     """
 
+    #: Clock offset estimates used by :meth:`timestamp`; see :mod:`bitex.clock`.
+    clock: Optional["ClockSync"] = None
+
+    #: Whether the exchange rejects nonces lower than one it received before. Orders signed by
+    #: such auth objects are signed and sent one at a time per API key, in nonce order; see
+    #: :meth:`bitex.session.BitexSession.new_orders`.
+    ordered_nonces: bool = True
+
     def __init__(self, key: str, secret: str) -> None:
         self.key = key
         self.secret = secret
@@ -62,22 +75,31 @@ class BitexAuth(requests.auth.AuthBase):
 
         We must accommodate for the case that in some cases the body may be a
         JSON encoded string. We expect the parsed JSON to be a dictionary of
-        objects.
+        objects. It is decoded via the default codec of :mod:`bitex.codec`,
+        keeping all numbers as strings.
 
         :param BitexPreparedRequest request:
             The request whose body we should decode.
         """
         if request.headers["Content-Type"] == "application/json":
-            # The body is required to be bytes, so we decode to string first
-            body = request.body.decode("UTF-8")
-            body_as_dict = json.loads(body, parse_int=str, parse_float=str)
+            body_as_dict = get_codec(numbers="str").loads(request.body)
             body_as_dict = {k: [v] for k, v in body_as_dict.items()}
         else:
             body_as_dict = parse_qs(request.body)
-        print(body_as_dict)
         items = body_as_dict.items()
         return tuple((key, value) for key, value in sorted(items, key=lambda x: x[0]))
 
+    def timestamp(self, exchange: Optional[str] = None) -> float:
+        """Return the current unix timestamp for use in signatures.
+
+        If a :class:`bitex.clock.ClockSync` is assigned to :attr:`clock` and
+        `exchange` is given, the time is corrected for the estimated offset of
+        the exchange's clock. Otherwise, the local time is returned.
+        """
+        if self.clock is not None and exchange is not None:
+            return self.clock.now(exchange)
+        return time.time()
+
     @staticmethod
     def nonce() -> str:
         """Create a Nonce value for signature generation.
@@ -0,0 +1,361 @@
+"""Parallel backfill of historical trades, with checkpoints and resume.
+
+A :class:`BackfillEngine` splits the time ranges of ``(exchange, pair)`` jobs
+into chunks, and fetches these in parallel via
+:func:`bitex.pagination.iter_trades`, with the requests to each exchange
+limited by a token bucket::
+
+    >>>engine = BackfillEngine(BitexSession(), "data/", rate_limits={"kraken": 1.0})
+    >>>engine.add("kraken", "BTCUSD", start=1577836800, end=1590969600)
+    >>>engine.add("kraken", "ETHUSD", start=1577836800, end=1590969600)
+    >>>engine.run()
+
+The trades of each chunk are written to a JSON lines file in `output_dir`, at
+``<exchange>/<pair>/<start>-<end>.jsonl``, as soon as the chunk is complete.
+Files are written under a temporary name, flushed to disk and renamed once
+complete, and each completed chunk is recorded in a state file only then. If
+the backfill is interrupted, running it again skips all chunks recorded in
+the state file. Failed chunks are retried after an exponential backoff.
+
+Progress and throughput are tracked per exchange, and available via
+:meth:`BackfillEngine.progress`, or by passing a callback to
+:meth:`BackfillEngine.run`.
+"""
+# Built-in
+import json
+import logging
+import os
+import pathlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Mapping, NamedTuple, Optional, Set, Union
+
+# Home-brew
+from bitex.codec import get_codec
+from bitex.exceptions import MissingPlugin
+from bitex.pagination import iter_trades
+from bitex.plugins import list_loaded_paginators
+from bitex.session import BitexSession
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+PathLike = Union[str, os.PathLike]
+
+
+def _number(value: float) -> str:
+    """Format `value` identically whether given as int or float, e.g. `1` and `1.0` as ``1``."""
+    if isinstance(value, int):
+        return str(value)
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def _fsync_dir(path: pathlib.Path) -> None:
+    """Flush the entries of directory `path` to disk, e.g. after renaming a file into it."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        # Directories cannot be opened on all platforms, e.g. Windows.
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class RateLimiter:
+    """Token bucket permitting `rate` acquisitions per second, with bursts of up to `burst`.
+
+    :param Callable clock: Monotonic clock.
+    :param Callable sleep: Used to wait for tokens.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take a token, waiting for one if necessary; return the seconds waited."""
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Reserve the token now, so concurrent callers queue up behind us.
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait:
+            self.sleep(wait)
+        return wait
+
+
+class Chunk(NamedTuple):
+    """The trades of `pair` at `exchange` from `start` up to (excluding) `end`."""
+
+    exchange: str
+    pair: str
+    start: float
+    end: float
+
+    @property
+    def key(self) -> str:
+        """Identifier of the chunk in the state file."""
+        return f"{self.exchange}:{self.pair}:{_number(self.start)}:{_number(self.end)}"
+
+
+class ExchangeProgress:
+    """Backfill progress of a single exchange."""
+
+    __slots__ = ("chunks", "done", "failed", "skipped", "trades", "requests", "started")
+
+    def __init__(self) -> None:
+        self.chunks = 0
+        self.done = 0
+        self.failed = 0
+        self.skipped = 0
+        self.trades = 0
+        self.requests = 0
+        self.started: Optional[float] = None
+
+    def throughput(self, now: Optional[float] = None) -> float:
+        """Return the trades fetched per second since the backfill started."""
+        if self.started is None:
+            return 0.0
+        elapsed = (now if now is not None else time.monotonic()) - self.started
+        return self.trades / elapsed if elapsed > 0 else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        """Return the progress as a dict."""
+        stats = {attr: getattr(self, attr) for attr in self.__slots__ if attr != "started"}
+        stats["throughput"] = self.throughput()
+        return stats
+
+
+class BackfillState:
+    """Set of completed chunks, persisted to a JSON file at `path`.
+
+    The file is replaced atomically on every update, so it is never left
+    partially written.
+    """
+
+    def __init__(self, path: PathLike) -> None:
+        self.path = pathlib.Path(path)
+        self._lock = threading.Lock()
+        self.done: Dict[str, int] = {}
+        if self.path.exists():
+            with self.path.open() as f:
+                self.done = json.load(f)["done"]
+
+    def __contains__(self, chunk: Chunk) -> bool:
+        return chunk.key in self.done
+
+    def mark_done(self, chunk: Chunk, trades: int) -> None:
+        """Record `chunk` as complete, with the number of `trades` it held."""
+        with self._lock:
+            self.done[chunk.key] = trades
+            tmp = self.path.with_name(self.path.name + ".tmp")
+            with tmp.open("w") as f:
+                json.dump({"done": self.done}, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+            _fsync_dir(self.path.parent)
+
+
+class BackfillEngine:
+    """Backfill trades of several pairs and exchanges in parallel.
+
+    :param BitexSession session: The session to send requests with.
+    :param output_dir: Directory to write trades to.
+    :param state_file:
+        Where to record completed chunks; ``<output_dir>/backfill.state.json``
+        by default.
+    :param float chunk_size: Length of the time range of each chunk.
+    :param int workers: The number of chunks fetched concurrently.
+    :param Mapping rate_limits: Requests per second allowed, by exchange.
+    :param float default_rate: Requests per second allowed for all other exchanges.
+    :param int retries: How often a failed chunk is retried within a run.
+    :param float backoff:
+        Seconds to wait before retrying a failed chunk; doubled for every
+        further retry.
+    """
+
+    def __init__(
+        self,
+        session: BitexSession,
+        output_dir: PathLike,
+        state_file: Optional[PathLike] = None,
+        chunk_size: float = 86400.0,
+        workers: int = 8,
+        rate_limits: Optional[Mapping[str, float]] = None,
+        default_rate: float = 1.0,
+        retries: int = 2,
+        backoff: float = 1.0,
+    ) -> None:
+        self.session = session
+        self.output_dir = pathlib.Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.state = BackfillState(state_file or self.output_dir / "backfill.state.json")
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.default_rate = default_rate
+        self.retries = retries
+        self.backoff = backoff
+        self.limiters = {
+            exchange: RateLimiter(rate) for exchange, rate in (rate_limits or {}).items()
+        }
+        self.chunks: List[Chunk] = []
+        self._progress: Dict[str, ExchangeProgress] = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+
+    def add(self, exchange: str, pair: str, start: float, end: float) -> List[Chunk]:
+        """Add the trades of `pair` at `exchange` from `start` until `end`.
+
+        :return: The chunks the time range was split into.
+        """
+        chunks = []
+        lower = start
+        while lower < end:
+            upper = min(lower + self.chunk_size, end)
+            chunks.append(Chunk(exchange, pair, lower, upper))
+            lower = upper
+        self.chunks.extend(chunks)
+        with self._lock:
+            self._progress.setdefault(exchange, ExchangeProgress()).chunks += len(chunks)
+        return chunks
+
+    def path(self, chunk: Chunk) -> pathlib.Path:
+        """Return the path of the file holding the trades of `chunk`."""
+        pair = chunk.pair.replace("/", "-")
+        name = f"{_number(chunk.start)}-{_number(chunk.end)}.jsonl"
+        return self.output_dir / chunk.exchange / pair / name
+
+    def limiter(self, exchange: str) -> RateLimiter:
+        """Return the rate limiter of `exchange`."""
+        with self._lock:
+            if exchange not in self.limiters:
+                self.limiters[exchange] = RateLimiter(self.default_rate)
+            return self.limiters[exchange]
+
+    def progress(self) -> Dict[str, Dict[str, float]]:
+        """Return the progress of each exchange; see :class:`ExchangeProgress`."""
+        with self._lock:
+            return {exchange: p.as_dict() for exchange, p in self._progress.items()}
+
+    def stop(self) -> None:
+        """Stop the running backfill after the chunks currently being fetched."""
+        self._stopped.set()
+
+    def fetch(self, chunk: Chunk) -> int:
+        """Fetch the trades of `chunk`, write them to disk, and return their number."""
+        paginator = list_loaded_paginators().get(chunk.exchange)
+        if paginator is None:
+            raise MissingPlugin(chunk.exchange)
+        limiter = self.limiter(chunk.exchange)
+        progress = self._progress[chunk.exchange]
+
+        def request(params):
+            limiter.acquire()
+            with self._lock:
+                progress.requests += 1
+            response = self.session.trades(chunk.exchange, chunk.pair, params=params)
+            response.raise_for_status()
+            return response
+
+        codec = get_codec()
+        path = self.path(chunk)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        count = 0
+        with tmp.open("wb") as f:
+            # Pages are fetched one by one; parallelism comes from concurrent chunks.
+            for trade in iter_trades(request, paginator, chunk.pair, chunk.start, chunk.end, 1):
+                f.write(codec.dumps(trade.as_dict()) + b"\n")
+                count += 1
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        # Only record the chunk as done once its file survives a crash.
+        _fsync_dir(path.parent)
+        with self._lock:
+            progress.trades += count
+        return count
+
+    def _run_chunk(self, chunk: Chunk) -> Optional[bool]:
+        """Fetch `chunk`, retrying on errors; return `None` if stopped before completion."""
+        for attempt in range(self.retries + 1):
+            if attempt and self._stopped.wait(self.backoff * 2 ** (attempt - 1)):
+                return None
+            if self._stopped.is_set():
+                return None
+            try:
+                count = self.fetch(chunk)
+            except Exception:
+                log.warning(
+                    "Backfilling %s failed (attempt %d)", chunk.key, attempt + 1, exc_info=True
+                )
+                continue
+            self.state.mark_done(chunk, count)
+            return True
+        return False
+
+    def run(self, report: Optional[Callable[[Dict[str, Dict[str, float]]], None]] = None) -> bool:
+        """Fetch all chunks not completed yet; block until done or stopped.
+
+        :param Callable report: Called with :meth:`progress` after each chunk.
+        :return: Whether all chunks were completed.
+        """
+        self._stopped.clear()
+        pending: List[Chunk] = []
+        seen: Set[Chunk] = set()
+        now = time.monotonic()
+        with self._lock:
+            for progress in self._progress.values():
+                progress.started = progress.started or now
+            for chunk in self.chunks:
+                if chunk in seen:
+                    continue
+                seen.add(chunk)
+                if chunk in self.state:
+                    self._progress[chunk.exchange].skipped += 1
+                else:
+                    pending.append(chunk)
+
+        pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bitex-backfill")
+        with pool:
+            futures = {pool.submit(self._run_chunk, chunk): chunk for chunk in pending}
+            for future in as_completed(futures):
+                chunk, completed = futures[future], future.result()
+                if completed is None:
+                    continue
+                with self._lock:
+                    progress = self._progress[chunk.exchange]
+                    if completed:
+                        progress.done += 1
+                    else:
+                        progress.failed += 1
+                stats = self.progress()[chunk.exchange]
+                log.info(
+                    "%s: %d/%d chunks, %d trades, %.1f trades/s",
+                    chunk.exchange,
+                    stats["done"] + stats["skipped"],
+                    stats["chunks"],
+                    stats["trades"],
+                    stats["throughput"],
+                )
+                if report is not None:
+                    report(self.progress())
+        return all(chunk in self.state for chunk in seen)
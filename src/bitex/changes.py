@@ -0,0 +1,173 @@
+"""Change detection, to skip re-parsing unchanged responses.
+
+Polling an endpoint, e.g. a ticker or an order book, frequently returns the
+same body as the previous poll. A :class:`ChangeDetector` assigned to a
+session remembers the latest response to each URL, and marks responses with
+an identical body as :attr:`bitex.response.BitexResponse.unchanged`::
+
+    >>>session = BitexSession(changes=ChangeDetector())
+    >>>session.ticker("kraken", "BTCUSD").unchanged
+    False
+    >>>response = session.ticker("kraken", "BTCUSD")
+    >>>response.unchanged
+    True
+    >>>response.triples()  # The result for the previous response, not re-computed.
+    [(1590969600, "bid", "9500.1"), ...]
+
+Bodies are compared by their digest. Unchanged responses share the memoized
+results of :meth:`json` and the formatters (:meth:`triples`,
+:meth:`key_value_dict`, :meth:`records`) with the previous responses of the
+same body; these are computed at most once, and must not be modified. Note
+that this includes the `received` timestamp reported by the formatters,
+which is the one of the first response with that body.
+
+If `conditional` is set and the latest response to a URL stated an `ETag`
+or `Last-Modified` header, the next `GET` request to it is conditional, via
+`If-None-Match` or `If-Modified-Since`. An exchange replying with
+`304 Not Modified` sends no body at all; the response then gets the status
+code, headers and body of the latest response, and is marked unchanged.
+Requests setting either header explicitly are sent as they are.
+"""
+# Built-in
+import collections
+import hashlib
+import logging
+import threading
+from typing import TYPE_CHECKING, Any, Dict, Mapping, NamedTuple, Optional, Tuple
+
+# Third-party
+from requests.structures import CaseInsensitiveDict
+
+if TYPE_CHECKING:  # pragma: no cover
+    # Home-brew
+    from bitex.request import BitexPreparedRequest
+    from bitex.response import BitexResponse
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+#: Headers of conditional requests, by the response header stating their validator.
+VALIDATORS = (("ETag", "If-None-Match"), ("Last-Modified", "If-Modified-Since"))
+
+
+class Seen(NamedTuple):
+    """The latest response to a URL, as remembered by :class:`ChangeDetector`."""
+
+    digest: bytes
+    parsed: Dict[str, Any]
+    status: int
+    headers: Mapping[str, str]
+    #: The body, kept only if the response stated a validator.
+    body: Optional[bytes]
+
+
+class ChangeDetector:
+    """Detect responses whose body is identical to the previous response to the same URL.
+
+    :param bool conditional:
+        Send conditional `GET` requests to URLs whose latest response stated a
+        validator.
+    :param int max_urls:
+        Maximum number of URLs to remember the latest response to; the least
+        recently requested are forgotten first.
+    """
+
+    def __init__(self, conditional: bool = True, max_urls: int = 1024) -> None:
+        self.conditional = conditional
+        self.max_urls = max_urls
+        self.changed = 0
+        self.unchanged = 0
+        self.not_modified = 0
+        self._seen: "collections.OrderedDict[Tuple[str, str], Seen]" = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def digest(body: bytes) -> bytes:
+        """Return the digest of `body`."""
+        return hashlib.blake2b(body, digest_size=16).digest()
+
+    def conditional_headers(self, method: str, url: str) -> Dict[str, str]:
+        """Return the headers to make a request to `url` conditional, if any."""
+        if not self.conditional or method != "GET":
+            return {}
+        seen = self._seen.get((method, url))
+        if seen is None or seen.body is None:
+            return {}
+        return {
+            condition: seen.headers[validator]
+            for validator, condition in VALIDATORS
+            if validator in seen.headers
+        }
+
+    def observe(self, response: "BitexResponse") -> None:
+        """Compare the body of `response` against the latest response to its URL.
+
+        Marks `response` as :attr:`unchanged` if the body is identical, or if
+        the exchange replied `304 Not Modified`. Streamed responses, whose body
+        was not read yet, and error responses are ignored.
+        """
+        request: Optional["BitexPreparedRequest"] = response.request
+        if request is None or not isinstance(request.url, str):
+            return
+        key = (request.method, request.url)
+        if response.status_code == 304:
+            self._not_modified(key, response)
+            return
+        content = response.__dict__.get("_content")
+        if not isinstance(content, bytes) or response.status_code >= 400:
+            return
+        digest = self.digest(content)
+        with self._lock:
+            seen = self._seen.get(key)
+            if seen is not None and seen.digest == digest:
+                self._seen.move_to_end(key)
+                self.unchanged += 1
+                response._parsed = seen.parsed
+                response.unchanged = True
+                return
+            validators = {
+                name: response.headers[name] for name, _ in VALIDATORS if name in response.headers
+            }
+            headers = CaseInsensitiveDict(validators)
+            self._seen[key] = Seen(
+                digest,
+                response.__dict__.setdefault("_parsed", {}),
+                response.status_code,
+                headers,
+                content if headers else None,
+            )
+            self._seen.move_to_end(key)
+            self.changed += 1
+            while len(self._seen) > self.max_urls:
+                self._seen.popitem(last=False)
+
+    def _not_modified(self, key: Tuple[str, str], response: "BitexResponse") -> None:
+        with self._lock:
+            seen = self._seen.get(key)
+            if seen is None or seen.body is None:
+                # Forgotten since the request was prepared; nothing to restore.
+                log.debug("Received 304 for %s %s without a previous body", *key)
+                return
+            self._seen.move_to_end(key)
+            self.not_modified += 1
+        response.status_code = seen.status
+        for name, value in seen.headers.items():
+            response.headers.setdefault(name, value)
+        response._content = seen.body
+        response._content_consumed = True
+        response._parsed = seen.parsed
+        response.unchanged = True
+
+    def stats(self) -> Dict[str, int]:
+        """Return the number of URLs remembered, and of the responses observed.
+
+        Responses replied to with `304 Not Modified` count as both unchanged
+        and not modified.
+        """
+        with self._lock:
+            return {
+                "urls": len(self._seen),
+                "changed": self.changed,
+                "unchanged": self.unchanged + self.not_modified,
+                "not_modified": self.not_modified,
+            }
@@ -0,0 +1,213 @@
+"""Estimation of exchange clock offsets and round-trip times.
+
+Signatures with timestamps or timestamp-based nonces are rejected by exchanges
+if the local clock is skewed, and latencies computed from exchange timestamps
+are off by the same skew. A :class:`ClockSync` estimates the offset of each
+exchange's clock, NTP-style, from requests whose send and receive times are
+known locally::
+
+    offset = server_time - (sent + received) / 2
+    rtt = received - sent
+
+Samples are obtained by querying an exchange's server time endpoint, if its
+plugin announces one via
+:meth:`bitex.plugins.AnnounceServerTimeHookSpec.announce_server_time`, or from
+the `Date` header of regular responses::
+
+    >>>clock = ClockSync()
+    >>>clock.install(session)  # Observe the `Date` header of every response.
+    >>>clock.sync(session, "kraken")  # Query kraken's server time endpoint.
+    >>>clock.now("kraken")
+    1590969600.512
+
+Of the most recent samples of an exchange, the one with the lowest round-trip
+time is the most accurate, as its offset is least affected by asymmetric
+delays. The estimate moves towards it gradually, to smooth out noise.
+
+:class:`bitex.auth.BitexAuth` uses a :class:`ClockSync` for
+:meth:`BitexAuth.timestamp`, if one is assigned to it.
+"""
+# Built-in
+import collections
+import email.utils
+import logging
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Deque, Dict, Optional, Tuple
+
+# Home-brew
+from bitex.exceptions import MissingPlugin
+from bitex.response import BitexResponse
+
+if TYPE_CHECKING:  # pragma: no cover
+    # Home-brew
+    from bitex.session import BitexSession
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+
+class ServerTimeEndpoint:
+    """Server time endpoint of an exchange.
+
+    Plugins sub-class this and announce an instance via the
+    :meth:`bitex.plugins.AnnounceServerTimeHookSpec.announce_server_time` hook.
+    """
+
+    #: Resolution of the returned server time, in seconds.
+    resolution: float = 0.001
+
+    def request(self, session: "BitexSession") -> BitexResponse:
+        """Request the exchange's current time."""
+        raise NotImplementedError
+
+    def server_time(self, response: BitexResponse) -> float:
+        """Return the server time stated by `response`, as a unix timestamp in seconds."""
+        raise NotImplementedError
+
+
+class ClockEstimate:
+    """Smoothed clock offset and round-trip time of a single exchange, in seconds."""
+
+    __slots__ = ("offset", "rtt", "samples", "updated", "_window")
+
+    def __init__(self, window: int) -> None:
+        self.offset = 0.0
+        self.rtt = 0.0
+        self.samples = 0
+        self.updated: Optional[float] = None
+        self._window: Deque[Tuple[float, float]] = collections.deque(maxlen=window)
+
+    def as_dict(self) -> Dict[str, Optional[float]]:
+        """Return the estimate as a dict."""
+        return {"offset": self.offset, "rtt": self.rtt, "samples": self.samples}
+
+
+class ClockSync:
+    """Estimate the clock offset and round-trip time of exchanges.
+
+    :param int window: The number of recent samples the best one is picked from.
+    :param float alpha:
+        Weight of a new best sample in the smoothed estimate; the very first
+        sample of an exchange is taken as is.
+    :param Callable clock: Wall clock; :func:`time.time` by default.
+    """
+
+    def __init__(
+        self, window: int = 8, alpha: float = 0.3, clock: Callable[[], float] = time.time
+    ) -> None:
+        self.window = window
+        self.alpha = alpha
+        self.clock = clock
+        self._estimates: Dict[str, ClockEstimate] = {}
+        self._lock = threading.Lock()
+
+    def add_sample(
+        self,
+        exchange: str,
+        sent: float,
+        server_time: float,
+        received: float,
+        resolution: float = 0.0,
+    ) -> ClockEstimate:
+        """Add a sample of `exchange`'s clock, and return the updated estimate.
+
+        :param float sent: Local time at which the request was sent.
+        :param float server_time: The exchange's time, as stated in the response.
+        :param float received: Local time at which the response was received.
+        :param float resolution:
+            Resolution of `server_time`; a server time truncated to whole
+            seconds is assumed to lie in the middle of its second.
+        """
+        rtt = max(received - sent, 0.0)
+        offset = server_time + resolution / 2 - (sent + received) / 2
+        with self._lock:
+            estimate = self._estimates.get(exchange)
+            if estimate is None:
+                estimate = self._estimates[exchange] = ClockEstimate(self.window)
+            estimate._window.append((rtt + resolution, offset))
+            best_rtt, best_offset = min(estimate._window)
+            if estimate.samples:
+                estimate.offset += self.alpha * (best_offset - estimate.offset)
+                estimate.rtt += self.alpha * (rtt - estimate.rtt)
+            else:
+                estimate.offset, estimate.rtt = best_offset, rtt
+            estimate.samples += 1
+            estimate.updated = received
+        return estimate
+
+    def estimate(self, exchange: str) -> Optional[ClockEstimate]:
+        """Return the estimate of `exchange`, if any samples were taken."""
+        return self._estimates.get(exchange)
+
+    def offset(self, exchange: str) -> float:
+        """Return the estimated offset of `exchange`'s clock; 0 if unknown."""
+        estimate = self._estimates.get(exchange)
+        return estimate.offset if estimate is not None else 0.0
+
+    def rtt(self, exchange: str) -> Optional[float]:
+        """Return the smoothed round-trip time to `exchange`, if known."""
+        estimate = self._estimates.get(exchange)
+        return estimate.rtt if estimate is not None else None
+
+    def now(self, exchange: str) -> float:
+        """Return the current time according to `exchange`'s clock."""
+        return self.clock() + self.offset(exchange)
+
+    def received(self, response: BitexResponse) -> float:
+        """Return the time `response` was received, according to its exchange's clock."""
+        return float(response.received) + self.offset(response.request.exchange)
+
+    def latency(
+        self, exchange: str, server_time: float, received: Optional[float] = None
+    ) -> float:
+        """Return the one-way latency of data stamped with `server_time` by `exchange`.
+
+        :param float received: Local time of reception; the current time by default.
+        """
+        received = self.clock() if received is None else received
+        return received + self.offset(exchange) - server_time
+
+    def observe(self, response: BitexResponse, **kwargs) -> None:
+        """Add a sample from the `Date` header of `response`.
+
+        The signature allows using this as a :mod:`requests` response hook;
+        see :meth:`install`.
+        """
+        exchange = getattr(response.request, "exchange", None)
+        header = response.headers.get("Date")
+        if not exchange or not header:
+            return
+        try:
+            server_time = email.utils.parsedate_to_datetime(header).timestamp()
+        except (TypeError, ValueError):
+            log.debug("Cannot parse Date header %r of %r", header, exchange)
+            return
+        received = float(getattr(response, "received", self.clock()))
+        sent = received - response.elapsed.total_seconds()
+        self.add_sample(exchange, sent, server_time, received, resolution=1.0)
+
+    def install(self, session: "BitexSession") -> None:
+        """Observe the `Date` header of every response received via `session`."""
+        session.hooks["response"].append(self.observe)
+
+    def sync(self, session: "BitexSession", exchange: str, samples: int = 4) -> ClockEstimate:
+        """Query the server time endpoint of `exchange` `samples` times.
+
+        :raises MissingPlugin: If no plugin announced a server time endpoint for `exchange`.
+        """
+        # Imported here, as bitex.plugins imports this module.
+        from bitex.plugins import list_loaded_server_time
+
+        endpoint = list_loaded_server_time().get(exchange)
+        if endpoint is None:
+            raise MissingPlugin(exchange)
+        for _ in range(samples):
+            sent = self.clock()
+            response = endpoint.request(session)
+            received = self.clock()
+            response.raise_for_status()
+            self.add_sample(
+                exchange, sent, endpoint.server_time(response), received, endpoint.resolution
+            )
+        return self._estimates[exchange]
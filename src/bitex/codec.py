@@ -0,0 +1,165 @@
+"""Pluggable JSON codecs for response parsing and request bodies.
+
+:class:`bitex.session.BitexSession`, :class:`bitex.response.BitexResponse` and
+:class:`bitex.auth.BitexAuth` encode and decode JSON via a :class:`JSONCodec`.
+By default, the fastest installed backend is used; the standard library's
+:mod:`json` module is always available as a fallback::
+
+    >>>from bitex.codec import get_codec
+    >>>session = BitexSession(codec=get_codec("orjson", numbers="decimal"))
+
+Each codec is configured with a number mode, which controls how JSON numbers
+are decoded:
+
+    * `native` - as :class:`int` and :class:`float` (the default).
+    * `str` - as the :class:`str` they were given as, losing no precision.
+    * `decimal` - integers as :class:`int`, all other numbers as :class:`decimal.Decimal`.
+
+Backends which cannot decode numbers precisely fall back to :mod:`json` for
+the `str` and `decimal` modes.
+
+Install the optional fast backends via::
+
+    pip install bitex-framework[speedups]
+"""
+# Built-in
+import json
+import math
+from decimal import Decimal
+from typing import Any, Callable, Dict, Optional, Type, Union
+
+try:
+    # Third-party
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+#: The supported number modes.
+NUMBER_MODES = ("native", "str", "decimal")
+
+
+class JSONCodec:
+    """JSON codec using the standard library's :mod:`json` module.
+
+    :param str numbers: How to decode numbers; one of :data:`NUMBER_MODES`.
+    """
+
+    #: Name under which the codec is registered.
+    name = "json"
+
+    def __init__(self, numbers: str = "native") -> None:
+        if numbers not in NUMBER_MODES:
+            raise ValueError(f"numbers must be one of {NUMBER_MODES!r}, got {numbers!r}")
+        self.numbers = numbers
+        self._hooks: Dict[str, Callable[[str], Any]] = {}
+        if numbers == "str":
+            self._hooks = {"parse_int": str, "parse_float": str}
+        elif numbers == "decimal":
+            self._hooks = {"parse_float": Decimal}
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__qualname__} [{self.numbers}]>"
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """Decode the JSON document `data`."""
+        return json.loads(data, **self._hooks)
+
+    def dumps(self, obj: Any) -> bytes:
+        """Encode `obj` as a UTF-8 encoded JSON document.
+
+        :class:`decimal.Decimal` values are encoded as strings.
+        """
+        return json.dumps(obj, allow_nan=False, default=str).encode("utf-8")
+
+
+class OrjsonCodec(JSONCodec):
+    """JSON codec using :mod:`orjson`."""
+
+    name = "orjson"
+
+    def __init__(self, numbers: str = "native") -> None:
+        if orjson is None:
+            raise ImportError("OrjsonCodec requires orjson; install it via 'pip install orjson'")
+        super(OrjsonCodec, self).__init__(numbers)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """Decode the JSON document `data`.
+
+        :mod:`orjson` only supports native numbers; other modes use :mod:`json`.
+        """
+        if self.numbers != "native":
+            return super(OrjsonCodec, self).loads(data)
+        return orjson.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        """Encode `obj` as a UTF-8 encoded JSON document.
+
+        Inputs are encoded as by :meth:`JSONCodec.dumps`: non-string keys are
+        converted to strings, and non-finite floats raise a :exc:`ValueError`
+        (:mod:`orjson` would encode them as `null`).
+        """
+        _check_finite(obj)
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _check_finite(obj: Any) -> None:
+    """Raise a :exc:`ValueError` if `obj` is or contains a NaN or infinite float."""
+    if isinstance(obj, float):
+        if not math.isfinite(obj):
+            raise ValueError(f"Out of range float values are not JSON compliant: {obj!r}")
+    elif isinstance(obj, dict):
+        for key, value in obj.items():
+            _check_finite(key)
+            _check_finite(value)
+    elif isinstance(obj, (list, tuple)):
+        for value in obj:
+            _check_finite(value)
+
+
+#: Registered codec classes, by name, in order of preference.
+CODECS: Dict[str, Type[JSONCodec]] = {}
+
+_default: Optional[str] = None
+_instances: Dict[tuple, JSONCodec] = {}
+
+
+def register_codec(codec_class: Type[JSONCodec], preferred: bool = False) -> None:
+    """Register `codec_class` under its :attr:`JSONCodec.name`.
+
+    :param bool preferred: Prefer this codec over all others registered so far.
+    """
+    CODECS[codec_class.name] = codec_class
+    if preferred:
+        # Re-insert all other codecs, moving `codec_class` to the front.
+        for name in [name for name in CODECS if name != codec_class.name]:
+            CODECS[name] = CODECS.pop(name)
+    _instances.clear()
+
+
+def set_default_codec(name: Optional[str]) -> None:
+    """Use the codec registered as `name` by default; `None` picks the fastest one."""
+    global _default
+    if name is not None and name not in CODECS:
+        raise KeyError(f"No codec registered as {name!r}!")
+    _default = name
+
+
+def get_codec(name: Optional[str] = None, numbers: str = "native") -> JSONCodec:
+    """Return a codec instance for the given `name` and number mode.
+
+    If `name` is `None`, the default codec is returned, which is the first
+    registered codec unless changed via :func:`set_default_codec`. Instances
+    are cached and shared, as codecs are stateless.
+    """
+    name = name or _default or next(iter(CODECS))
+    key = name, numbers
+    try:
+        return _instances[key]
+    except KeyError:
+        codec = _instances[key] = CODECS[name](numbers)
+        return codec
+
+
+if orjson is not None:
+    register_codec(OrjsonCodec)
+register_codec(JSONCodec)
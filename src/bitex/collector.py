@@ -0,0 +1,321 @@
+"""Multi-process, sharded market data collection.
+
+A single process issuing requests via :class:`bitex.session.BitexSession` is
+bound by the GIL once responses are parsed. The :class:`ShardedCollector`
+spreads ``(exchange, pair, endpoint)`` jobs across several worker processes,
+each of which runs its own session (and hence its own connection pools) and a
+:class:`bitex.scheduler.PollingScheduler`::
+
+    >>>collector = ShardedCollector(BitexSession, processes=4)
+    >>>collector.add_job("kraken", "BTCUSD", "ticker", interval=1.0)
+    >>>collector.add_job("kraken", "BTCUSD", "orderbook", interval=2.0)
+    >>>collector.start()
+    >>>for result in collector.results():
+    ...    print(result.exchange, result.pair, result.payload)
+
+Workers do not send :class:`bitex.response.BitexResponse` objects back to the
+parent process; instead they apply the requested formatter (e.g.
+:meth:`BitexResponse.key_value_dict`) and funnel a small
+:class:`CollectorResult` tuple through a shared queue.
+
+Jobs are assigned to the worker with the lowest request rate. Should a worker
+die, it is replaced by a new worker process, which takes over its jobs.
+"""
+# Built-in
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+# Home-brew
+from bitex.scheduler import PollingScheduler
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+JobKey = Tuple[str, str, str]
+
+
+class CollectorResult(NamedTuple):
+    """Picklable result of a single request made by a collector worker.
+
+    If the request failed, `status_code` is `None` and `payload` holds the
+    :func:`repr` of the exception raised.
+    """
+
+    worker: int
+    exchange: str
+    pair: str
+    endpoint: str
+    received: float
+    status_code: Optional[int]
+    payload: Any
+
+
+def _format(response: Any, formatter: str) -> Any:
+    """Apply `formatter` to `response`, returning a picklable payload."""
+    if formatter == "content":
+        return response.content
+    return getattr(response, formatter)()
+
+
+def _worker_main(
+    worker_id: int,
+    session_factory: Callable[[], Any],
+    formatter: str,
+    threads: int,
+    control: Any,
+    results: Any,
+    counter: Any,
+) -> None:
+    """Entrypoint of a collector worker process.
+
+    Reads ``("add", job_spec)``, ``("remove", job_key)`` and ``("stop", None)``
+    commands from `control` until stopped.
+    """
+    scheduler = PollingScheduler(session_factory(), workers=threads)
+
+    def deliver(job, response):
+        if isinstance(response, Exception):
+            status, payload = None, repr(response)
+        else:
+            status = getattr(response, "status_code", None)
+            try:
+                payload = _format(response, formatter)
+            except Exception as e:
+                status, payload = None, repr(e)
+        results.put(
+            CollectorResult(
+                worker_id, job.exchange, job.pair, job.endpoint, time.time(), status, payload
+            )
+        )
+        with counter.get_lock():
+            counter.value += 1
+
+    scheduler.start()
+    try:
+        while True:
+            command, arg = control.get()
+            if command == "stop":
+                break
+            try:
+                if command == "add":
+                    exchange, pair, endpoint, interval, kwargs = arg
+                    scheduler.add_job(
+                        exchange, pair, endpoint, interval, callback=deliver, **kwargs
+                    )
+                elif command == "remove":
+                    scheduler.remove_job(*arg)
+            except (KeyError, ValueError):
+                log.exception("Collector worker %d rejected command %r", worker_id, command)
+    finally:
+        scheduler.stop()
+
+
+class _Worker:
+    """Bookkeeping of a single worker process, as seen by the parent."""
+
+    def __init__(self, worker_id: int, process: Any, control: Any, counter: Any) -> None:
+        self.id = worker_id
+        self.process = process
+        self.control = control
+        self.counter = counter
+        self.started = time.monotonic()
+        self.jobs: Dict[JobKey, Tuple[float, Dict[str, Any]]] = {}
+
+    @property
+    def load(self) -> float:
+        """Return the number of requests per second issued by this worker."""
+        return sum(1 / interval for interval, _ in self.jobs.values())
+
+    def assign(self, key: JobKey, interval: float, kwargs: Dict[str, Any]) -> None:
+        self.jobs[key] = interval, kwargs
+        self.control.put(("add", (*key, interval, kwargs)))
+
+
+class ShardedCollector:
+    """Shard polling jobs across several worker processes.
+
+    :param Callable session_factory:
+        Called without arguments in each worker to create its session; must be
+        picklable if the `spawn` start method is used.
+    :param int processes: Number of worker processes; the CPU count by default.
+    :param int threads: Number of request threads per worker process.
+    :param str formatter:
+        Name of the :class:`BitexResponse` method whose output is sent back to
+        the parent, or `content` to send the raw response body.
+    :param str start_method: The :mod:`multiprocessing` start method to use.
+    :param float monitor_interval: Seconds between two worker liveness checks.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Any],
+        processes: Optional[int] = None,
+        threads: int = 4,
+        formatter: str = "key_value_dict",
+        start_method: Optional[str] = None,
+        monitor_interval: float = 1.0,
+    ) -> None:
+        self.session_factory = session_factory
+        self.processes = processes or multiprocessing.cpu_count()
+        self.threads = threads
+        self.formatter = formatter
+        self.monitor_interval = monitor_interval
+        self._ctx = multiprocessing.get_context(start_method)
+        self._results = self._ctx.Queue()
+        self._pending: Dict[JobKey, Tuple[float, Dict[str, Any]]] = {}
+        self._workers: List[_Worker] = []
+        self._lock = threading.RLock()
+        self._stopped = threading.Event()
+        self._monitor: Optional[threading.Thread] = None
+
+    @property
+    def alive_workers(self) -> List[_Worker]:
+        """Return the workers whose process is still running."""
+        return [worker for worker in self._workers if worker.process.is_alive()]
+
+    def add_job(
+        self, exchange: str, pair: str, endpoint: str, interval: float, **kwargs: Any
+    ) -> None:
+        """Register a polling job; see :meth:`PollingScheduler.add_job`.
+
+        Keyword arguments must be picklable.
+        """
+        key = exchange, pair, endpoint
+        with self._lock:
+            if key in self._pending or any(key in w.jobs for w in self._workers):
+                raise ValueError(f"A job for {key!r} is already registered!")
+            if self._workers:
+                self._least_loaded().assign(key, interval, kwargs)
+            else:
+                self._pending[key] = interval, kwargs
+
+    def remove_job(self, exchange: str, pair: str, endpoint: str) -> None:
+        """Unregister the job for the given `exchange`, `pair` and `endpoint`."""
+        key = exchange, pair, endpoint
+        with self._lock:
+            if self._pending.pop(key, None) is not None:
+                return
+            for worker in self._workers:
+                if worker.jobs.pop(key, None) is not None:
+                    worker.control.put(("remove", key))
+                    return
+        raise KeyError(key)
+
+    def _least_loaded(self) -> _Worker:
+        alive = self.alive_workers
+        if not alive:
+            raise RuntimeError(
+                "No collector worker is alive; dead workers are respawned by rebalance()."
+            )
+        return min(alive, key=lambda worker: worker.load)
+
+    def _spawn(self, worker_id: int) -> _Worker:
+        control = self._ctx.Queue()
+        counter = self._ctx.Value("Q", 0)
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(
+                worker_id,
+                self.session_factory,
+                self.formatter,
+                self.threads,
+                control,
+                self._results,
+                counter,
+            ),
+            name=f"bitex-collector-{worker_id}",
+            daemon=True,
+        )
+        process.start()
+        return _Worker(worker_id, process, control, counter)
+
+    def start(self) -> None:
+        """Start the worker processes and distribute all registered jobs."""
+        with self._lock:
+            if self._workers:
+                return
+            self._stopped.clear()
+            self._workers = [self._spawn(worker_id) for worker_id in range(self.processes)]
+            # Assign the highest-rate jobs first, for a more even distribution.
+            for key, (interval, kwargs) in sorted(self._pending.items(), key=lambda i: i[1][0]):
+                self._least_loaded().assign(key, interval, kwargs)
+            self._pending.clear()
+        self._monitor = threading.Thread(
+            target=self._watch, name="bitex-collector-monitor", daemon=True
+        )
+        self._monitor.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop all worker processes."""
+        self._stopped.set()
+        if self._monitor is not None:
+            self._monitor.join()
+            self._monitor = None
+        with self._lock:
+            for worker in self.alive_workers:
+                worker.control.put(("stop", None))
+            for worker in self._workers:
+                worker.process.join(timeout)
+                if worker.process.is_alive():
+                    worker.process.terminate()
+            # Keep the job registry, so a restart picks up where we left off.
+            for worker in self._workers:
+                self._pending.update(worker.jobs)
+            self._workers = []
+
+    def __enter__(self) -> "ShardedCollector":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def _watch(self) -> None:
+        while not self._stopped.wait(self.monitor_interval):
+            self.rebalance()
+
+    def rebalance(self) -> None:
+        """Replace dead workers by new worker processes, which take over their jobs."""
+        with self._lock:
+            for index, worker in enumerate(self._workers):
+                if worker.process.is_alive():
+                    continue
+                log.warning(
+                    "Collector worker %d died (exit code %s); respawning it with %d jobs.",
+                    worker.id,
+                    worker.process.exitcode,
+                    len(worker.jobs),
+                )
+                replacement = self._workers[index] = self._spawn(worker.id)
+                for key, (interval, kwargs) in worker.jobs.items():
+                    replacement.assign(key, interval, kwargs)
+
+    def get(self, timeout: Optional[float] = None) -> CollectorResult:
+        """Return the next result; raises :exc:`queue.Empty` on timeout."""
+        return self._results.get(timeout=timeout)
+
+    def results(self, timeout: Optional[float] = None) -> Iterator[CollectorResult]:
+        """Yield results as they arrive, until none arrives within `timeout` seconds."""
+        while True:
+            try:
+                yield self.get(timeout=timeout)
+            except queue.Empty:
+                return
+
+    def throughput(self) -> Dict[int, Dict[str, Any]]:
+        """Report the number of results and results per second of each worker."""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                worker.id: {
+                    "alive": worker.process.is_alive(),
+                    "jobs": len(worker.jobs),
+                    "results": worker.counter.value,
+                    "rate": worker.counter.value / max(now - worker.started, 1e-9),
+                }
+                for worker in self._workers
+            }
@@ -0,0 +1,150 @@
+"""Negotiation and instrumentation of compressed transfers.
+
+By default, :mod:`requests` only advertises ``gzip`` and ``deflate``, even if
+decoders for the considerably more efficient ``zstd`` and ``br`` encodings are
+installed. A :class:`Compression` assigned to a session advertises the best
+encodings available, per exchange::
+
+    >>>compression = Compression(preferences={"kraken": ["gzip"]})
+    >>>session = BitexSession(compression=compression)
+    >>>session.orderbook("kraken", "BTCUSD")
+    <BitexResponse [200]>
+    >>>compression.stats()["kraken"]
+    {'responses': 1, 'encodings': {'gzip': 1}, 'wire_bytes': 18310, 'decoded_bytes': 120881,
+     'ratio': 6.6, 'decode_seconds': 0.0007}
+
+Bodies are decompressed incrementally by urllib3, chunk by chunk as they are
+read from the socket, rather than after buffering the entire body. The bytes
+received and decoded, and the time spent decoding, are recorded per exchange,
+so the bandwidth saved can be weighed against the CPU time spent.
+
+``zstd`` requires the `zstandard` package (or Python 3.14+), and ``br`` the
+`brotli` or `brotlicffi` package; both are only advertised if installed and
+supported by the installed urllib3. Encodings are not instrumented for
+responses received via :class:`bitex.http2.BitexHTTP2Adapter`.
+"""
+# Built-in
+import collections
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence
+
+# Third-party
+import urllib3.response
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+#: Supported encodings, from most to least preferred.
+ENCODINGS = ("zstd", "br", "gzip", "deflate")
+
+
+def available_encodings() -> List[str]:
+    """Return the supported encodings urllib3 can decode, from most to least preferred."""
+    available = []
+    for encoding in ENCODINGS:
+        if encoding == "zstd" and not getattr(urllib3.response, "HAS_ZSTD", False):
+            continue
+        if encoding == "br" and getattr(urllib3.response, "brotli", None) is None:
+            continue
+        available.append(encoding)
+    return available
+
+
+class CompressionStats:
+    """Compressed transfers of a single exchange."""
+
+    __slots__ = ("responses", "encodings", "wire_bytes", "decoded_bytes", "decode_seconds")
+
+    def __init__(self) -> None:
+        self.responses = 0
+        self.encodings: Dict[str, int] = collections.Counter()
+        self.wire_bytes = 0
+        self.decoded_bytes = 0
+        self.decode_seconds = 0.0
+
+    @property
+    def ratio(self) -> Optional[float]:
+        """Return the ratio of decoded to received bytes of compressed responses."""
+        return self.decoded_bytes / self.wire_bytes if self.wire_bytes else None
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the statistics as a dict."""
+        return {
+            "responses": self.responses,
+            "encodings": dict(self.encodings),
+            "wire_bytes": self.wire_bytes,
+            "decoded_bytes": self.decoded_bytes,
+            "ratio": self.ratio,
+            "decode_seconds": self.decode_seconds,
+        }
+
+
+class Compression:
+    """Advertise the best available encodings, and instrument decoding.
+
+    :param Mapping preferences:
+        Encodings to advertise, by exchange, from most to least preferred;
+        encodings which cannot be decoded are skipped. All other exchanges are
+        offered :data:`default`.
+    :param Sequence default:
+        Encodings to advertise to other exchanges; all available encodings if `None`.
+    :param Callable clock: Used to time decoding.
+    """
+
+    def __init__(
+        self,
+        preferences: Optional[Mapping[str, Sequence[str]]] = None,
+        default: Optional[Sequence[str]] = None,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self.available = available_encodings()
+        self.preferences = dict(preferences or {})
+        self.default = default
+        self.clock = clock
+        self._stats: Dict[Optional[str], CompressionStats] = {}
+        self._headers: Dict[Optional[str], str] = {}
+        self._lock = threading.Lock()
+
+    def accept_encoding(self, exchange: Optional[str]) -> str:
+        """Return the value of the `Accept-Encoding` header for requests to `exchange`."""
+        header = self._headers.get(exchange)
+        if header is None:
+            wanted = self.preferences.get(exchange, self.default)
+            if wanted is None:
+                encodings = self.available
+            else:
+                encodings = [e for e in wanted if e in self.available or e == "identity"]
+            header = self._headers[exchange] = ", ".join(encodings) or "identity"
+        return header
+
+    def stats(self) -> Dict[Optional[str], Dict[str, Any]]:
+        """Return the statistics of each exchange; see :class:`CompressionStats`."""
+        with self._lock:
+            return {exchange: stats.as_dict() for exchange, stats in self._stats.items()}
+
+    def instrument(self, exchange: Optional[str], raw: Any) -> None:
+        """Record the encoding of urllib3 response `raw`, and time its decoding."""
+        encoding = raw.headers.get("Content-Encoding", "identity").lower()
+        with self._lock:
+            stats = self._stats.get(exchange)
+            if stats is None:
+                stats = self._stats[exchange] = CompressionStats()
+            stats.responses += 1
+            stats.encodings[encoding] += 1
+        decode = getattr(raw, "_decode", None)
+        if encoding == "identity" or decode is None:
+            return
+
+        def timed_decode(data: bytes, *args: Any, **kwargs: Any) -> bytes:
+            started = self.clock()
+            decoded = decode(data, *args, **kwargs)
+            elapsed = self.clock() - started
+            with self._lock:
+                stats.wire_bytes += len(data)
+                stats.decoded_bytes += len(decoded)
+                stats.decode_seconds += elapsed
+            return decoded
+
+        raw._decode = timed_decode
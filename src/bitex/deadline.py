@@ -0,0 +1,175 @@
+"""End-to-end deadlines for requests.
+
+A `timeout` passed to :mod:`requests` applies to each socket operation on its
+own; a request may take considerably longer in total, and the time spent
+preparing and signing it is not accounted for at all. A :class:`Deadline`
+bounds the entire request instead::
+
+    >>>session.new_order("kraken", "BTCUSD", params={...}, deadline=0.5)
+    <BitexResponse [200]>
+
+Passing a number creates a :class:`Deadline` that expires that many seconds
+later. The request passes through these stages, each of which checks the
+deadline before it starts, and raises
+:exc:`bitex.exceptions.DeadlineExceeded` if it expired:
+
+- ``prepare``: constructing the :class:`bitex.request.BitexPreparedRequest`.
+- ``sign``: signing it via the session's :class:`bitex.auth.BitexAuth`.
+- ``send``: acquiring a connection, sending the request and waiting for the
+  response headers. The connect and read timeouts are clamped to the
+  remaining time.
+- ``read``: reading the response body, and following redirects.
+
+If a stage's network operation times out after the deadline expired, the
+timeout is raised as :exc:`DeadlineExceeded` as well. Its
+:attr:`DeadlineExceeded.stages` states the seconds spent in each stage, so the
+stage which consumed the budget can be identified.
+
+A single :class:`Deadline` may also be shared by several requests, e.g. all
+requests of a strategy's decision cycle::
+
+    >>>deadline = Deadline(1.0)
+    >>>book = session.orderbook("kraken", "BTCUSD", deadline=deadline)
+    >>>order = session.new_order("kraken", "BTCUSD", params={...}, deadline=deadline)
+"""
+# Built-in
+import contextlib
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+# Third-party
+import requests
+from requests.auth import AuthBase, HTTPBasicAuth
+
+# Home-brew
+from bitex.exceptions import DeadlineExceeded
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+Timeout = Union[None, float, Tuple[Optional[float], Optional[float]]]
+
+
+class Deadline:
+    """Point in time by which a request, or several, must be completed.
+
+    :param float timeout: Seconds from now until the deadline expires.
+    :param Callable clock: Monotonic clock.
+    """
+
+    def __init__(self, timeout: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self.clock = clock
+        self.started = clock()
+        self.expires = self.started + timeout
+        #: Seconds spent in each stage, excluding time spent in nested stages.
+        self.stages: Dict[str, float] = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @property
+    def _active(self) -> List[List[Any]]:
+        """Return the stages the current thread is in, innermost last."""
+        try:
+            return self._local.active
+        except AttributeError:
+            active = self._local.active = []
+            return active
+
+    def __repr__(self) -> str:
+        return f"<Deadline [{self.remaining():.3f}s remaining]>"
+
+    @classmethod
+    def coerce(cls, deadline: Union[None, float, "Deadline"]) -> Optional["Deadline"]:
+        """Return `deadline` as a :class:`Deadline`, creating one from a number of seconds."""
+        if deadline is None or isinstance(deadline, Deadline):
+            return deadline
+        return cls(deadline)
+
+    def remaining(self) -> float:
+        """Return the seconds left until the deadline expires; negative once it has."""
+        return self.expires - self.clock()
+
+    @property
+    def expired(self) -> bool:
+        """Whether the deadline has expired."""
+        return self.remaining() <= 0
+
+    def check(self, stage: str) -> float:
+        """Return the remaining seconds, if any are left.
+
+        :raises DeadlineExceeded: If the deadline expired, stating `stage`.
+        """
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise DeadlineExceeded(stage, self.stages)
+        return remaining
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator["Deadline"]:
+        """Time the enclosed block as stage `name`, checking the deadline beforehand.
+
+        Stages may be nested; the time spent in a nested stage is only
+        accounted to it, not to the enclosing stage. If the block raises an
+        exception after the deadline expired, it is re-raised as
+        :exc:`DeadlineExceeded`.
+        """
+        self.check(name)
+        frame = [name, self.clock(), 0.0]
+        self._active.append(frame)
+        try:
+            yield self
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            if self.expired:
+                self._leave(frame)
+                raise DeadlineExceeded(name, self.stages) from e
+            raise
+        finally:
+            if self._active and self._active[-1] is frame:
+                self._leave(frame)
+
+    def _leave(self, frame: List[Any]) -> None:
+        name, started, nested = frame
+        elapsed = self.clock() - started
+        active = self._active
+        active.pop()
+        with self._lock:
+            self.stages[name] = self.stages.get(name, 0.0) + elapsed - nested
+        if active:
+            active[-1][2] += elapsed
+
+    def clamp(self, timeout: Timeout, stage: str = "send") -> Timeout:
+        """Return `timeout`, with each of its values limited to the remaining seconds.
+
+        `timeout` may be a number, a ``(connect, read)`` tuple or `None`, as
+        accepted by :meth:`requests.Session.send`.
+
+        :raises DeadlineExceeded: If the deadline expired, stating `stage`.
+        """
+        remaining = self.check(stage)
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            return (
+                remaining if connect is None else min(connect, remaining),
+                remaining if read is None else min(read, remaining),
+            )
+        if timeout is None:
+            return remaining
+        return min(timeout, remaining)
+
+
+class DeadlineAuth(AuthBase):
+    """Sign requests via `auth`, accounting the time spent to stage ``sign`` of `deadline`."""
+
+    def __init__(self, auth: Any, deadline: Deadline) -> None:
+        if isinstance(auth, tuple) and len(auth) == 2:
+            auth = HTTPBasicAuth(*auth)
+        self.auth = auth
+        self.deadline = deadline
+
+    def __call__(self, request: requests.PreparedRequest) -> requests.PreparedRequest:
+        with self.deadline.stage("sign"):
+            return self.auth(request)
@@ -0,0 +1,312 @@
+"""Priority-aware dispatching of requests to exchanges.
+
+If a single :class:`bitex.session.BitexSession` serves both market data polling
+and order management, an order cancellation may have to wait behind dozens of
+queued order book requests to the same exchange. A :class:`RequestDispatcher`
+queues requests per exchange and priority class instead, and executes them with
+a bounded number of concurrent requests (slots) per exchange::
+
+    >>>dispatcher = RequestDispatcher(session, slots=4, reserved=1)
+    >>>book = dispatcher.call("orderbook", "kraken", "BTCUSD")
+    >>>cancelled = dispatcher.call("cancel_order", "kraken", "BTCUSD", params={...})
+    >>>cancelled.result()  # Dispatched before any queued order book requests.
+    <BitexResponse [200]>
+
+Priority classes are, from highest to lowest: :data:`CANCEL`, :data:`NEW_ORDER`,
+:data:`PRIVATE` and :data:`PUBLIC`. The next request of an exchange is taken
+from the highest priority class with pending requests; within a class, requests
+are dispatched first-come, first-served.
+
+Of each exchange's slots, `reserved` slots are kept free for cancellations and
+new orders, so a burst of low priority requests never occupies all of them. To
+prevent starvation, requests age: for every `aging` seconds a request waits, it
+is treated as if its class were one higher.
+
+The time each request spent queued is recorded per priority class, and
+available via :meth:`RequestDispatcher.stats`.
+"""
+# Built-in
+import collections
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Deque, Dict, List, Mapping, Optional, Union
+
+# Home-brew
+from bitex.session import BitexSession
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+#: Priority class of order cancellations.
+CANCEL = 0
+
+#: Priority class of new orders.
+NEW_ORDER = 1
+
+#: Priority class of all other private endpoints.
+PRIVATE = 2
+
+#: Priority class of public market data endpoints.
+PUBLIC = 3
+
+#: Names of the priority classes.
+PRIORITY_NAMES = {CANCEL: "cancel", NEW_ORDER: "new_order", PRIVATE: "private", PUBLIC: "public"}
+
+#: Priority class of each :class:`BitexSession` endpoint method.
+ENDPOINT_PRIORITIES = {
+    "cancel_order": CANCEL,
+    "cancel_orders": CANCEL,
+    "new_order": NEW_ORDER,
+    "new_orders": NEW_ORDER,
+    "order_status": PRIVATE,
+    "wallet": PRIVATE,
+    "withdraw": PRIVATE,
+    "deposit": PRIVATE,
+    "ticker": PUBLIC,
+    "orderbook": PUBLIC,
+    "trades": PUBLIC,
+}
+
+
+class WaitStats:
+    """Queue wait times of a single priority class, in seconds.
+
+    Percentiles are computed over the most recent `window` requests.
+    """
+
+    __slots__ = ("count", "total", "max", "recent")
+
+    def __init__(self, window: int = 1024) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent: Deque[float] = collections.deque(maxlen=window)
+
+    def record(self, wait: float) -> None:
+        """Record the queue wait time of a dispatched request."""
+        self.count += 1
+        self.total += wait
+        self.max = max(self.max, wait)
+        self.recent.append(wait)
+
+    def percentile(self, fraction: float) -> float:
+        """Return the wait time below which `fraction` of recent requests waited."""
+        if not self.recent:
+            return 0.0
+        ordered = sorted(self.recent)
+        return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+    def as_dict(self) -> Dict[str, float]:
+        """Return the metrics as a dict."""
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "max": self.max,
+            "p50": self.percentile(0.5),
+            "p99": self.percentile(0.99),
+        }
+
+
+class _Request:
+    __slots__ = ("priority", "seq", "enqueued", "future", "fn", "args", "kwargs")
+
+    def __init__(self, priority, seq, enqueued, fn, args, kwargs) -> None:
+        self.priority = priority
+        self.seq = seq
+        self.enqueued = enqueued
+        self.future: Future = Future()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+
+
+class _Exchange:
+    """Queues and slot usage of a single exchange."""
+
+    def __init__(self, slots: int) -> None:
+        self.slots = slots
+        self.queues: Dict[int, Deque[_Request]] = {p: collections.deque() for p in PRIORITY_NAMES}
+        self.running = 0
+        self.running_low = 0
+        self.threads: List[threading.Thread] = []
+
+
+class RequestDispatcher:
+    """Dispatch requests by priority, with bounded concurrency per exchange.
+
+    :param BitexSession session: The session used by :meth:`call`.
+    :param slots:
+        The maximum number of concurrent requests per exchange; either a
+        number applying to all exchanges, or a mapping of exchange names to
+        numbers, with :data:`None` as the key of the default.
+    :param int reserved:
+        Slots per exchange which only :data:`CANCEL` and :data:`NEW_ORDER`
+        requests may use. At least one slot is always left for other requests.
+    :param float aging:
+        Seconds a request has to wait to be treated as one class higher; pass
+        `None` to disable aging.
+    :param Callable clock: Monotonic clock.
+    """
+
+    def __init__(
+        self,
+        session: BitexSession,
+        slots: Union[int, Mapping[Optional[str], int]] = 4,
+        reserved: int = 1,
+        aging: Optional[float] = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.session = session
+        self.slots = slots if isinstance(slots, Mapping) else {None: slots}
+        self.reserved = reserved
+        self.aging = aging
+        self.clock = clock
+        self._exchanges: Dict[str, _Exchange] = {}
+        self._stats = {priority: WaitStats() for priority in PRIORITY_NAMES}
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def submit(
+        self, priority: int, exchange: str, fn: Callable[..., Any], *args: Any, **kwargs: Any
+    ) -> Future:
+        """Queue ``fn(*args, **kwargs)`` as a request to `exchange` of the given `priority`.
+
+        :return: A future resolving to the return value of `fn`.
+        """
+        if priority not in PRIORITY_NAMES:
+            raise ValueError(f"Unknown priority class {priority!r}!")
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Cannot submit requests to a closed dispatcher!")
+            state = self._exchange(exchange)
+            request = _Request(priority, next(self._seq), self.clock(), fn, args, kwargs)
+            state.queues[priority].append(request)
+            self._cond.notify_all()
+        return request.future
+
+    def call(self, endpoint: str, exchange: str, *args: Any, **kwargs: Any) -> Future:
+        """Queue a call of the session method `endpoint`, e.g. `ticker`.
+
+        The priority class is looked up in :data:`ENDPOINT_PRIORITIES`; unknown
+        endpoints are treated as :data:`PUBLIC` requests, unless a `priority`
+        keyword argument is given.
+        """
+        priority = kwargs.pop("priority", ENDPOINT_PRIORITIES.get(endpoint, PUBLIC))
+        method = getattr(self.session, endpoint)
+        return self.submit(priority, exchange, method, exchange, *args, **kwargs)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Return the queue wait metrics of each priority class, by class name."""
+        with self._cond:
+            return {PRIORITY_NAMES[p]: stats.as_dict() for p, stats in self._stats.items()}
+
+    def pending(self, exchange: Optional[str] = None) -> Dict[str, int]:
+        """Return the number of queued requests per priority class name."""
+        with self._cond:
+            states = [
+                state
+                for name, state in self._exchanges.items()
+                if exchange is None or name == exchange
+            ]
+            return {
+                name: sum(len(state.queues[priority]) for state in states)
+                for priority, name in PRIORITY_NAMES.items()
+            }
+
+    def close(self, cancel_pending: bool = True) -> None:
+        """Stop dispatching, and wait for running requests to finish.
+
+        :param bool cancel_pending:
+            Cancel all queued requests; otherwise, they are dispatched first.
+        """
+        with self._cond:
+            self._closed = True
+            if cancel_pending:
+                for state in self._exchanges.values():
+                    for queue in state.queues.values():
+                        while queue:
+                            queue.popleft().future.cancel()
+            self._cond.notify_all()
+            threads = [t for state in self._exchanges.values() for t in state.threads]
+        for thread in threads:
+            thread.join()
+
+    def __enter__(self) -> "RequestDispatcher":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close(cancel_pending=False)
+
+    def _exchange(self, exchange: str) -> _Exchange:
+        """Return the state of `exchange`, starting its workers if necessary.
+
+        Must be called while holding :attr:`_cond`.
+        """
+        state = self._exchanges.get(exchange)
+        if state is None:
+            slots = self.slots.get(exchange, self.slots.get(None, 4))
+            state = self._exchanges[exchange] = _Exchange(slots)
+            for index in range(slots):
+                thread = threading.Thread(
+                    target=self._work,
+                    args=(state,),
+                    name=f"bitex-dispatch-{exchange}-{index}",
+                    daemon=True,
+                )
+                state.threads.append(thread)
+                thread.start()
+        return state
+
+    def _next(self, state: _Exchange, now: float) -> Optional[_Request]:
+        """Pop the next request of `state` to dispatch, if any may be dispatched now.
+
+        Must be called while holding :attr:`_cond`.
+        """
+        low_slots = max(state.slots - self.reserved, 1)
+        best = None
+        best_rank = None
+        for priority, queue in state.queues.items():
+            if not queue or (priority > NEW_ORDER and state.running_low >= low_slots):
+                continue
+            head = queue[0]
+            rank = priority
+            if self.aging:
+                rank -= (now - head.enqueued) / self.aging
+            if best_rank is None or (rank, head.seq) < (best_rank, best.seq):
+                best, best_rank = head, rank
+        if best is not None:
+            state.queues[best.priority].popleft()
+        return best
+
+    def _work(self, state: _Exchange) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    now = self.clock()
+                    request = self._next(state, now)
+                    if request is not None:
+                        break
+                    if self._closed and not any(state.queues.values()):
+                        return
+                    self._cond.wait()
+                low = request.priority > NEW_ORDER
+                state.running += 1
+                state.running_low += low
+                self._stats[request.priority].record(now - request.enqueued)
+            try:
+                if request.future.set_running_or_notify_cancel():
+                    try:
+                        result = request.fn(*request.args, **request.kwargs)
+                    except BaseException as e:
+                        request.future.set_exception(e)
+                    else:
+                        request.future.set_result(result)
+            finally:
+                with self._cond:
+                    state.running -= 1
+                    state.running_low -= low
+                    self._cond.notify_all()
@@ -0,0 +1,290 @@
+"""DNS resolution cache and address pinning for exchange hosts.
+
+By default, every new connection opened by :class:`bitex.adapter.BitexHTTPAdapter`
+resolves its host name anew. During reconnect storms this adds resolver latency
+to every single connection attempt. A :class:`DNSCache` resolves each host once,
+keeps the result for its TTL and refreshes it in the background before it
+expires::
+
+    >>>from bitex import BitexHTTPAdapter, BitexSession
+    >>>from bitex.dns import DNSCache
+    >>>session = BitexSession()
+    >>>session.mount("https://", BitexHTTPAdapter(dns_cache=DNSCache()))
+
+If a host resolves to several addresses, the background refresh measures the
+connect latency of each and connections are attempted fastest address first.
+Addresses which fail to connect are moved to the back of the list, and all but
+the last candidate are given a short connect timeout, so a dead address is
+skipped quickly.
+
+The resolver is injectable; it is called with a host name and port, and returns
+a list of addresses along with their TTL in seconds (or `None`, in which case
+:attr:`DNSCache.ttl` applies). While the resolver fails, expired entries are
+served for at most :attr:`DNSCache.max_stale` seconds longer::
+
+    >>>cache = DNSCache(resolver=lambda host, port: (["127.0.0.1"], 60.0))
+"""
+# Built-in
+import ipaddress
+import logging
+import socket
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Third-party
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+Resolver = Callable[[str, int], Tuple[List[str], Optional[float]]]
+Prober = Callable[[str, int, float], float]
+
+
+def system_resolver(host: str, port: int) -> Tuple[List[str], Optional[float]]:
+    """Resolve `host` via :func:`socket.getaddrinfo`.
+
+    The system resolver does not expose TTLs, hence `None` is returned for it.
+    """
+    infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    addresses = []
+    for *_, sockaddr in infos:
+        if sockaddr[0] not in addresses:
+            addresses.append(sockaddr[0])
+    return addresses, None
+
+
+def connect_probe(address: str, port: int, timeout: float) -> float:
+    """Return the seconds it takes to open a TCP connection to `address`."""
+    start = time.monotonic()
+    with socket.create_connection((address, port), timeout):
+        return time.monotonic() - start
+
+
+class HostEntry:
+    """Cached resolution of a single ``(host, port)``."""
+
+    __slots__ = ("addresses", "expires", "refresh_at", "latencies")
+
+    def __init__(self, addresses: List[str], expires: float, refresh_at: float) -> None:
+        self.addresses = addresses
+        self.expires = expires
+        self.refresh_at = refresh_at
+        self.latencies: Dict[str, float] = {}
+
+    def order(self) -> None:
+        """Sort :attr:`addresses` by measured latency; unmeasured ones go last."""
+        self.addresses.sort(key=lambda addr: self.latencies.get(addr, float("inf")))
+
+
+class DNSCache:
+    """Cache host name resolutions and order addresses by connect latency.
+
+    :param Callable resolver: Resolves a ``(host, port)``; see :func:`system_resolver`.
+    :param float ttl: Seconds to cache results for which the resolver gives no TTL.
+    :param float refresh_ahead:
+        Fraction of the TTL after which an entry is refreshed in the background.
+    :param Callable prober:
+        Measures the connect latency to an address; see :func:`connect_probe`.
+        Pass `None` to disable latency measurements.
+    :param float fallback_timeout:
+        Connect timeout for all but the last candidate address of a host.
+    :param float max_stale:
+        Seconds an entry is served past its expiry, while refreshing it fails.
+        Afterwards, it is resolved synchronously before use. `None` serves
+        expired entries until a refresh succeeds.
+    :param Callable clock: Monotonic clock used for expiry.
+    """
+
+    def __init__(
+        self,
+        resolver: Resolver = system_resolver,
+        ttl: float = 300.0,
+        refresh_ahead: float = 0.8,
+        prober: Optional[Prober] = connect_probe,
+        fallback_timeout: float = 1.0,
+        max_stale: Optional[float] = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.resolver = resolver
+        self.ttl = ttl
+        self.refresh_ahead = refresh_ahead
+        self.prober = prober
+        self.fallback_timeout = fallback_timeout
+        self.max_stale = max_stale
+        self.clock = clock
+        self._entries: Dict[Tuple[str, int], HostEntry] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+
+    def resolve(self, host: str, port: int, probe: bool = True) -> HostEntry:
+        """Resolve `host` now, replacing any cached entry, and return it.
+
+        Unless `probe` is False, the connect latency of each address is measured
+        if `host` resolves to more than one address.
+        """
+        addresses, ttl = self.resolver(host, port)
+        ttl = ttl if ttl is not None else self.ttl
+        now = self.clock()
+        entry = HostEntry(list(addresses), now + ttl, now + ttl * self.refresh_ahead)
+        with self._lock:
+            previous = self._entries.get((host, port))
+            if previous is not None:
+                entry.latencies = {
+                    addr: lat for addr, lat in previous.latencies.items() if addr in addresses
+                }
+            self._entries[(host, port)] = entry
+        if probe and self.prober is not None and len(entry.addresses) > 1:
+            self.probe(entry, port)
+        return entry
+
+    def probe(self, entry: HostEntry, port: int) -> None:
+        """Measure the connect latency of each address of `entry` and re-order it."""
+        for address in list(entry.addresses):
+            try:
+                latency = self.prober(address, port, self.fallback_timeout)
+            except OSError:
+                latency = float("inf")
+            self.report_latency(entry, address, latency)
+
+    def report_latency(self, entry: HostEntry, address: str, latency: float) -> None:
+        """Record a connect `latency` to `address`, smoothing it with earlier samples."""
+        with self._lock:
+            previous = entry.latencies.get(address)
+            if previous is None or previous == float("inf") or latency == float("inf"):
+                entry.latencies[address] = latency
+            else:
+                entry.latencies[address] = 0.7 * previous + 0.3 * latency
+            entry.order()
+
+    def addresses(self, host: str, port: int) -> List[str]:
+        """Return the addresses of `host`, fastest first.
+
+        Resolves synchronously if `host` is not cached yet, or its entry
+        expired more than :attr:`max_stale` seconds ago. Otherwise, expired
+        entries are still served while being refreshed in the background, so
+        a slow or briefly unavailable resolver does not delay established hosts.
+
+        :raises OSError: If resolving synchronously fails.
+        """
+        entry = self._entries.get((host, port))
+        if entry is None or (
+            self.max_stale is not None and self.clock() > entry.expires + self.max_stale
+        ):
+            # Latencies are measured by the background thread instead.
+            entry = self.resolve(host, port, probe=False)
+            self._start()
+            self._wakeup.set()
+        return list(entry.addresses)
+
+    def entry(self, host: str, port: int) -> Optional[HostEntry]:
+        """Return the cached entry for `host`, if any."""
+        return self._entries.get((host, port))
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(
+                    target=self._refresh_loop, name="bitex-dns", daemon=True
+                )
+                self._thread.start()
+
+    def _refresh_loop(self) -> None:
+        while not self._closed:
+            self._wakeup.clear()
+            now = self.clock()
+            next_refresh = now + self.ttl
+            for (host, port), entry in list(self._entries.items()):
+                if entry.refresh_at <= now:
+                    try:
+                        entry = self.resolve(host, port)
+                    except OSError:
+                        # Keep serving the stale entry, and retry shortly.
+                        log.warning("Refreshing DNS entry of %r failed", host, exc_info=True)
+                        entry.refresh_at = now + self.ttl * (1 - self.refresh_ahead)
+                elif self.prober is not None and not entry.latencies:
+                    self.probe(entry, port)
+                next_refresh = min(next_refresh, entry.refresh_at)
+            self._wakeup.wait(max(next_refresh - self.clock(), 0.1))
+
+    def close(self) -> None:
+        """Stop the background refresh."""
+        self._closed = True
+        self._wakeup.set()
+
+
+def _is_ip_address(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host.strip("[]"))
+    except ValueError:
+        return False
+    return True
+
+
+class PinnedConnectionMixin:
+    """Connect to addresses supplied by a :class:`DNSCache`, instead of resolving anew.
+
+    The host name is left untouched, so TLS server name indication and
+    certificate validation still use it.
+    """
+
+    dns_cache: DNSCache
+
+    def _new_conn(self) -> socket.socket:
+        host = self._dns_host
+        if _is_ip_address(host):
+            return super(PinnedConnectionMixin, self)._new_conn()
+        try:
+            candidates = self.dns_cache.addresses(host, self.port)
+        except OSError:
+            log.warning("Resolving %r via DNS cache failed", host, exc_info=True)
+            candidates = []
+        if not candidates:
+            return super(PinnedConnectionMixin, self)._new_conn()
+        entry = self.dns_cache.entry(host, self.port)
+        timeout = self.timeout
+        try:
+            for index, address in enumerate(candidates):
+                self._dns_host = address
+                if index < len(candidates) - 1 and self.dns_cache.fallback_timeout:
+                    self.timeout = min(timeout or float("inf"), self.dns_cache.fallback_timeout)
+                start = time.monotonic()
+                try:
+                    sock = super(PinnedConnectionMixin, self)._new_conn()
+                except (ConnectTimeoutError, NewConnectionError):
+                    if entry is not None:
+                        self.dns_cache.report_latency(entry, address, float("inf"))
+                    if index == len(candidates) - 1:
+                        raise
+                    log.debug("Connecting to %s (%s) failed; trying next address", host, address)
+                    continue
+                finally:
+                    self.timeout = timeout
+                if entry is not None:
+                    self.dns_cache.report_latency(entry, address, time.monotonic() - start)
+                return sock
+        finally:
+            self._dns_host = host
+
+
+def pinned_pool_classes(dns_cache: DNSCache) -> Dict[str, type]:
+    """Return urllib3 pool classes, by scheme, whose connections use `dns_cache`."""
+    http_conn = type(
+        "PinnedHTTPConnection", (PinnedConnectionMixin, HTTPConnection), {"dns_cache": dns_cache}
+    )
+    https_conn = type(
+        "PinnedHTTPSConnection", (PinnedConnectionMixin, HTTPSConnection), {"dns_cache": dns_cache}
+    )
+    return {
+        "http": type(
+            "PinnedHTTPConnectionPool", (HTTPConnectionPool,), {"ConnectionCls": http_conn}
+        ),
+        "https": type(
+            "PinnedHTTPSConnectionPool", (HTTPSConnectionPool,), {"ConnectionCls": https_conn}
+        ),
+    }
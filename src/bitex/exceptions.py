@@ -1,4 +1,6 @@
 """Custom exceptions raised by the :mod:`bitex-framework` code base."""
+# Built-in
+from typing import Dict, Optional
 
 
 class MissingPlugin(ValueError):
@@ -10,3 +12,18 @@ class MissingPlugin(ValueError):
     def __init__(self, plugin_name: str, *args: list, **kwargs: dict) -> None:
         msg = f"Missing plugin to handle requests for {plugin_name!r}!"
         super(MissingPlugin, self).__init__(msg, *args, **kwargs)
+
+
+class DeadlineExceeded(TimeoutError):
+    """The deadline of a request expired before it completed.
+
+    :param str stage: The stage of the request during which the deadline expired.
+    :param dict stages: The seconds spent in each stage of the request so far.
+    """
+
+    def __init__(self, stage: str, stages: Optional[Dict[str, float]] = None, *args: list) -> None:
+        self.stage = stage
+        self.stages = dict(stages or {})
+        spent = ", ".join(f"{name}={seconds:.3f}s" for name, seconds in self.stages.items())
+        msg = f"Deadline exceeded during {stage!r}!" + (f" ({spent})" if spent else "")
+        super(DeadlineExceeded, self).__init__(msg, *args)
@@ -0,0 +1,141 @@
+"""Fixed-point integer representation of prices and sizes.
+
+Converting every price and size to :class:`decimal.Decimal` is slow and memory
+hungry. Instead, a value may be stored as an integer mantissa together with a
+scale, which denotes the number of decimal places of the instrument::
+
+    >>>to_scaled("3809.10", 2)
+    380910
+    >>>to_str(380910, 2)
+    '3809.10'
+
+All conversions are exact: values with more significant decimal places than
+the scale permits raise a :exc:`ValueError` instead of being rounded silently.
+
+:func:`parse_many` converts entire columns of decimal strings into compact
+:class:`array.array` buffers of signed 64-bit integers.
+"""
+# Built-in
+import re
+from array import array
+from decimal import Decimal
+from typing import Iterable, Tuple, Union
+
+Number = Union[str, int, float, Decimal]
+
+_INT64_MIN = -(2 ** 63)
+_INT64_MAX = 2 ** 63 - 1
+_POWERS = [10 ** i for i in range(19)]
+#: Plain decimal notation, optionally with an exponent; no underscores or whitespace.
+_NUMBER = re.compile(r"[+-]?(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][+-]?[0-9]+)?")
+
+
+def _pow10(exponent: int) -> int:
+    return _POWERS[exponent] if exponent < len(_POWERS) else 10 ** exponent
+
+
+def is_number(value: object) -> bool:
+    """Check whether `value` is a finite number, or a string in decimal notation."""
+    if isinstance(value, bool):
+        return False
+    if isinstance(value, int):
+        return True
+    if isinstance(value, float):
+        return value == value and value not in (float("inf"), float("-inf"))
+    if isinstance(value, Decimal):
+        return value.is_finite()
+    return isinstance(value, str) and _NUMBER.fullmatch(value) is not None
+
+
+def to_scaled(value: Number, scale: int) -> int:
+    """Return the mantissa of `value` at the given `scale`.
+
+    Strings are parsed directly, without a detour via :class:`float` or
+    :class:`decimal.Decimal`. Floats are converted via their shortest
+    :func:`repr`, i.e. `0.1` is treated as `"0.1"`.
+
+    :raises ValueError:
+        If `scale` is negative, `value` is not a number (see :func:`is_number`),
+        or has more significant decimal places than `scale` allows.
+    """
+    if scale < 0:
+        raise ValueError(f"Scale must not be negative, got {scale}!")
+    if isinstance(value, int):
+        return value * _pow10(scale)
+    if isinstance(value, float):
+        value = repr(value)
+    elif isinstance(value, Decimal):
+        value = str(value)
+    if _NUMBER.fullmatch(value) is None:
+        raise ValueError(f"{value!r} is not a decimal number!")
+    whole, _, fraction = value.partition(".")
+    if "e" in fraction or "E" in fraction or "e" in whole or "E" in whole:
+        return _scaled_from_decimal(Decimal(value), scale)
+    if len(fraction) > scale:
+        if fraction[scale:].strip("0"):
+            raise ValueError(f"{value!r} has more than {scale} decimal places!")
+        fraction = fraction[:scale]
+    digits = whole + fraction + "0" * (scale - len(fraction))
+    return int(digits)
+
+
+def _scaled_from_decimal(value: Decimal, scale: int) -> int:
+    scaled = value.scaleb(scale)
+    if scaled != scaled.to_integral_value():
+        raise ValueError(f"{value!r} has more than {scale} decimal places!")
+    return int(scaled)
+
+
+def parse_many(values: Iterable[Number], scale: int) -> array:
+    """Convert `values` into an array of signed 64-bit mantissas at `scale`.
+
+    :raises OverflowError: If a mantissa does not fit into 64 bits.
+    """
+    return array("q", [to_scaled(value, scale) for value in values])
+
+
+def to_decimal(mantissa: int, scale: int) -> Decimal:
+    """Return the exact :class:`decimal.Decimal` value of `mantissa` at `scale`."""
+    return Decimal(mantissa).scaleb(-scale)
+
+
+def to_str(mantissa: int, scale: int) -> str:
+    """Format `mantissa` at `scale` as a decimal string with `scale` decimal places."""
+    if scale == 0:
+        return str(mantissa)
+    sign = "-" if mantissa < 0 else ""
+    digits = str(abs(mantissa)).rjust(scale + 1, "0")
+    return f"{sign}{digits[:-scale]}.{digits[-scale:]}"
+
+
+def rescale(mantissa: int, scale: int, new_scale: int) -> int:
+    """Convert `mantissa` from `scale` to `new_scale`.
+
+    :raises ValueError: If precision would be lost.
+    """
+    if new_scale >= scale:
+        return mantissa * _pow10(new_scale - scale)
+    quotient, remainder = divmod(mantissa, _pow10(scale - new_scale))
+    if remainder:
+        raise ValueError(f"Rescaling {mantissa} from {scale} to {new_scale} loses precision!")
+    return quotient
+
+
+def add(a: int, a_scale: int, b: int, b_scale: int) -> Tuple[int, int]:
+    """Add two scaled values, returning ``(mantissa, scale)`` at the larger scale."""
+    scale = max(a_scale, b_scale)
+    return rescale(a, a_scale, scale) + rescale(b, b_scale, scale), scale
+
+
+def multiply(a: int, a_scale: int, b: int, b_scale: int) -> Tuple[int, int]:
+    """Multiply two scaled values exactly, e.g. a price and a size.
+
+    The result is returned as ``(mantissa, scale)``, where `scale` is the sum
+    of both input scales.
+    """
+    return a * b, a_scale + b_scale
+
+
+def fits_int64(mantissa: int) -> bool:
+    """Check whether `mantissa` can be stored as a signed 64-bit integer."""
+    return _INT64_MIN <= mantissa <= _INT64_MAX
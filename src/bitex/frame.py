@@ -0,0 +1,374 @@
+"""Build a single table from the formatted data of many responses.
+
+Concatenating the :meth:`key_value_dict` or :meth:`triples` results of many
+responses into a list of dicts, and converting that into a table afterwards,
+holds every value twice, as Python objects and in the table. A
+:class:`FrameBuilder` instead converts the rows straight into one typed,
+growable buffer per column::
+
+    >>>builder = FrameBuilder()
+    >>>futures = [dispatcher.call("ticker", "kraken", pair) for pair in pairs]
+    >>>for future in futures:
+    ...    builder.append_response(future.result())
+    >>>len(builder)
+    250
+    >>>builder.schema
+    {'pair': 'object', 'bid': 'float', 'ask': 'float', 'timestamp': 'int'}
+    >>>df = builder.to_pandas()
+
+Integer, float and bool columns are stored in :class:`array.array` buffers
+of 64-bit integers, 64-bit floats and bytes, respectively; all other values
+in lists. Unless given explicitly, the type of each column is inferred from
+the first rows it appears in. Numeric strings, as many exchanges return
+prices and sizes, are parsed into integer or float columns, unless
+`parse_numbers` is disabled.
+
+Columns are widened if a later value does not fit their type: integer
+columns to float columns, and any column to an object column, in which case
+the values already stored are converted once. Missing values are stored as
+`NaN` in float columns and `None` in object columns; integer and bool
+columns with missing values are widened accordingly.
+
+:meth:`to_numpy` and :meth:`to_pandas` require :mod:`numpy` and
+:mod:`pandas`, respectively, which may be installed via::
+
+    pip install bitex-framework[frame]
+
+A builder is not thread-safe; append rows from a single thread.
+"""
+# Built-in
+import itertools
+from array import array
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Union,
+)
+
+# Home-brew
+from bitex.types import Triple
+
+try:
+    # Third-party
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+try:
+    # Third-party
+    import pandas
+except ImportError:  # pragma: no cover
+    pandas = None
+
+if TYPE_CHECKING:  # pragma: no cover
+    # Home-brew
+    from bitex.response import BitexResponse
+
+#: Column types, and the :class:`array.array` type codes storing them.
+KINDS = {"int": "q", "float": "d", "bool": "b", "object": None}
+
+#: Number of rows the type of a new column is inferred from.
+INFER_ROWS = 100
+
+Buffer = Union[array, List[Any]]
+
+_NAN = float("nan")
+
+
+def infer_kind(values: Iterable[Any], parse_numbers: bool = True) -> str:
+    """Return the narrowest column type able to store all `values`.
+
+    `None` values are ignored, but turn integer and bool columns into float
+    and object columns, respectively.
+    """
+    kinds = set()
+    missing = False
+    for value in values:
+        if value is None:
+            missing = True
+        elif isinstance(value, bool):
+            kinds.add("bool")
+        elif isinstance(value, int):
+            kinds.add("int")
+        elif isinstance(value, float):
+            kinds.add("float")
+        elif parse_numbers and isinstance(value, str):
+            kinds.add(_numeric_kind(value))
+        else:
+            kinds.add("object")
+    if not kinds:
+        return "float"
+    if kinds == {"bool"}:
+        return "object" if missing else "bool"
+    if kinds == {"int"}:
+        return "float" if missing else "int"
+    if kinds <= {"int", "float"}:
+        return "float"
+    return "object"
+
+
+def _numeric_kind(value: str) -> str:
+    try:
+        int(value)
+        return "int"
+    except ValueError:
+        pass
+    try:
+        float(value)
+        return "float"
+    except ValueError:
+        return "object"
+
+
+class Column:
+    """A growable, typed buffer of values.
+
+    :param str kind: The column type, one of :data:`KINDS`.
+    :param bool parse_numbers: Whether to parse numeric strings.
+    """
+
+    __slots__ = ("kind", "data", "parse_numbers", "append")
+
+    def __init__(self, kind: str, parse_numbers: bool = True) -> None:
+        if kind not in KINDS:
+            raise ValueError(f"Unknown column type {kind!r}!")
+        self.parse_numbers = parse_numbers
+        self._set(kind, array(KINDS[kind]) if KINDS[kind] else [])
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def _set(self, kind: str, data: Buffer) -> None:
+        self.kind = kind
+        self.data = data
+        self.append: Callable[[Any], None] = getattr(self, f"_append_{kind}")
+
+    def extend(self, values: List[Any]) -> None:
+        """Append `values`, converting them all at once if they fit the column."""
+        try:
+            if self.kind == "int":
+                converted = array("q", values)
+            elif self.kind == "float" and self.parse_numbers:
+                converted = array("d", map(float, values))
+            elif self.kind == "object":
+                self.data.extend(values)
+                return
+            else:
+                raise TypeError
+        except (TypeError, ValueError, OverflowError):
+            # Missing, unparsed or unfitting values; append them one by one.
+            for value in values:
+                self.append(value)
+            return
+        self.data.extend(converted)
+
+    def widen(self, kind: str) -> None:
+        """Convert the column to `kind`, i.e. to a float or object column."""
+        if kind == "float":
+            self._set(kind, array("d", self.data))
+        elif self.kind == "bool":
+            self._set(kind, [bool(value) for value in self.data])
+        else:
+            self._set(kind, self.data.tolist() if isinstance(self.data, array) else self.data)
+
+    def fill(self, count: int) -> None:
+        """Append `count` missing values, widening the column if necessary."""
+        if self.kind in ("int", "bool"):
+            self.widen("float" if self.kind == "int" else "object")
+        self.data.extend([_NAN if self.kind == "float" else None] * count)
+
+    def _append_int(self, value: Any) -> None:
+        if isinstance(value, int):
+            try:
+                self.data.append(value)
+                return
+            except OverflowError:
+                kind = "object"
+        elif self.parse_numbers and isinstance(value, str):
+            kind = _numeric_kind(value)
+            if kind == "int":
+                try:
+                    self.data.append(int(value))
+                    return
+                except OverflowError:
+                    kind = "object"
+        elif value is None or isinstance(value, float):
+            kind = "float"
+        else:
+            kind = "object"
+        self.widen(kind)
+        self.append(value)
+
+    def _append_float(self, value: Any) -> None:
+        if value is None:
+            self.data.append(_NAN)
+            return
+        if not self.parse_numbers and isinstance(value, str):
+            self.widen("object")
+            self.append(value)
+            return
+        try:
+            self.data.append(float(value))
+        except (TypeError, ValueError):
+            self.widen("object")
+            self.append(value)
+
+    def _append_bool(self, value: Any) -> None:
+        if type(value) is bool:
+            self.data.append(value)
+        else:
+            self.widen("object")
+            self.append(value)
+
+    def _append_object(self, value: Any) -> None:
+        self.data.append(value)
+
+
+class FrameBuilder:
+    """Accumulate rows into typed columns, and finalize them into a table.
+
+    Rows are converted in batches, one column at a time. Until then, only
+    references to the rows are held.
+
+    :param Mapping schema:
+        The type of each column, by name; see :data:`KINDS`. The types of
+        columns not stated are inferred.
+    :param int batch_rows:
+        Number of rows per batch. The types of columns are inferred from the
+        first :data:`INFER_ROWS` rows of the first batch they appear in.
+    :param bool parse_numbers:
+        Parse numeric strings into integer and float columns.
+    """
+
+    def __init__(
+        self,
+        schema: Optional[Mapping[str, str]] = None,
+        batch_rows: int = 1024,
+        parse_numbers: bool = True,
+    ) -> None:
+        self.batch_rows = max(batch_rows, 1)
+        self.parse_numbers = parse_numbers
+        self.columns: Dict[str, Column] = {}
+        for name, kind in (schema or {}).items():
+            self.columns[name] = Column(kind, parse_numbers)
+        self._rows = 0
+        self._pending: List[Mapping[str, Any]] = []
+
+    def __len__(self) -> int:
+        return self._rows + len(self._pending)
+
+    @property
+    def schema(self) -> Dict[str, str]:
+        """Return the type of each column, by name."""
+        self._flush()
+        return {name: column.kind for name, column in self.columns.items()}
+
+    def append(self, row: Mapping[str, Any]) -> None:
+        """Append `row`, a mapping of column names to values."""
+        self._pending.append(row)
+        if len(self._pending) >= self.batch_rows:
+            self._flush()
+
+    def extend(self, rows: Iterable[Mapping[str, Any]]) -> None:
+        """Append each of `rows`."""
+        for row in rows:
+            self.append(row)
+
+    def append_triples(self, triples: Iterable[Triple], timestamp: str = "timestamp") -> None:
+        """Append `triples`, with one row per distinct timestamp.
+
+        The timestamp is stored in column `timestamp`, and each value in the
+        column named by its label.
+        """
+        rows: Dict[Any, Dict[str, Any]] = {}
+        for ts, label, value in triples:
+            row = rows.get(ts)
+            if row is None:
+                row = rows[ts] = {timestamp: ts}
+            row[label] = value
+        for row in rows.values():
+            self.append(row)
+
+    def append_response(
+        self, response: "BitexResponse", formatter: str = "key_value_dict"
+    ) -> None:
+        """Append the data of `response`, as returned by its `formatter`.
+
+        :param str formatter:
+            Either ``key_value_dict``, whose result is appended as one row (or
+            as several, if the plugin returns a list of dicts), or ``triples``.
+        """
+        if formatter == "triples":
+            self.append_triples(response.triples())
+            return
+        if formatter != "key_value_dict":
+            raise ValueError(f"Unknown formatter {formatter!r}!")
+        data = response.key_value_dict()
+        if isinstance(data, Mapping):
+            self.append(data)
+        else:
+            self.extend(data)
+
+    def to_columns(self) -> Dict[str, Buffer]:
+        """Return the buffer of each column, by name.
+
+        The buffers are those of the builder, not copies; appending further
+        rows modifies them.
+        """
+        self._flush()
+        return {name: column.data for name, column in self.columns.items()}
+
+    def to_numpy(self) -> Dict[str, "numpy.ndarray"]:
+        """Return each column as a :class:`numpy.ndarray`, by name.
+
+        Integer, float and bool columns share the memory of the buffers of the
+        builder; do not append further rows while the arrays are in use.
+        """
+        if numpy is None:
+            raise ImportError(
+                "FrameBuilder.to_numpy requires numpy; "
+                "install it via 'pip install bitex-framework[frame]'"
+            )
+        arrays = {}
+        for name, data in self.to_columns().items():
+            kind = self.columns[name].kind
+            if kind == "object":
+                arrays[name] = numpy.empty(len(data), dtype=object)
+                arrays[name][:] = data
+            else:
+                dtype = {"int": numpy.int64, "float": numpy.float64, "bool": numpy.int8}[kind]
+                arrays[name] = numpy.frombuffer(data, dtype=dtype)
+                if kind == "bool":
+                    arrays[name] = arrays[name].view(numpy.bool_)
+        return arrays
+
+    def to_pandas(self) -> "pandas.DataFrame":
+        """Return the columns as a :class:`pandas.DataFrame`."""
+        if pandas is None:
+            raise ImportError(
+                "FrameBuilder.to_pandas requires pandas; "
+                "install it via 'pip install bitex-framework[frame]'"
+            )
+        return pandas.DataFrame(self.to_numpy(), columns=list(self.columns))
+
+    def _flush(self) -> None:
+        """Convert the pending rows into the columns, adding any new columns."""
+        rows, self._pending = self._pending, []
+        if not rows:
+            return
+        for name in dict.fromkeys(itertools.chain.from_iterable(rows)):
+            if name not in self.columns:
+                sample = [row.get(name) for row in rows[:INFER_ROWS]]
+                column = Column(infer_kind(sample, self.parse_numbers), self.parse_numbers)
+                if self._rows:
+                    column.fill(self._rows)
+                self.columns[name] = column
+        for name, column in self.columns.items():
+            column.extend([row.get(name) for row in rows])
+        self._rows += len(rows)
@@ -0,0 +1,283 @@
+"""Optional HTTP/2 transport adapter for :mod:`bitex-framework`.
+
+:class:`BitexHTTPAdapter` is built on urllib3's HTTP/1.1 connection pools, which
+require one socket per in-flight request. :class:`BitexHTTP2Adapter` multiplexes
+concurrent requests to a host over a single HTTP/2 connection instead::
+
+    >>>from bitex import BitexSession
+    >>>from bitex.http2 import BitexHTTP2Adapter
+    >>>session = BitexSession()
+    >>>session.mount("https://", BitexHTTP2Adapter())
+
+Responses are still built by :meth:`BitexHTTPAdapter.build_response`, so plugin
+supplied response classes apply as usual.
+
+Hosts which do not negotiate HTTP/2, or fail to speak it, are remembered and
+served via the regular HTTP/1.1 connection pools from then on. A request
+failing with an HTTP/2 protocol error is only resent via HTTP/1.1 if its
+method is safe (see :data:`SAFE_METHODS`), since the host may have processed
+it already; otherwise, a :exc:`requests.ConnectionError` is raised. Requests
+using proxies are always sent via HTTP/1.1.
+
+The `verify` and `cert` arguments of each request are honored as by
+:class:`BitexHTTPAdapter`; an HTTP/2 client is kept per distinct combination
+of them. Cookies are handled by the session alone: the clients never store
+cookies set by responses, nor send any of their own.
+
+This adapter requires :mod:`httpx` with HTTP/2 support, which is installed via::
+
+    pip install bitex-framework[http2]
+"""
+# Built-in
+import logging
+import os
+import ssl
+import threading
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from typing import Any, Dict, Iterator, Optional, Set, Tuple, Union
+
+# Third-party
+from requests import exceptions
+from requests.packages.urllib3.util import parse_url
+from requests.utils import DEFAULT_CA_BUNDLE_PATH
+
+# Home-brew
+from bitex.adapter import BitexHTTPAdapter
+from bitex.deadline import Deadline
+from bitex.request import BitexPreparedRequest
+from bitex.response import BitexResponse
+
+try:
+    # Third-party
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+#: Connection-specific headers, which are forbidden in HTTP/2 requests.
+HOP_BY_HOP_HEADERS = frozenset(
+    ("connection", "keep-alive", "proxy-connection", "transfer-encoding", "upgrade")
+)
+
+#: Methods whose requests are resent via HTTP/1.1 after an HTTP/2 protocol error.
+SAFE_METHODS = frozenset(("GET", "HEAD", "OPTIONS"))
+
+TLSKey = Tuple[Union[bool, str], Any]
+
+
+def ssl_context(verify: Union[bool, str] = True, cert: Any = None) -> ssl.SSLContext:
+    """Return an SSL context for the `verify` and `cert` arguments of a request.
+
+    :raises OSError: If the CA bundle or client certificate can't be loaded.
+    """
+    if verify is False:
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    else:
+        ca = DEFAULT_CA_BUNDLE_PATH if verify is True else verify
+        if os.path.isdir(ca):
+            context = ssl.create_default_context(capath=ca)
+        else:
+            context = ssl.create_default_context(cafile=ca)
+    if cert:
+        if isinstance(cert, str):
+            context.load_cert_chain(cert)
+        else:
+            context.load_cert_chain(*cert)
+    return context
+
+
+def _no_cookies() -> CookieJar:
+    """Return a cookie jar which never stores cookies."""
+    return CookieJar(policy=DefaultCookiePolicy(allowed_domains=[]))
+
+
+class HTTP2RawResponse:
+    """Wrap an :class:`httpx.Response` in the interface of a urllib3 response.
+
+    This is what :class:`requests.Response` expects to find at its `raw`
+    attribute, and allows re-using :meth:`BitexHTTPAdapter.build_response`.
+    """
+
+    def __init__(self, response: "httpx.Response") -> None:
+        self._response = response
+        self.status = response.status_code
+        self.reason = response.reason_phrase
+        self.headers = response.headers
+        self.http_version = response.http_version
+
+    @property
+    def closed(self) -> bool:
+        return self._response.is_closed
+
+    def stream(self, amt: int = 2 ** 16, decode_content: bool = True) -> Iterator[bytes]:
+        """Yield the (decoded) body in chunks of up to `amt` bytes."""
+        if decode_content:
+            yield from self._response.iter_bytes(amt)
+        else:
+            yield from self._response.iter_raw(amt)
+
+    def read(self, amt: Optional[int] = None, decode_content: bool = True) -> bytes:
+        """Read and return the entire remaining body."""
+        return b"".join(self.stream(decode_content=decode_content))
+
+    def release_conn(self) -> None:
+        self._response.close()
+
+    def close(self) -> None:
+        self._response.close()
+
+
+class BitexHTTP2Adapter(BitexHTTPAdapter):
+    """HTTP/2 capable variant of :class:`BitexHTTPAdapter`.
+
+    :param bool prior_knowledge:
+        Speak HTTP/2 to plain-text (`http://`) hosts without negotiation. Only
+        enable this for hosts known to support HTTP/2 over cleartext.
+    :param int max_connections:
+        Maximum number of HTTP/2 connections kept open across all hosts.
+    :param httpx.Client client:
+        The client to send HTTP/2 requests with TLS verification against the
+        default CA bundle and without a client certificate; one is created by
+        default. Its cookie jar is replaced by one which stores no cookies.
+    :param Any kwargs: Passed on to :class:`BitexHTTPAdapter`.
+    """
+
+    def __init__(
+        self,
+        prior_knowledge: bool = False,
+        max_connections: int = 100,
+        client: Optional["httpx.Client"] = None,
+        **kwargs: Any,
+    ) -> None:
+        if httpx is None:
+            raise ImportError(
+                "BitexHTTP2Adapter requires httpx; "
+                "install it via 'pip install bitex-framework[http2]'"
+            )
+        super(BitexHTTP2Adapter, self).__init__(**kwargs)
+        self.prior_knowledge = prior_knowledge
+        self.max_connections = max_connections
+        self.client = client or self._new_client(True)
+        self.client.cookies = _no_cookies()
+        #: Hosts which are served via HTTP/1.1 connection pools.
+        self.http1_hosts: Set[str] = set()
+        self._clients: Dict[TLSKey, "httpx.Client"] = {(True, None): self.client}
+        self._lock = threading.Lock()
+
+    def _new_client(self, verify: Union[bool, ssl.SSLContext]) -> "httpx.Client":
+        return httpx.Client(
+            http1=not self.prior_knowledge,
+            http2=True,
+            verify=verify,
+            trust_env=False,
+            follow_redirects=False,
+            cookies=_no_cookies(),
+            limits=httpx.Limits(max_connections=self.max_connections),
+        )
+
+    def client_for(self, verify: Union[bool, str] = True, cert: Any = None) -> "httpx.Client":
+        """Return the client sending requests with the given `verify` and `cert` arguments."""
+        key = (verify, tuple(cert) if isinstance(cert, list) else cert)
+        client = self._clients.get(key)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(key)
+                if client is None:
+                    client = self._clients[key] = self._new_client(ssl_context(verify, cert))
+        return client
+
+    def close(self) -> None:
+        """Close the HTTP/2 connections as well as the HTTP/1.1 pools."""
+        for client in list(self._clients.values()):
+            client.close()
+        super(BitexHTTP2Adapter, self).close()
+
+    def fallback(self, host: str) -> None:
+        """Send all future requests to `host` via HTTP/1.1."""
+        with self._lock:
+            if host not in self.http1_hosts:
+                log.info("Falling back to HTTP/1.1 for host %r", host)
+                self.http1_hosts.add(host)
+
+    @staticmethod
+    def _timeout(timeout: Union[None, float, Tuple[float, float]]) -> "httpx.Timeout":
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            return httpx.Timeout(read, connect=connect)
+        return httpx.Timeout(timeout)
+
+    def send(
+        self,
+        request: BitexPreparedRequest,
+        stream: bool = False,
+        timeout: Union[None, float, Tuple[float, float]] = None,
+        verify: Union[bool, str] = True,
+        cert: Any = None,
+        proxies: Any = None,
+    ) -> BitexResponse:
+        """Send `request` via HTTP/2, falling back to HTTP/1.1 where necessary.
+
+        The signature is identical to :meth:`requests.adapters.HTTPAdapter.send`.
+        `verify` and `cert` select the client the request is sent with; see
+        :meth:`client_for`.
+        Deadlines are handled as by :meth:`BitexHTTPAdapter.send`.
+        """
+        deadline = getattr(request, "deadline", None)
+        if not isinstance(deadline, Deadline):
+            return self._send(request, stream, timeout, verify, cert, proxies)
+        with deadline.stage("send"):
+            return self._send(request, stream, deadline.clamp(timeout), verify, cert, proxies)
+
+    def _send(
+        self,
+        request: BitexPreparedRequest,
+        stream: bool,
+        timeout: Union[None, float, Tuple[float, float]],
+        verify: Union[bool, str],
+        cert: Any,
+        proxies: Any,
+    ) -> BitexResponse:
+        host = parse_url(request.url).netloc
+        if proxies or host in self.http1_hosts:
+            return super(BitexHTTP2Adapter, self).send(
+                request, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies
+            )
+        headers = [
+            (name, value)
+            for name, value in request.headers.items()
+            if name.lower() not in HOP_BY_HOP_HEADERS
+        ]
+        client = self.client_for(verify, cert)
+        outgoing = client.build_request(
+            request.method,
+            request.url,
+            headers=headers,
+            content=request.body,
+            timeout=self._timeout(timeout),
+        )
+        try:
+            resp = client.send(outgoing, stream=True)
+        except httpx.ConnectTimeout as e:
+            raise exceptions.ConnectTimeout(e, request=request)
+        except httpx.TimeoutException as e:
+            raise exceptions.ReadTimeout(e, request=request)
+        except (httpx.RemoteProtocolError, httpx.UnsupportedProtocol) as e:
+            # The host does not speak HTTP/2 (properly); use HTTP/1.1 from now on.
+            self.fallback(host)
+            if isinstance(e, httpx.RemoteProtocolError) and request.method not in SAFE_METHODS:
+                # The host may have processed the request already; don't send it twice.
+                raise exceptions.ConnectionError(e, request=request)
+            return super(BitexHTTP2Adapter, self).send(
+                request, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies
+            )
+        except httpx.TransportError as e:
+            raise exceptions.ConnectionError(e, request=request)
+
+        if resp.http_version != "HTTP/2":
+            # ALPN negotiated HTTP/1.1; use the regular pools from now on.
+            self.fallback(host)
+        return self.build_response(request, HTTP2RawResponse(resp))
@@ -0,0 +1,263 @@
+"""Declarative mappings from exchange JSON to :mod:`bitex-framework` formats.
+
+Instead of walking :meth:`BitexResponse.json` by hand to implement
+:meth:`BitexResponse.triples` and :meth:`BitexResponse.key_value_dict`, plugins
+may describe where each value is found, and sub-class :class:`MappedResponse`::
+
+    >>>class KrakenTickerResponse(MappedResponse):
+    ...    mapping = ResponseMap(
+    ...        {
+    ...            "bid": Field("result.*.b.0", float),
+    ...            "ask": Field("result.*.a.0", float),
+    ...            "last": "result.*.c.0",
+    ...        }
+    ...    )
+
+Paths are dot-separated keys; integers index lists, and `*` selects the first
+value of an object (useful for responses keyed by an exchange-specific pair
+name). Arrays of rows, such as trades or book levels, are described by passing
+the path of the array as `rows`; field paths are then relative to each row::
+
+    >>>class KrakenTradesResponse(MappedResponse):
+    ...    mapping = ResponseMap(
+    ...        {"price": Field("0", float), "size": Field("1", float)},
+    ...        rows="result.*",
+    ...        timestamp="2",
+    ...    )
+
+Several arrays are combined by passing a mapping of group names to paths
+instead; the group name of each row is stored in the `group` column (e.g.
+`side`, for the bids and asks of an order book).
+
+Each :class:`ResponseMap` is compiled exactly once, into a Python function
+which extracts all fields without any per-value interpretation of the mapping.
+"""
+# Built-in
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, Union
+
+# Home-brew
+from bitex.response import BitexResponse
+from bitex.types import KeyValuePairs, Triple
+
+Step = Union[str, int]
+PathSpec = Union[str, Tuple[Step, ...]]
+
+#: Wildcard step, selecting the first value of a JSON object.
+WILDCARD = "*"
+
+
+def _first(obj: Any) -> Any:
+    """Return the first value of the JSON object `obj`."""
+    return next(iter(obj.values()))
+
+
+def parse_path(path: PathSpec) -> Tuple[Step, ...]:
+    """Split a dot-separated `path` into its steps.
+
+    Steps consisting of digits (optionally negative) are converted to list indices.
+    """
+    if isinstance(path, tuple):
+        return path
+    steps: List[Step] = []
+    for step in path.split(".") if path else ():
+        try:
+            steps.append(int(step))
+        except ValueError:
+            steps.append(step)
+    return tuple(steps)
+
+
+class Field:
+    """Location and type of a single value in a JSON response.
+
+    :param path: Dot-separated path, or tuple of keys and indices.
+    :param Callable type: Converter applied to the raw value, if given.
+    :param bool optional:
+        Return `None` instead of raising an error if the value is missing.
+    """
+
+    __slots__ = ("path", "type", "optional")
+
+    def __init__(
+        self, path: PathSpec, type: Optional[Callable[[Any], Any]] = None, optional: bool = False
+    ) -> None:
+        self.path = parse_path(path)
+        self.type = type
+        self.optional = optional
+
+    def __repr__(self) -> str:
+        return f"<Field {'.'.join(map(str, self.path)) or '.'}>"
+
+
+def _field(spec: Union[str, Field]) -> Field:
+    return spec if isinstance(spec, Field) else Field(spec)
+
+
+class _Compiler:
+    """Generate the source code of an extractor function."""
+
+    def __init__(self) -> None:
+        self.namespace: Dict[str, Any] = {"_first": _first, "_lookup": self.lookup}
+
+    @staticmethod
+    def lookup(obj: Any, path: Tuple[Step, ...]) -> Any:
+        """Slow path for optional fields; return `None` if `path` is missing."""
+        try:
+            for step in path:
+                obj = _first(obj) if step == WILDCARD else obj[step]
+        except (KeyError, IndexError, TypeError, StopIteration):
+            return None
+        return obj
+
+    def bind(self, value: Any) -> str:
+        """Make `value` available to the generated code, and return its name."""
+        name = f"_c{len(self.namespace)}"
+        self.namespace[name] = value
+        return name
+
+    @staticmethod
+    def path(root: str, path: Tuple[Step, ...]) -> str:
+        expr = root
+        for step in path:
+            expr = f"_first({expr})" if step == WILDCARD else f"{expr}[{step!r}]"
+        return expr
+
+    def value(self, root: str, field: Field) -> str:
+        if field.optional:
+            expr = f"_lookup({root}, {self.bind(field.path)})"
+            if field.type is not None:
+                return f"(None if ({expr}) is None else {self.bind(field.type)}({expr}))"
+            return expr
+        expr = self.path(root, field.path)
+        if field.type is not None:
+            return f"{self.bind(field.type)}({expr})"
+        return expr
+
+    def compile(self, source: str) -> Callable[[Any], Any]:
+        code = compile(source, "<bitex.mapping>", "exec")
+        exec(code, self.namespace)
+        return self.namespace["extract"]
+
+
+class ResponseMap:
+    """Declarative description of a response's data.
+
+    :param Mapping fields:
+        Labels and the :class:`Field` (or path) of their values.
+    :param rows:
+        Path of an array of rows, or a mapping of group names to such paths.
+        If given, :attr:`fields` and `timestamp` are relative to each row.
+    :param timestamp: :class:`Field` (or path) of the exchange's timestamp.
+    :param str group: Label of the group name column, if `rows` is a mapping.
+    """
+
+    def __init__(
+        self,
+        fields: Mapping[str, Union[str, Field]],
+        rows: Optional[Union[PathSpec, Mapping[str, PathSpec]]] = None,
+        timestamp: Optional[Union[str, Field]] = None,
+        group: str = "side",
+    ) -> None:
+        self.fields = {label: _field(spec) for label, spec in fields.items()}
+        self.timestamp = _field(timestamp) if timestamp is not None else None
+        if rows is None or isinstance(rows, Mapping):
+            self.rows = rows
+        else:
+            self.rows = {None: rows}
+        self.group = group
+        self.source, self.extract = self._compile()
+
+    @property
+    def is_rows(self) -> bool:
+        """Whether the mapping describes arrays of rows."""
+        return self.rows is not None
+
+    @property
+    def labels(self) -> Tuple[str, ...]:
+        """Labels of the values returned by :attr:`extract`, in order.
+
+        The timestamp is always the first value; for row layouts with several
+        groups, the group name is the second.
+        """
+        labels: Tuple[str, ...] = ("timestamp",)
+        if self.is_rows and None not in self.rows:
+            labels += (self.group,)
+        return labels + tuple(self.fields)
+
+    def _compile(self) -> Tuple[str, Callable[[Any], Any]]:
+        compiler = _Compiler()
+        if not self.is_rows:
+            values = [compiler.value("data", field) for field in self.fields.values()]
+            timestamp = compiler.value("data", self.timestamp) if self.timestamp else "None"
+            columns = "".join(f"{value}, " for value in [timestamp] + values)
+            source = f"def extract(data):\n    return ({columns})\n"
+            return source, compiler.compile(source)
+
+        values = [compiler.value("row", field) for field in self.fields.values()]
+        timestamp = compiler.value("row", self.timestamp) if self.timestamp else "None"
+        lines = ["def extract(data):", "    rows = []"]
+        for name, path in self.rows.items():
+            columns = [timestamp] + ([repr(name)] if name is not None else []) + values
+            array = compiler.path("data", parse_path(path))
+            lines.append(f"    rows.extend([({', '.join(columns)},) for row in {array}])")
+        lines.append("    return rows")
+        source = "\n".join(lines) + "\n"
+        return source, compiler.compile(source)
+
+
+class MappedResponse(BitexResponse):
+    """:class:`BitexResponse` implementing its formatters via a :class:`ResponseMap`.
+
+    Sub-classes set :attr:`mapping`. If the mapping has no `timestamp`, the
+    reception timestamp of the response is used in its place.
+    """
+
+    #: The mapping describing the response's data.
+    mapping: Optional[ResponseMap] = None
+
+    def extract(self) -> Union[Tuple[Any, ...], List[Tuple[Any, ...]]]:
+        """Return the raw values extracted via :attr:`mapping`.
+
+        This is a tuple of values ordered as :attr:`ResponseMap.labels`, or a
+        list of such tuples, for row layouts.
+        """
+        if self.mapping is None:
+            raise NotImplementedError
+        return self.mapping.extract(self.json())
+
+    def triples(self) -> List[Triple]:
+        """Return the data of the response in three-column layout.
+
+        See :meth:`BitexResponse.triples`.
+        """
+        rows = self.extract()
+        labels = self.mapping.labels[1:]
+        if not self.mapping.is_rows:
+            rows = [rows]
+        triples = []
+        for row in rows:
+            ts = self.received if row[0] is None else row[0]
+            triples.extend(zip((ts,) * len(labels), labels, row[1:]))
+        triples.append((self.received, "received", self.received))
+        return triples
+
+    def key_value_dict(self) -> KeyValuePairs:
+        """Return the data of the response in a flattened dict.
+
+        For row layouts, each label maps to a list holding the values of all
+        rows (i.e. the data is returned in columns). See
+        :meth:`BitexResponse.key_value_dict`.
+        """
+        extracted = self.extract()
+        labels = self.mapping.labels
+        if self.mapping.is_rows:
+            data = {label: list(column) for label, column in zip(labels, zip(*extracted))}
+            if not extracted:
+                data = {label: [] for label in labels}
+            data["timestamp"] = [self.received if ts is None else ts for ts in data["timestamp"]]
+        else:
+            data = dict(zip(labels, extracted))
+            if data["timestamp"] is None:
+                data["timestamp"] = self.received
+        data["received"] = self.received
+        return data
@@ -0,0 +1,194 @@
+"""In-memory transport, for simulations and tests without sockets.
+
+An :class:`InMemoryAdapter` replaces :class:`bitex.adapter.BitexHTTPAdapter`
+on a session, and routes requests to handlers registered per exchange and
+endpoint, instead of sending them over the network::
+
+    >>>adapter = InMemoryAdapter()
+    >>>@adapter.route("kraken", "ticker")
+    ...def ticker(request):
+    ...    return {"bid": "9500.1", "ask": "9500.2"}
+    >>>adapter.route("kraken", "order", "new", lambda request: Reply(201, b'{"id": 1}'))
+    >>>session = BitexSession(auth=BitexAuth(key, secret))
+    >>>adapter.install(session)
+    >>>session.ticker("kraken", "BTCUSD").json()
+    {'bid': '9500.1', 'ask': '9500.2'}
+
+Requests are still prepared and signed by the plugin's
+:class:`bitex.request.BitexPreparedRequest` and :class:`bitex.auth.BitexAuth`
+classes, and responses are instances of the plugin's
+:class:`bitex.response.BitexResponse` class, so plugins are exercised end to
+end. Handlers receive the prepared request, and return either a
+:class:`Reply`, the body as :class:`bytes`, or any other object, which is
+encoded as the JSON body of a `200` response. Handlers may raise
+:mod:`requests` exceptions to simulate network errors.
+
+The endpoint and action of a request are taken from its short-hand URL (see
+:mod:`bitex.urls`). Requests without a matching handler are routed to the
+exchange's default handler, registered with ``endpoint=None``, if any;
+otherwise they receive a `404` response.
+
+For the highest request rates, disable :attr:`BitexSession.trust_env`, which
+looks up proxies and ``.netrc`` credentials on every request, and freeze the
+session via :meth:`BitexSession.freeze`. Most of the remaining time is spent
+preparing requests; to replay prepared requests, pass them to
+:meth:`InMemoryAdapter.send` directly.
+"""
+# Built-in
+import logging
+import threading
+from typing import Any, Callable, Dict, Mapping, NamedTuple, Optional, Tuple, Union
+
+# Third-party
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+# Home-brew
+from bitex.adapter import BitexHTTPAdapter
+from bitex.codec import get_codec
+from bitex.deadline import Deadline
+from bitex.plugins import list_loaded_plugins
+from bitex.request import BitexPreparedRequest
+from bitex.response import BitexResponse
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+RouteKey = Tuple[Optional[str], Optional[str], Optional[str]]
+Handler = Callable[[BitexPreparedRequest], Any]
+
+_JSON_HEADERS: Mapping[str, str] = {"Content-Type": "application/json"}
+
+
+class Reply(NamedTuple):
+    """A response of a handler, with `status`, `body` and `headers`."""
+
+    status: int = 200
+    body: bytes = b""
+    headers: Optional[Mapping[str, str]] = None
+
+
+class InMemoryAdapter(BitexHTTPAdapter):
+    """Transport adapter routing requests to handlers, in memory.
+
+    :param Mapping plugins:
+        The classes announced by plugins, by exchange; looked up on first use
+        if not given.
+    """
+
+    def __init__(self, plugins: Optional[Dict[str, Dict[str, Any]]] = None) -> None:
+        super(InMemoryAdapter, self).__init__()
+        self.plugins = plugins
+        self.handlers: Dict[RouteKey, Handler] = {}
+        self.requests = 0
+        self._routes: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+        self._lock = threading.Lock()
+
+    def route(
+        self,
+        exchange: str,
+        endpoint: Optional[str] = None,
+        action: Optional[str] = None,
+        handler: Optional[Handler] = None,
+    ) -> Any:
+        """Register `handler` for requests to `endpoint` and `action` of `exchange`.
+
+        If `handler` is omitted, a decorator registering the decorated function
+        is returned. An `endpoint` of `None` registers the exchange's default
+        handler; an `action` of `None` applies to all actions of `endpoint`
+        without a handler of their own.
+        """
+        if handler is None:
+
+            def decorator(fn: Handler) -> Handler:
+                self.route(exchange, endpoint, action, fn)
+                return fn
+
+            return decorator
+        self.handlers[(exchange, endpoint, action)] = handler
+        return handler
+
+    def install(self, session: Any) -> None:
+        """Mount the adapter on `session`, for HTTP(S) and the short-hands of routed exchanges."""
+        for prefix in ("http://", "https://"):
+            session.mount(prefix, self)
+        for exchange in {exchange for exchange, _, _ in self.handlers}:
+            session.mount(f"{exchange}:", self)
+
+    def handler(self, request: BitexPreparedRequest) -> Optional[Handler]:
+        """Return the handler `request` is routed to, if any."""
+        exchange = getattr(request, "exchange", None)
+        endpoint = getattr(request, "endpoint", None)
+        action = getattr(request, "action", None)
+        if endpoint is None:
+            endpoint, action = self._route(request.url)
+        handlers = self.handlers
+        return (
+            handlers.get((exchange, endpoint, action))
+            or handlers.get((exchange, endpoint, None))
+            or handlers.get((exchange, None, None))
+        )
+
+    def _route(self, url: str) -> Tuple[Optional[str], Optional[str]]:
+        """Return the endpoint and action of short-hand `url`."""
+        try:
+            return self._routes[url]
+        except KeyError:
+            pass
+        match = BitexPreparedRequest.search_url_for_shorthand(url) or {}
+        route = self._routes[url] = (match.get("endpoint"), match.get("action"))
+        return route
+
+    def send(
+        self,
+        request: BitexPreparedRequest,
+        stream: bool = False,
+        timeout: Any = None,
+        verify: Union[bool, str] = True,
+        cert: Any = None,
+        proxies: Any = None,
+    ) -> BitexResponse:
+        """Route `request` to its handler, and return its reply as a response.
+
+        The signature is identical to :meth:`requests.adapters.HTTPAdapter.send`.
+        """
+        deadline = getattr(request, "deadline", None)
+        if isinstance(deadline, Deadline):
+            deadline.check("send")
+        handler = self.handler(request)
+        if handler is None:
+            reply = Reply(404, b'{"error": "No handler for this request"}', _JSON_HEADERS)
+        else:
+            result = handler(request)
+            if isinstance(result, Reply):
+                reply = result
+            elif isinstance(result, bytes):
+                reply = Reply(200, result)
+            else:
+                codec = getattr(request, "codec", None) or get_codec()
+                reply = Reply(200, codec.dumps(result), _JSON_HEADERS)
+        with self._lock:
+            self.requests += 1
+        return self.build_response(request, reply)
+
+    def build_response(self, req: BitexPreparedRequest, resp: Reply) -> BitexResponse:
+        """Build the response to `req` from handler reply `resp`."""
+        plugins = self.plugins
+        if plugins is None:
+            plugins = self.plugins = list_loaded_plugins()
+        custom_classes = plugins.get(getattr(req, "exchange", None))
+        response = custom_classes["Response"]() if custom_classes else BitexResponse()
+        response.status_code = resp.status
+        if resp.headers:
+            response.headers = CaseInsensitiveDict(resp.headers)
+            response.encoding = get_encoding_from_headers(response.headers)
+        response._content = resp.body
+        response._content_consumed = True
+        response.url = req.url
+        response.request = req
+        response.connection = self
+        response.codec = getattr(req, "codec", None)
+        return response
+
+    def close(self) -> None:
+        """Nothing to release; there are no connections."""
@@ -0,0 +1,379 @@
+"""Local order state tracking with batched, adaptive status polling.
+
+Calling :meth:`BitexSession.order_status` for every open order, every second,
+quickly exhausts the rate limits of an exchange's private endpoints. An
+:class:`OrderTracker` keeps a local cache of orders instead, which is updated
+from the responses of the orders it places and cancels::
+
+    >>>tracker = OrderTracker(session)
+    >>>tracker.new_order("kraken", "BTCUSD", params={"price": 3800, "size": 1})
+    >>>tracker.start()
+    >>>tracker.get("kraken", "OQCLML-BW3P3-BUCMWZ")
+    OrderStatus(pair='BTCUSD', order_id='OQCLML-BW3P3-BUCMWZ', status='open', ...)
+
+Only live orders are polled, and the longer an order's state remains unchanged,
+the less frequently it is polled. Exchanges whose plugin announces an
+:class:`OpenOrdersEndpoint` (see
+:meth:`bitex.plugins.AnnounceOpenOrdersHookSpec.announce_open_orders`) are
+polled with a single request for all of their open orders, instead of one
+request per order; only orders which disappeared from the open orders are
+queried individually, to learn their final state.
+
+Order states are read from :meth:`BitexResponse.records`, which must return
+:class:`bitex.records.OrderStatus` records for the order endpoints used.
+"""
+# Built-in
+import logging
+import threading
+import time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+# Home-brew
+from bitex.records import OrderStatus
+from bitex.response import BitexResponse
+
+if TYPE_CHECKING:  # pragma: no cover
+    # Home-brew
+    from bitex.session import BitexSession
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+#: Order states after which an order is no longer polled.
+FINAL_STATES = frozenset(("filled", "canceled", "cancelled", "rejected", "expired", "closed"))
+
+
+class OpenOrdersEndpoint:
+    """Bulk endpoint of an exchange, listing all open orders of an account.
+
+    Plugins sub-class this and announce an instance via the
+    :meth:`bitex.plugins.AnnounceOpenOrdersHookSpec.announce_open_orders` hook.
+    """
+
+    #: Whether a single request returns the open orders of all pairs. If not,
+    #: :meth:`request` is called once per pair with live orders.
+    all_pairs: bool = True
+
+    def request(self, session: "BitexSession", pair: Optional[str] = None) -> BitexResponse:
+        """Request the open orders (of `pair`, unless :attr:`all_pairs` is set)."""
+        raise NotImplementedError
+
+    def orders(self, response: BitexResponse) -> List[OrderStatus]:
+        """Return the open orders listed in `response`."""
+        return response.records()
+
+
+class OrderResult(NamedTuple):
+    """Result of a single order passed to :meth:`BitexSession.new_orders`.
+
+    Also returned by :meth:`BitexSession.cancel_orders`. `error` is set if the
+    order failed; otherwise `status` holds the order's state, if the response
+    stated it. `response` is the response the order was part of, if any.
+    """
+
+    order: Mapping[str, Any]
+    response: Optional[BitexResponse] = None
+    status: Optional[OrderStatus] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the order was processed without errors."""
+        return self.error is None
+
+
+class BatchOrdersEndpoint:
+    """Native batch endpoints of an exchange, placing or cancelling several orders at once.
+
+    Plugins sub-class this and announce an instance via the
+    :meth:`bitex.plugins.AnnounceBatchOrdersHookSpec.announce_batch_orders` hook.
+
+    Orders are given as mappings holding the `pair`, and the keyword arguments
+    (e.g. `params`) which would be passed to :meth:`BitexSession.new_order` or
+    :meth:`BitexSession.cancel_order` for the order.
+    """
+
+    #: The maximum number of orders the exchange accepts per batch request.
+    max_batch: int = 20
+
+    def request(
+        self, session: "BitexSession", action: str, orders: Sequence[Mapping[str, Any]]
+    ) -> BitexResponse:
+        """Send `orders` in a single request; `action` is either `new` or `cancel`."""
+        raise NotImplementedError
+
+    def results(
+        self, response: BitexResponse, orders: Sequence[Mapping[str, Any]]
+    ) -> List[OrderResult]:
+        """Return the result of each of `orders`, in the same order.
+
+        By default, :meth:`BitexResponse.records` is expected to return an
+        :class:`bitex.records.OrderStatus` per order, in the order they were sent.
+        """
+        records = response.records()
+        if len(records) != len(orders):
+            error = ValueError(f"Expected {len(orders)} results, got {len(records)}!")
+            return [OrderResult(order, response, error=error) for order in orders]
+        return [OrderResult(order, response, status) for order, status in zip(orders, records)]
+
+
+class TrackedOrder:
+    """An order in the cache of an :class:`OrderTracker`."""
+
+    __slots__ = ("exchange", "status", "changed", "next_poll")
+
+    def __init__(self, exchange: str, status: OrderStatus, now: float) -> None:
+        self.exchange = exchange
+        self.status = status
+        self.changed = now
+        self.next_poll = now
+
+    @property
+    def live(self) -> bool:
+        """Whether the order may still change state."""
+        return str(self.status.status).lower() not in FINAL_STATES
+
+
+class OrderTracker:
+    """Cache the state of orders, and keep live orders up to date.
+
+    :param BitexSession session: The session to send requests with.
+    :param float min_interval: Seconds between polls of an order which just changed.
+    :param float max_interval: Maximum seconds between polls of a live order.
+    :param float ramp:
+        The poll interval grows by `min_interval` for every `ramp` seconds
+        an order's state remains unchanged.
+    :param Callable on_change:
+        Called with the exchange, the previous (or `None`) and the new state
+        of an order whenever its state changes.
+    :param Callable clock: Monotonic clock.
+    """
+
+    def __init__(
+        self,
+        session: "BitexSession",
+        min_interval: float = 1.0,
+        max_interval: float = 30.0,
+        ramp: float = 10.0,
+        on_change: Optional[Callable[[str, Optional[OrderStatus], OrderStatus], None]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.session = session
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.ramp = ramp
+        self.on_change = on_change
+        self.clock = clock
+        #: Number of status requests sent.
+        self.requests = 0
+        self._orders: Dict[Tuple[str, str], TrackedOrder] = {}
+        self._lock = threading.RLock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+    def interval(self, order: TrackedOrder, now: float) -> float:
+        """Return the poll interval of `order`, based on the age of its current state."""
+        age = now - order.changed
+        return min(self.max_interval, self.min_interval * (1 + age / self.ramp))
+
+    def track(self, exchange: str, status: OrderStatus) -> None:
+        """Add or update the state of an order at `exchange`."""
+        now = self.clock()
+        key = exchange, str(status.order_id)
+        with self._lock:
+            order = self._orders.get(key)
+            previous = order.status if order is not None else None
+            if order is None:
+                order = self._orders[key] = TrackedOrder(exchange, status, now)
+            elif status != order.status:
+                order.status = status
+                order.changed = now
+            order.next_poll = now + self.interval(order, now)
+        if status != previous and self.on_change is not None:
+            try:
+                self.on_change(exchange, previous, status)
+            except Exception:
+                log.exception("Order change callback failed for %r", key)
+
+    def forget(self, exchange: str, order_id: str) -> None:
+        """Remove an order from the cache."""
+        with self._lock:
+            self._orders.pop((exchange, str(order_id)), None)
+
+    def get(self, exchange: str, order_id: str) -> Optional[OrderStatus]:
+        """Return the cached state of an order, if it is tracked."""
+        order = self._orders.get((exchange, str(order_id)))
+        return order.status if order is not None else None
+
+    def orders(self, exchange: Optional[str] = None, live: bool = False) -> List[OrderStatus]:
+        """Return the cached states of all (live) orders, optionally of one `exchange` only."""
+        with self._lock:
+            return [
+                order.status
+                for order in self._orders.values()
+                if (exchange is None or order.exchange == exchange) and (order.live or not live)
+            ]
+
+    def _track_response(self, exchange: str, response: BitexResponse) -> None:
+        try:
+            records = response.records()
+        except NotImplementedError:
+            log.warning("Cannot track orders of %r; records() is not implemented", exchange)
+            return
+        for record in records:
+            if isinstance(record, OrderStatus):
+                self.track(exchange, record)
+
+    def new_order(self, exchange: str, pair: str, **kwargs: Any) -> BitexResponse:
+        """Place an order via :meth:`BitexSession.new_order`, and track it."""
+        response = self.session.new_order(exchange, pair, **kwargs)
+        if response.ok:
+            self._track_response(exchange, response)
+        return response
+
+    def cancel_order(
+        self, exchange: str, pair: str, order_id: str, **kwargs: Any
+    ) -> BitexResponse:
+        """Cancel an order via :meth:`BitexSession.cancel_order`, and update its state.
+
+        Unless given in `params`, `order_id` is passed as the `order_id` parameter.
+        If the response does not state the order's new state, the order is
+        polled as soon as possible instead.
+        """
+        params = dict(kwargs.pop("params", None) or {})
+        params.setdefault("order_id", order_id)
+        response = self.session.cancel_order(exchange, pair, params=params, **kwargs)
+        if response.ok:
+            self._track_response(exchange, response)
+            with self._lock:
+                order = self._orders.get((exchange, str(order_id)))
+                if order is not None and order.live:
+                    order.changed = order.next_poll = self.clock()
+            self._wakeup.set()
+        return response
+
+    def fetch_status(self, exchange: str, status: OrderStatus) -> BitexResponse:
+        """Request the state of a single order via :meth:`BitexSession.order_status`.
+
+        Override this if an exchange expects the order id in a different parameter.
+        """
+        return self.session.order_status(
+            exchange, status.pair, params={"order_id": status.order_id}
+        )
+
+    def poll(self) -> int:
+        """Refresh all live orders which are due, and return the number of requests sent."""
+        # Imported here, as bitex.plugins imports this module.
+        from bitex.plugins import list_loaded_open_orders
+
+        now = self.clock()
+        due: Dict[str, List[TrackedOrder]] = {}
+        with self._lock:
+            for order in self._orders.values():
+                if order.live and order.next_poll <= now:
+                    due.setdefault(order.exchange, []).append(order)
+        endpoints = list_loaded_open_orders() if due else {}
+        requests = 0
+        for exchange, orders in due.items():
+            endpoint = endpoints.get(exchange)
+            if endpoint is not None:
+                try:
+                    remaining, sent = self._poll_bulk(exchange, endpoint, orders)
+                    requests += sent
+                except Exception:
+                    log.exception("Polling open orders of %r failed", exchange)
+                else:
+                    ids = {id(order) for order in remaining}
+                    self._reschedule([order for order in orders if id(order) not in ids])
+                    orders = remaining
+            for order in orders:
+                requests += 1
+                try:
+                    response = self.fetch_status(exchange, order.status)
+                    response.raise_for_status()
+                    self._track_response(exchange, response)
+                except Exception:
+                    log.exception("Polling order %r failed", order.status.order_id)
+                # Also if the response stated no state, or polling failed.
+                self._reschedule([order])
+        with self._lock:
+            self.requests += requests
+        return requests
+
+    def _reschedule(self, orders: List[TrackedOrder]) -> None:
+        """Schedule the next poll of each of `orders`, after it was just polled."""
+        now = self.clock()
+        with self._lock:
+            for order in orders:
+                order.next_poll = now + self.interval(order, now)
+
+    def _poll_bulk(
+        self, exchange: str, endpoint: OpenOrdersEndpoint, due: List[TrackedOrder]
+    ) -> Tuple[List[TrackedOrder], int]:
+        """Refresh the orders of `exchange` via its open orders endpoint.
+
+        Returns the due orders which are not open anymore, and hence need to be
+        queried individually, along with the number of requests sent.
+        """
+        pairs: List[Optional[str]] = [None]
+        if not endpoint.all_pairs:
+            pairs = sorted({order.status.pair for order in due})
+        open_ids: FrozenSet[str] = frozenset()
+        for pair in pairs:
+            response = endpoint.request(self.session, pair)
+            response.raise_for_status()
+            records = endpoint.orders(response)
+            for record in records:
+                self.track(exchange, record)
+            open_ids |= {str(record.order_id) for record in records}
+        return [order for order in due if str(order.status.order_id) not in open_ids], len(pairs)
+
+    def next_due(self) -> Optional[float]:
+        """Return the time at which the next live order is due to be polled."""
+        with self._lock:
+            return min((o.next_poll for o in self._orders.values() if o.live), default=None)
+
+    def start(self) -> None:
+        """Poll orders in a background thread until :meth:`stop` is called."""
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name="bitex-orders", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread."""
+        self._running = False
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "OrderTracker":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        while self._running:
+            self._wakeup.clear()
+            self.poll()
+            next_due = self.next_due()
+            timeout = self.max_interval if next_due is None else next_due - self.clock()
+            self._wakeup.wait(max(timeout, 0.01))
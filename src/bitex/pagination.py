@@ -0,0 +1,246 @@
+"""Pagination of trade history.
+
+Exchanges return trade history in pages, and differ in how the next page is
+addressed. Plugins announce a :class:`Paginator` for their exchange via the
+:meth:`bitex.plugins.AnnouncePaginationHookSpec.announce_pagination` hook,
+which describes one of three schemes:
+
+    * :data:`TIME` - pages are requested by time window; see :class:`TimePaginator`.
+    * :data:`ID` - pages are requested starting at a trade id; see :class:`IdPaginator`.
+    * :data:`CURSOR` - each page references the next one; see :class:`CursorPaginator`.
+
+:meth:`bitex.session.BitexSession.iter_trades` pages through the history of a
+pair using the exchange's paginator. Since the parameters of upcoming pages
+are known in advance for the time and id schemes, a bounded number of pages
+is fetched concurrently ahead of the page currently being consumed; cursors
+can only be followed one page at a time.
+
+Paginators extract :class:`bitex.records.Trade` records from each page via
+:meth:`Paginator.trades`, which uses :meth:`BitexResponse.records` by default.
+Trades are expected in ascending order within each page, and their
+`timestamp` must be comparable (after conversion via :class:`float`) to the
+`start` and `end` arguments, i.e. use the same unit. Paginators announce that
+unit via :attr:`Paginator.per_second`; e.g. ``1000`` for milliseconds.
+"""
+# Built-in
+import collections
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Home-brew
+from bitex.records import Trade
+from bitex.response import BitexResponse
+
+#: Pages are addressed via a cursor returned with the previous page.
+CURSOR = "cursor"
+
+#: Pages are addressed via the id of their first trade.
+ID = "id"
+
+#: Pages are addressed via a time window.
+TIME = "time"
+
+Params = Dict[str, Any]
+Fetch = Callable[[Params], BitexResponse]
+
+
+class Paginator:
+    """Base class of all pagination schemes."""
+
+    #: The pagination scheme; one of :data:`CURSOR`, :data:`ID` or :data:`TIME`.
+    scheme: str = ""
+
+    #: Timestamp units per second; e.g. ``1000`` if the exchange uses milliseconds.
+    per_second: float = 1
+
+    def trades(self, response: BitexResponse) -> List[Trade]:
+        """Return the trades of the page `response`, in ascending order."""
+        return response.records()
+
+
+class TimePaginator(Paginator):
+    """Pages are requested by time window.
+
+    :param float window:
+        The duration covered by each page. This must be short enough for a page
+        to never hold more trades than the exchange returns per request.
+    """
+
+    scheme = TIME
+
+    def __init__(self, window: float) -> None:
+        self.window = window
+
+    def params(self, pair: str, start: float, end: float) -> Params:
+        """Return the request parameters of the page covering `start` to `end`."""
+        raise NotImplementedError
+
+
+class IdPaginator(Paginator):
+    """Pages are requested starting at a trade id.
+
+    Trade ids must be integers, increasing with time.
+
+    :param int page_size: The maximum number of trades the exchange returns per request.
+    """
+
+    scheme = ID
+
+    def __init__(self, page_size: int) -> None:
+        self.page_size = page_size
+
+    def params(
+        self, pair: str, start: Optional[float] = None, from_id: Optional[int] = None
+    ) -> Params:
+        """Return the request parameters of a page.
+
+        The first page is requested by its `start` time, all others by the
+        trade id `from_id` they start at.
+        """
+        raise NotImplementedError
+
+
+class CursorPaginator(Paginator):
+    """Each page references the next one via a cursor."""
+
+    scheme = CURSOR
+
+    def params(self, pair: str, start: float, cursor: Optional[Any] = None) -> Params:
+        """Return the request parameters of the first page, or of the page at `cursor`."""
+        raise NotImplementedError
+
+    def next_cursor(self, response: BitexResponse) -> Optional[Any]:
+        """Return the cursor of the page after `response`, or `None` if it is the last."""
+        raise NotImplementedError
+
+
+def prefetched(
+    fetch: Callable[[Any], Any], items: Iterable[Any], prefetch: int
+) -> Iterator[Tuple[Any, Any]]:
+    """Yield ``(item, fetch(item))`` for all `items`, in order.
+
+    Up to `prefetch` items are fetched concurrently. Fetches which have not
+    started yet are cancelled when the generator is closed.
+    """
+    pending: collections.deque = collections.deque()
+    workers = max(prefetch, 1)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bitex-pages") as pool:
+        try:
+            for item in items:
+                pending.append((item, pool.submit(fetch, item)))
+                if len(pending) >= prefetch:
+                    item, future = pending.popleft()
+                    yield item, future.result()
+            while pending:
+                item, future = pending.popleft()
+                yield item, future.result()
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+
+def _between(trades: List[Trade], start: float, end: Optional[float]) -> List[Trade]:
+    return [
+        trade
+        for trade in trades
+        if start <= float(trade.timestamp) and (end is None or float(trade.timestamp) < end)
+    ]
+
+
+def iter_trades(
+    fetch: Fetch,
+    paginator: Paginator,
+    pair: str,
+    start: float,
+    end: Optional[float] = None,
+    prefetch: int = 4,
+) -> Iterator[Trade]:
+    """Yield the trades of `pair` from `start` up to (excluding) `end`, in order.
+
+    :param Callable fetch: Requests a page of trades, given its parameters.
+    :param Paginator paginator: The exchange's pagination scheme.
+    :param float end:
+        Stop at this time; by default, at the current time in the unit of
+        the paginator (:data:`TIME` scheme), or once the latest trade was
+        reached.
+    :param int prefetch: The maximum number of pages fetched concurrently.
+    """
+    if paginator.scheme == TIME:
+        yield from _iter_time(fetch, paginator, pair, start, end, prefetch)
+    elif paginator.scheme == ID:
+        yield from _iter_id(fetch, paginator, pair, start, end, prefetch)
+    elif paginator.scheme == CURSOR:
+        yield from _iter_cursor(fetch, paginator, pair, start, end)
+    else:
+        raise ValueError(f"Unknown pagination scheme {paginator.scheme!r}!")
+
+
+def _iter_time(fetch, paginator, pair, start, end, prefetch):
+    end = time.time() * paginator.per_second if end is None else end
+
+    def windows() -> Iterator[Tuple[float, float]]:
+        lower = start
+        while lower < end:
+            upper = min(lower + paginator.window, end)
+            yield lower, upper
+            lower = upper
+
+    pages = prefetched(lambda window: fetch(paginator.params(pair, *window)), windows(), prefetch)
+    try:
+        for (lower, upper), response in pages:
+            yield from _between(paginator.trades(response), lower, upper)
+    finally:
+        pages.close()
+
+
+def _iter_id(fetch, paginator, pair, start, end, prefetch):
+    trades = paginator.trades(fetch(paginator.params(pair, start=start)))
+    if not trades:
+        return
+    for trade in _between(trades, start, None):
+        if end is not None and float(trade.timestamp) >= end:
+            return
+        yield trade
+    first_id = int(trades[-1].trade_id) + 1
+
+    def ranges() -> Iterator[int]:
+        from_id = first_id
+        while True:
+            yield from_id
+            from_id += paginator.page_size
+
+    pages = prefetched(
+        lambda from_id: fetch(paginator.params(pair, from_id=from_id)), ranges(), prefetch
+    )
+    try:
+        for from_id, response in pages:
+            trades = paginator.trades(response)
+            if not trades:
+                return
+            upper = from_id + paginator.page_size
+            for trade in trades:
+                if not from_id <= int(trade.trade_id) < upper:
+                    # Part of the next page already, due to gaps in trade ids.
+                    continue
+                if end is not None and float(trade.timestamp) >= end:
+                    return
+                yield trade
+    finally:
+        pages.close()
+
+
+def _iter_cursor(fetch, paginator, pair, start, end):
+    cursor = None
+    while True:
+        response = fetch(paginator.params(pair, start, cursor=cursor))
+        trades = paginator.trades(response)
+        if not trades:
+            return
+        for trade in _between(trades, start, None):
+            if end is not None and float(trade.timestamp) >= end:
+                return
+            yield trade
+        cursor = paginator.next_cursor(response)
+        if cursor is None:
+            return
@@ -42,13 +42,19 @@ hook implementation::
         return "uberex", UberExAuth, UberExRequest, UberExResponse
 """
 # Built-in
-from typing import Tuple, Type, Union
+from typing import Dict, Tuple, Type, Union
 
 # Third-party
 import pluggy
 from requests import PreparedRequest, Response
 from requests.auth import AuthBase, HTTPBasicAuth
 
+# Home-brew
+from bitex.clock import ServerTimeEndpoint
+from bitex.orders import BatchOrdersEndpoint, OpenOrdersEndpoint
+from bitex.pagination import Paginator
+from bitex.urls import URLTemplates
+
 hookspec = pluggy.HookspecMarker("bitex")
 hookimpl = pluggy.HookimplMarker("bitex")
 
@@ -69,6 +75,66 @@ class AnnouncePluginHookSpec:
         """
 
 
+class AnnouncePaginationHookSpec:
+    @hookspec
+    def announce_pagination(self) -> Union[Tuple[str, Paginator], None]:
+        """Announce the trade history pagination scheme of an exchange.
+
+        The function should return a tuple with the following items:
+
+            * the exchange name this plugin is for
+            * a :class:`bitex.pagination.Paginator` instance for its trades endpoint.
+        """
+
+
+class AnnounceOpenOrdersHookSpec:
+    @hookspec
+    def announce_open_orders(self) -> Union[Tuple[str, OpenOrdersEndpoint], None]:
+        """Announce the bulk open orders endpoint of an exchange.
+
+        The function should return a tuple with the following items:
+
+            * the exchange name this plugin is for
+            * a :class:`bitex.orders.OpenOrdersEndpoint` instance.
+        """
+
+
+class AnnounceBatchOrdersHookSpec:
+    @hookspec
+    def announce_batch_orders(self) -> Union[Tuple[str, BatchOrdersEndpoint], None]:
+        """Announce the native batch order endpoints of an exchange.
+
+        The function should return a tuple with the following items:
+
+            * the exchange name this plugin is for
+            * a :class:`bitex.orders.BatchOrdersEndpoint` instance.
+        """
+
+
+class AnnounceServerTimeHookSpec:
+    @hookspec
+    def announce_server_time(self) -> Union[Tuple[str, ServerTimeEndpoint], None]:
+        """Announce the server time endpoint of an exchange.
+
+        The function should return a tuple with the following items:
+
+            * the exchange name this plugin is for
+            * a :class:`bitex.clock.ServerTimeEndpoint` instance.
+        """
+
+
+class AnnounceURLTemplatesHookSpec:
+    @hookspec
+    def announce_url_templates(self) -> Union[Tuple[str, URLTemplates], None]:
+        """Announce the URL templates of an exchange's endpoints.
+
+        The function should return a tuple with the following items:
+
+            * the exchange name this plugin is for
+            * a :class:`bitex.urls.URLTemplates` instance.
+        """
+
+
 class AnnouncePluginHookImpl:
     @hookimpl
     def announce_plugin() -> Union[
@@ -86,6 +152,11 @@ def get_plugin_manager():
     """Fetch pluggy's plugin manager for our library."""
     pm = pluggy.PluginManager("bitex")
     pm.add_hookspecs(AnnouncePluginHookSpec)
+    pm.add_hookspecs(AnnouncePaginationHookSpec)
+    pm.add_hookspecs(AnnounceOpenOrdersHookSpec)
+    pm.add_hookspecs(AnnounceBatchOrdersHookSpec)
+    pm.add_hookspecs(AnnounceServerTimeHookSpec)
+    pm.add_hookspecs(AnnounceURLTemplatesHookSpec)
     pm.load_setuptools_entrypoints("bitex")
     pm.register(AnnouncePluginHookImpl)
     return pm
@@ -98,3 +169,53 @@ def list_loaded_plugins():
         for plugin_name, auth_class, prep_class, resp_class in pm.hook.announce_plugin()
         if all(callable(cls) for cls in (auth_class, prep_class, resp_class))
     }
+
+
+def list_loaded_paginators() -> Dict[str, Paginator]:
+    """Return the paginators announced by plugins, by exchange name."""
+    pm = get_plugin_manager()
+    return {
+        plugin_name: paginator
+        for plugin_name, paginator in filter(None, pm.hook.announce_pagination())
+        if isinstance(paginator, Paginator)
+    }
+
+
+def list_loaded_open_orders() -> Dict[str, OpenOrdersEndpoint]:
+    """Return the open orders endpoints announced by plugins, by exchange name."""
+    pm = get_plugin_manager()
+    return {
+        plugin_name: endpoint
+        for plugin_name, endpoint in filter(None, pm.hook.announce_open_orders())
+        if isinstance(endpoint, OpenOrdersEndpoint)
+    }
+
+
+def list_loaded_batch_orders() -> Dict[str, BatchOrdersEndpoint]:
+    """Return the batch order endpoints announced by plugins, by exchange name."""
+    pm = get_plugin_manager()
+    return {
+        plugin_name: endpoint
+        for plugin_name, endpoint in filter(None, pm.hook.announce_batch_orders())
+        if isinstance(endpoint, BatchOrdersEndpoint)
+    }
+
+
+def list_loaded_server_time() -> Dict[str, ServerTimeEndpoint]:
+    """Return the server time endpoints announced by plugins, by exchange name."""
+    pm = get_plugin_manager()
+    return {
+        plugin_name: endpoint
+        for plugin_name, endpoint in filter(None, pm.hook.announce_server_time())
+        if isinstance(endpoint, ServerTimeEndpoint)
+    }
+
+
+def list_loaded_url_templates() -> Dict[str, URLTemplates]:
+    """Return the URL templates announced by plugins, by exchange name."""
+    pm = get_plugin_manager()
+    return {
+        plugin_name: templates
+        for plugin_name, templates in filter(None, pm.hook.announce_url_templates())
+        if isinstance(templates, URLTemplates)
+    }
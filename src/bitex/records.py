@@ -0,0 +1,167 @@
+"""Standardized, typed record classes for market and account data.
+
+:meth:`BitexResponse.key_value_dict` creates a new :class:`dict` per response,
+and :meth:`BitexResponse.triples` a :class:`tuple` per value, each labelled with
+a string. Both are costly when handling millions of data points.
+
+The record classes in this module use :data:`__slots__` instead; they have no
+per-instance :class:`dict`, and attribute access is faster::
+
+    >>>ticker = session.ticker("kraken", "BTCUSD").records()[0]
+    >>>ticker.bid, ticker.ask
+    ('3809.1', '3809.4')
+
+Plugins emit records by implementing :meth:`BitexResponse.records`. Values
+are passed on as given by the plugin; typically as :class:`str`, :class:`float`,
+or fixed-point integers (see :mod:`bitex.fixedpoint`).
+
+Records are mutable, compare equal if they are of the same type and hold the
+same values, and can be pickled.
+"""
+# Built-in
+from decimal import Decimal
+from typing import Any, Dict, Optional, Tuple, Union
+
+Value = Optional[Union[str, int, float, Decimal]]
+
+#: Constant for buy-side trades and orders.
+BUY = "buy"
+
+#: Constant for sell-side trades and orders.
+SELL = "sell"
+
+
+class Record:
+    """Base class of all record types.
+
+    Sub-classes list their fields in :data:`__slots__`.
+    """
+
+    __slots__: Tuple[str, ...] = ()
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{self.__class__.__qualname__}({values})"
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.as_tuple() == other.as_tuple()
+
+    __hash__ = None  # type: ignore # Records are mutable.
+
+    def as_tuple(self) -> Tuple[Any, ...]:
+        """Return the field values, in the order of :data:`__slots__`."""
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the fields as a :class:`dict`."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class Ticker(Record):
+    """Top of book and last trade of a pair."""
+
+    __slots__ = ("pair", "timestamp", "bid", "bid_size", "ask", "ask_size", "last", "volume")
+
+    def __init__(
+        self,
+        pair: str,
+        timestamp: Value,
+        bid: Value = None,
+        bid_size: Value = None,
+        ask: Value = None,
+        ask_size: Value = None,
+        last: Value = None,
+        volume: Value = None,
+    ) -> None:
+        self.pair = pair
+        self.timestamp = timestamp
+        self.bid = bid
+        self.bid_size = bid_size
+        self.ask = ask
+        self.ask_size = ask_size
+        self.last = last
+        self.volume = volume
+
+
+class Trade(Record):
+    """A public trade of a pair; `side` is :data:`BUY` or :data:`SELL`, if known."""
+
+    __slots__ = ("pair", "timestamp", "trade_id", "price", "size", "side")
+
+    def __init__(
+        self,
+        pair: str,
+        timestamp: Value,
+        trade_id: Value,
+        price: Value,
+        size: Value,
+        side: Optional[str] = None,
+    ) -> None:
+        self.pair = pair
+        self.timestamp = timestamp
+        self.trade_id = trade_id
+        self.price = price
+        self.size = size
+        self.side = side
+
+
+class BookLevel(Record):
+    """A single price level of an order book.
+
+    `side` is either :data:`bitex.aggregator.BID` or :data:`bitex.aggregator.ASK`.
+    """
+
+    __slots__ = ("pair", "timestamp", "side", "price", "size")
+
+    def __init__(self, pair: str, timestamp: Value, side: str, price: Value, size: Value) -> None:
+        self.pair = pair
+        self.timestamp = timestamp
+        self.side = side
+        self.price = price
+        self.size = size
+
+
+class OrderStatus(Record):
+    """State of a private order.
+
+    `status` is given as reported by the exchange (e.g. `open`, `filled`,
+    `canceled`), as there is no common set of order states across exchanges.
+    """
+
+    __slots__ = ("pair", "order_id", "status", "side", "price", "size", "filled", "timestamp")
+
+    def __init__(
+        self,
+        pair: str,
+        order_id: str,
+        status: str,
+        side: Optional[str] = None,
+        price: Value = None,
+        size: Value = None,
+        filled: Value = None,
+        timestamp: Value = None,
+    ) -> None:
+        self.pair = pair
+        self.order_id = order_id
+        self.status = status
+        self.side = side
+        self.price = price
+        self.size = size
+        self.filled = filled
+        self.timestamp = timestamp
+
+
+class Balance(Record):
+    """Balance of a single currency of an account."""
+
+    __slots__ = ("currency", "available", "reserved", "timestamp")
+
+    def __init__(
+        self, currency: str, available: Value, reserved: Value = None, timestamp: Value = None
+    ) -> None:
+        self.currency = currency
+        self.available = available
+        self.reserved = reserved
+        self.timestamp = timestamp
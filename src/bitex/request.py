@@ -1,18 +1,22 @@
 """:mod:`bitex-framework` extension for :class:`requests.Request` &  :class:`requests.PreparedRequest` classes."""
 # Built-in
-from typing import Union
+from typing import Any, Optional, Union
 
 # Third-party
 from requests import PreparedRequest, Request
 from requests.packages.urllib3.util import parse_url
 
 # Home-brew
+from bitex.codec import JSONCodec, get_codec
 from bitex.constants.private import (
     BITEX_SHORTHAND_NO_ACTION_REGEX,
     BITEX_SHORTHAND_WITH_ACTION_REGEX,
 )
+from bitex.compression import Compression
+from bitex.deadline import Deadline
 from bitex.plugins import list_loaded_plugins
 from bitex.types import RegexMatchDict
+from bitex.urls import registry
 
 
 class BitexPreparedRequest(PreparedRequest):
@@ -21,10 +25,51 @@ class BitexPreparedRequest(PreparedRequest):
     Implements a checker function for short-hand urls.
     """
 
+    #: The codec used to encode JSON bodies; the default codec of :mod:`bitex.codec` if `None`.
+    codec: Optional[JSONCodec] = None
+
+    #: The deadline of the request, if any; see :mod:`bitex.deadline`.
+    deadline: Optional[Deadline] = None
+
+    #: Records the compression of the response, if set; see :mod:`bitex.compression`.
+    compression: Optional[Compression] = None
+
+    #: The instrument, endpoint and action of a resolved short-hand URL; see :mod:`bitex.urls`.
+    instrument: Optional[str] = None
+    endpoint: Optional[str] = None
+    action: Optional[str] = None
+
     def __init__(self, exchange):
         self.exchange = exchange
         super(BitexPreparedRequest, self).__init__()
 
+    def prepare_url(self, url: Any, params: Any) -> None:
+        """Prepare the given URL, resolving short-hand URLs via :data:`bitex.urls.registry`.
+
+        Short-hands of exchanges without URL templates are prepared as they are.
+        Otherwise identical to :meth:`requests.PreparedRequest.prepare_url`.
+        """
+        resolved = registry.resolve(url) if isinstance(url, str) else None
+        if resolved is not None:
+            url = resolved.url
+            self.instrument = resolved.instrument
+            self.endpoint = resolved.endpoint
+            self.action = resolved.action
+        super(BitexPreparedRequest, self).prepare_url(url, params)
+
+    def prepare_body(self, data: Any, files: Any, json: Any = None) -> None:
+        """Prepare the body, encoding any `json` via :attr:`.codec`.
+
+        Otherwise identical to :meth:`requests.PreparedRequest.prepare_body`.
+        """
+        if not data and json is not None and not files:
+            codec = self.codec or get_codec()
+            super(BitexPreparedRequest, self).prepare_body(codec.dumps(json), None)
+            if "content-type" not in self.headers:
+                self.headers["Content-Type"] = "application/json"
+            return
+        super(BitexPreparedRequest, self).prepare_body(data, files, json)
+
     @staticmethod
     def search_url_for_shorthand(url) -> Union[RegexMatchDict, None]:
         """Check if the given URL is a bitex short-hand.
@@ -56,6 +101,9 @@ class BitexRequest(Request):
     instance of :class:`.BitexPreparedRequest`.
     """
 
+    #: The deadline of the request, if any; see :mod:`bitex.deadline`.
+    deadline: Optional[Deadline] = None
+
     def __init__(self, private: bool = False, **kwargs) -> None:
         super(BitexRequest, self).__init__(**kwargs)
         self.private = private
@@ -1,13 +1,56 @@
 """Customized :class:`requests.Response` class for the :mod:`bitex-framework` framework."""
 # Built-in
+import functools
+import json
 import time
-from typing import List
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Mapping, Optional, Union
 
 # Third-party
-from requests.models import Response
+from requests.cookies import RequestsCookieJar
+from requests.exceptions import JSONDecodeError
+from requests.models import PreparedRequest, Response
 
 # Home-brew
-from bitex.types import KeyValuePairs, Triple
+from bitex.codec import JSONCodec, get_codec
+from bitex.fixedpoint import is_number, to_scaled
+from bitex.records import Record
+from bitex.types import KeyValuePairs, ScaledTriple, Triple
+
+if TYPE_CHECKING:  # pragma: no cover
+    # Home-brew
+    from bitex.retention import RetentionPolicy
+
+#: Formatter methods whose results are memoized, if a retention policy or change detector applies.
+FORMATTERS = ("triples", "key_value_dict", "records")
+
+#: Labels of numeric values which :meth:`BitexResponse.scaled_triples` never scales, given a
+#: single scale; as are labels ending in ``_id``.
+UNSCALED_LABELS = frozenset(("received", "timestamp", "id"))
+
+
+def _is_unscaled(label: str) -> bool:
+    return label in UNSCALED_LABELS or label.endswith("_id")
+
+
+def _retained(method: Callable) -> Callable:
+    """Memoize the result of formatter `method`, and notify the retention policy."""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        parsed = self._memo()
+        if parsed is None or args or kwargs:
+            return method(self, *args, **kwargs)
+        self._parsing += 1
+        try:
+            if method.__name__ not in parsed:
+                parsed[method.__name__] = method(self)
+        finally:
+            self._parsing -= 1
+        self._parsed_notify()
+        return parsed[method.__name__]
+
+    wrapper.__retained__ = True
+    return wrapper
 
 
 class BitexResponse(Response):
@@ -17,14 +60,110 @@ class BitexResponse(Response):
     by :meth:`.json`.
     """
 
+    #: The codec used by :meth:`.json`; the default codec of :mod:`bitex.codec` if `None`.
+    codec: Optional[JSONCodec] = None
+
+    #: The retention policy tracking this response, if any; see :mod:`bitex.retention`.
+    retention: Optional["RetentionPolicy"] = None
+
+    #: Whether the body of this response was released; see :meth:`release`.
+    released: bool = False
+
+    #: Whether the body is identical to the previous response's; see :mod:`bitex.changes`.
+    unchanged: bool = False
+
+    #: Number of calls to :meth:`json` and the formatters currently in progress.
+    _parsing: int = 0
+
     def __init__(self):
         self.received = str(time.time())
         super(BitexResponse, self).__init__()
 
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """Memoize the formatters implemented by sub-classes, if a retention policy applies."""
+        super().__init_subclass__(**kwargs)
+        for name in FORMATTERS:
+            method = cls.__dict__.get(name)
+            if callable(method) and not getattr(method, "__retained__", False):
+                setattr(cls, name, _retained(method))
+
     def __repr__(self):
         """Extend original class's __repr__."""
         return f"<{self.__class__.__qualname__} [{self.status_code}]>"
 
+    def json(self, **kwargs: Any) -> Any:
+        """Decode the response body using :attr:`.codec`.
+
+        If any keyword arguments are given, decoding is delegated to
+        :meth:`requests.Response.json` instead, which passes them on to
+        :func:`json.loads`.
+
+        If a retention policy or change detector applies, the result is memoized.
+
+        :raises requests.exceptions.JSONDecodeError: If the body is not valid JSON.
+        """
+        if kwargs:
+            return super(BitexResponse, self).json(**kwargs)
+        parsed = self._memo()
+        if parsed is None:
+            return self._decode()
+        if "json" not in parsed:
+            parsed["json"] = self._decode()
+        self._parsed_notify()
+        return parsed["json"]
+
+    def _parsed_notify(self) -> None:
+        """Notify the retention policy that the response was parsed.
+
+        Calls made by formatters, e.g. to :meth:`json`, are ignored; the
+        formatter may still access the body or request afterwards.
+        """
+        if self.retention is not None and not self._parsing:
+            self.retention.parsed(self)
+
+    def _memo(self) -> Optional[Dict[str, Any]]:
+        """Return the memoized results of :meth:`json` and the formatters, if memoized at all.
+
+        Unchanged responses share these with previous responses; see :mod:`bitex.changes`.
+        """
+        parsed = self.__dict__.get("_parsed")
+        if parsed is None and self.retention is not None:
+            parsed = self._parsed = {}
+        return parsed
+
+    def _decode(self) -> Any:
+        codec = self.codec or get_codec()
+        if self.encoding and self.encoding.lower().replace("-", "") != "utf8":
+            data = self.text
+        else:
+            data = self.content
+        try:
+            return codec.loads(data)
+        except json.JSONDecodeError as e:
+            raise JSONDecodeError(e.msg, e.doc, e.pos)
+        except ValueError as e:
+            raise JSONDecodeError(str(e), data, 0)
+
+    def release(self) -> None:
+        """Release the body, the urllib3 response and the prepared request.
+
+        Memoized results of :meth:`json` and the formatters are kept. The
+        request is replaced by one stating only its method, URL and exchange.
+        Accessing :attr:`content` or :attr:`text` afterwards raises a
+        :exc:`RuntimeError`.
+        """
+        request = self.request
+        if request is not None:
+            stub = PreparedRequest()
+            stub.method, stub.url = request.method, request.url
+            stub.exchange = getattr(request, "exchange", None)
+            self.request = stub
+        self._content = False
+        self._content_consumed = True
+        self.raw = None
+        self.cookies = RequestsCookieJar()
+        self.released = True
+
     def triples(self) -> List[Triple]:
         """Return the data of the response in three-column layout.
 
@@ -56,6 +195,34 @@ class BitexResponse(Response):
         """
         raise NotImplementedError
 
+    def scaled_triples(self, scales: Union[int, Mapping[str, int]]) -> List[ScaledTriple]:
+        """Return :meth:`triples` with prices and sizes as fixed-point integers.
+
+        Values are converted to integer mantissas via :func:`bitex.fixedpoint.to_scaled`.
+        `scales` is either a mapping of labels to their scale, in which case only
+        those labels are converted, or a single scale, which is applied to all
+        numeric values except timestamps and ids (see :data:`UNSCALED_LABELS`)::
+
+            >>>response.scaled_triples({"bid": 1, "ask": 1, "bid_size": 8, "ask_size": 8})
+            [(1590000000, "bid", 380910), ...]
+
+        :raises ValueError:
+            If a value has more decimal places than its scale allows.
+        """
+        triples = self.triples()
+        if isinstance(scales, int):
+            scale = scales
+            return [
+                (timestamp, label, to_scaled(value, scale))
+                if is_number(value) and not _is_unscaled(label)
+                else (timestamp, label, value)
+                for timestamp, label, value in triples
+            ]
+        return [
+            (timestamp, label, to_scaled(value, scales[label]) if label in scales else value)
+            for timestamp, label, value in triples
+        ]
+
     def key_value_dict(self) -> KeyValuePairs:
         """Return the data of the response in a flattened dict.
 
@@ -82,3 +249,20 @@ class BitexResponse(Response):
             documentation and/or code to make sure the fields are present.
         """
         raise NotImplementedError
+
+    def records(self) -> List[Record]:
+        """Return the data of the response as standardized records.
+
+        Plugins return instances of the record type matching the endpoint, i.e.
+        :class:`bitex.records.Ticker`, :class:`bitex.records.Trade`,
+        :class:`bitex.records.BookLevel`, :class:`bitex.records.OrderStatus` or
+        :class:`bitex.records.Balance`. These use considerably less memory than
+        the :meth:`key_value_dict` or :meth:`triples` of the same data.
+
+        ..admonition::Disclaimer
+
+            As these formatter functions are implemented by plugin developers, we cannot fully guarantee that
+            this method is implemented for every endpoint. It's your duty to double-check the exchange plugin
+            documentation and/or code.
+        """
+        raise NotImplementedError
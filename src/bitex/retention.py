@@ -0,0 +1,139 @@
+"""Retention of response bodies, for long-running consumers.
+
+A :class:`bitex.response.BitexResponse` keeps its raw body, the urllib3
+response and the prepared request (including its body) alive for as long as
+it is referenced. Collectors keeping recent responses around thus hold far
+more memory than the data they actually use.
+
+A :class:`RetentionPolicy` assigned to a session tracks the bytes held by the
+responses it receives, and releases them according to the policy::
+
+    >>>retention = RetentionPolicy(parsed_only=True, max_bytes=64 * 2 ** 20)
+    >>>session = BitexSession(retention=retention)
+    >>>response = session.ticker("kraken", "BTCUSD")
+    >>>response.triples()  # Computed, memoized, and the body released.
+    [(1590969600, "bid", "9500.1"), ...]
+    >>>retention.usage()
+    {'responses': 0, 'bytes': 0, 'max_bytes': 67108864, 'released': 1, 'evicted': 0}
+
+With `parsed_only`, a response is released as soon as :meth:`json` or any of
+its formatters (:meth:`triples`, :meth:`key_value_dict`, :meth:`records`)
+returned; their results are memoized, so calling them again works as before.
+Accessing :attr:`content` or :attr:`text` of a released response raises a
+:exc:`RuntimeError`.
+
+With `max_bytes`, the bodies of the oldest responses are released whenever
+the bodies of all tracked responses exceed it. Their JSON is decoded and
+memoized beforehand, if they have not been parsed yet. A single policy may be
+shared by several sessions, to enforce a global cap.
+"""
+# Built-in
+import collections
+import logging
+import threading
+import weakref
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+if TYPE_CHECKING:  # pragma: no cover
+    # Home-brew
+    from bitex.response import BitexResponse
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+
+class RetentionPolicy:
+    """Track and release the bodies of responses.
+
+    :param bool parsed_only:
+        Release responses once they were parsed via :meth:`json` or one of
+        their formatters.
+    :param int max_bytes:
+        Maximum number of body bytes held by all tracked responses; unlimited
+        if `None`.
+    """
+
+    def __init__(self, parsed_only: bool = True, max_bytes: Optional[int] = None) -> None:
+        self.parsed_only = parsed_only
+        self.max_bytes = max_bytes
+        self.released = 0
+        self.evicted = 0
+        self._bytes = 0
+        # Tracked responses by id, oldest first.
+        self._tracked: "collections.OrderedDict[int, Tuple[weakref.ref, int]]" = (
+            collections.OrderedDict()
+        )
+        self._lock = threading.RLock()
+
+    def track(self, response: "BitexResponse") -> None:
+        """Start tracking the body of `response`, enforcing :attr:`max_bytes`.
+
+        Responses whose body was not read yet, i.e. streamed responses, are
+        not tracked.
+        """
+        content = response.__dict__.get("_content")
+        if not isinstance(content, bytes):
+            return
+        response.retention = self
+        key = id(response)
+        with self._lock:
+            if key in self._tracked:
+                return
+            self._tracked[key] = (weakref.ref(response), len(content))
+            self._bytes += len(content)
+        weakref.finalize(response, self._forget, key)
+        self._enforce()
+
+    def parsed(self, response: "BitexResponse") -> None:
+        """Notify the policy that `response` was parsed."""
+        if self.parsed_only:
+            self.release(response)
+
+    def release(self, response: "BitexResponse") -> None:
+        """Release the body of `response`, and stop tracking it."""
+        if response.released:
+            return
+        response.release()
+        with self._lock:
+            self.released += 1
+            self._forget(id(response))
+
+    def usage(self) -> Dict[str, Optional[int]]:
+        """Return the number of tracked responses and the bytes they hold.
+
+        Also states the configured :attr:`max_bytes`, and how many responses
+        were released in total, and how many of these to enforce it.
+        """
+        with self._lock:
+            return {
+                "responses": len(self._tracked),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "released": self.released,
+                "evicted": self.evicted,
+            }
+
+    def _forget(self, key: int) -> None:
+        with self._lock:
+            entry = self._tracked.pop(key, None)
+            if entry is not None:
+                self._bytes -= entry[1]
+
+    def _enforce(self) -> None:
+        if self.max_bytes is None:
+            return
+        while True:
+            with self._lock:
+                if self._bytes <= self.max_bytes or not self._tracked:
+                    return
+                key, (ref, _) = next(iter(self._tracked.items()))
+                response = ref()
+                if response is None:
+                    self._forget(key)
+                    continue
+                self.evicted += 1
+            try:
+                response.json()
+            except ValueError:
+                log.debug("Releasing undecodable body of %r", response)
+            self.release(response)
@@ -0,0 +1,332 @@
+"""Drift-free polling scheduler for :class:`bitex.session.BitexSession` endpoints.
+
+Instead of hand-rolled ``while True: ...; sleep(x)`` loops, register jobs with
+a :class:`PollingScheduler` and let it dispatch them on a monotonic clock::
+
+    >>>from queue import Queue
+    >>>from bitex import BitexSession
+    >>>from bitex.scheduler import PollingScheduler
+    >>>results = Queue()
+    >>>scheduler = PollingScheduler(BitexSession(), workers=4)
+    >>>scheduler.add_job("kraken", "BTCUSD", "ticker", interval=1.0, queue=results)
+    >>>scheduler.add_job("kraken", "ETHUSD", "orderbook", interval=2.0, callback=print)
+    >>>scheduler.start()
+
+Due times are computed as ``first_run + n * interval``, so the schedule never
+drifts, regardless of how long a single request takes. Jobs of the same exchange
+are spread across their interval (phase staggering), which prevents requests to
+a single exchange from clustering into bursts. Each new job takes the next
+phase of the sequence 0, 1/2, 1/4, 3/4, 1/8, ...; the phases of any number of
+jobs are thus at most twice as close as if they were spaced evenly, and jobs
+already scheduled keep theirs. The phases of removed jobs are reused first.
+
+If a job is still running when its next tick is due, or the dispatcher fell
+behind, the overdue ticks are skipped instead of piling up; the number of
+skipped ticks is recorded in the job's :class:`JobStats`.
+"""
+# Built-in
+import heapq
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Home-brew
+from bitex.session import BitexSession
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+
+def phase(slot: int) -> float:
+    """Return the phase of `slot`, as fraction of an interval.
+
+    This is the van der Corput sequence, i.e. the bits of `slot` mirrored
+    at the binary point: 0, 1/2, 1/4, 3/4, 1/8, 5/8, ...
+    """
+    fraction, scale = 0.0, 0.5
+    while slot:
+        fraction += (slot & 1) * scale
+        slot >>= 1
+        scale /= 2
+    return fraction
+
+
+class JobStats:
+    """Runtime metrics of a single :class:`PollJob`.
+
+    Lag is the delay between a tick's due time and the moment its request was
+    actually started, in seconds.
+    """
+
+    __slots__ = ("runs", "errors", "skipped", "last_lag", "max_lag", "total_lag", "last_duration")
+
+    def __init__(self) -> None:
+        self.runs = 0
+        self.errors = 0
+        self.skipped = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.total_lag = 0.0
+        self.last_duration = 0.0
+
+    @property
+    def mean_lag(self) -> float:
+        """Return the average lag over all runs of the job."""
+        return self.total_lag / self.runs if self.runs else 0.0
+
+    def record(self, lag: float, duration: float, failed: bool) -> None:
+        """Record a finished run of the job."""
+        self.runs += 1
+        self.errors += failed
+        self.last_lag = lag
+        self.max_lag = max(self.max_lag, lag)
+        self.total_lag += lag
+        self.last_duration = duration
+
+    def as_dict(self) -> Dict[str, float]:
+        """Return the metrics as a dict."""
+        stats = {attr: getattr(self, attr) for attr in self.__slots__}
+        stats["mean_lag"] = self.mean_lag
+        return stats
+
+
+class PollJob:
+    """A recurring request of an `endpoint` for `pair` at `exchange`.
+
+    :param str exchange: The exchange to poll.
+    :param str pair: The currency pair to poll.
+    :param str endpoint:
+        The name of the :class:`BitexSession` method to call, e.g. `ticker`.
+    :param float interval: Seconds between two consecutive requests.
+    :param Callable callback:
+        Called with the job and the response (or the exception raised) of each run.
+    :param queue:
+        Any object with a `put()` method; receives a ``(job, result)`` tuple per run.
+    :param dict kwargs: Keyword arguments passed on to the session method.
+    """
+
+    def __init__(
+        self,
+        exchange: str,
+        pair: str,
+        endpoint: str,
+        interval: float,
+        callback: Optional[Callable[["PollJob", Any], None]] = None,
+        queue: Optional[Any] = None,
+        kwargs: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        if interval <= 0:
+            raise ValueError(f"interval must be positive, got {interval!r}")
+        self.exchange = exchange
+        self.pair = pair
+        self.endpoint = endpoint
+        self.interval = interval
+        self.callback = callback
+        self.queue = queue
+        self.kwargs = kwargs or {}
+        self.stats = JobStats()
+        self.due = 0.0
+        #: Index of the job's phase among the jobs of its exchange.
+        self.slot = 0
+        self.running = False
+        self.cancelled = False
+
+    @property
+    def key(self) -> Tuple[str, str, str]:
+        """Return the ``(exchange, pair, endpoint)`` identifying this job."""
+        return self.exchange, self.pair, self.endpoint
+
+    def __repr__(self) -> str:
+        return f"<PollJob [{self.exchange}:{self.pair}/{self.endpoint} every {self.interval}s]>"
+
+    def deliver(self, result: Any) -> None:
+        """Hand the `result` of a run to the job's callback and/or queue."""
+        if self.callback is not None:
+            self.callback(self, result)
+        if self.queue is not None:
+            self.queue.put((self, result))
+
+
+class PollingScheduler:
+    """Dispatch :class:`PollJob` instances on a monotonic clock.
+
+    A single dispatcher thread keeps all jobs in a heap ordered by their next
+    due time, and hands due jobs to a small thread pool. This scales to thousands
+    of jobs, since an idle job costs nothing but its heap entry.
+
+    :param BitexSession session: The session to issue requests with.
+    :param int workers: Size of the thread pool executing the requests.
+    :param Callable clock:
+        Monotonic clock to use; :func:`time.monotonic` by default.
+    """
+
+    def __init__(
+        self,
+        session: BitexSession,
+        workers: int = 8,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.session = session
+        self.workers = workers
+        self.clock = clock
+        self.jobs: Dict[Tuple[str, str, str], PollJob] = {}
+        self._heap: List[Tuple[float, int, PollJob]] = []
+        # Per exchange: the time phases are relative to, the phase slots in use
+        # and the freed ones.
+        self._anchors: Dict[str, float] = {}
+        self._slots: Dict[str, int] = {}
+        self._free_slots: Dict[str, List[int]] = {}
+        self._counter = itertools.count()
+        self._cond = threading.Condition()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+    def add_job(
+        self,
+        exchange: str,
+        pair: str,
+        endpoint: str,
+        interval: float,
+        callback: Optional[Callable[[PollJob, Any], None]] = None,
+        queue: Optional[Any] = None,
+        **kwargs: Any,
+    ) -> PollJob:
+        """Register a new job and return it.
+
+        Any additional keyword arguments are passed on to the session method
+        named by `endpoint` on each run.
+
+        The first run of the job is offset within its interval, depending on
+        the phases of the jobs registered for the same `exchange`; these are
+        not affected.
+        """
+        if not callable(getattr(self.session, endpoint, None)):
+            raise ValueError(f"{endpoint!r} is not a method of {type(self.session).__name__}!")
+        job = PollJob(exchange, pair, endpoint, interval, callback, queue, kwargs)
+        with self._cond:
+            if job.key in self.jobs:
+                raise ValueError(f"A job for {job.key!r} is already registered!")
+            self.jobs[job.key] = job
+            self._stagger(job)
+            self._cond.notify()
+        return job
+
+    def remove_job(self, exchange: str, pair: str, endpoint: str) -> None:
+        """Unregister the job for the given `exchange`, `pair` and `endpoint`."""
+        with self._cond:
+            job = self.jobs.pop((exchange, pair, endpoint))
+            # The heap entry is discarded lazily by the dispatcher, unless
+            # removed jobs make up most of the heap.
+            job.cancelled = True
+            heapq.heappush(self._free_slots.setdefault(exchange, []), job.slot)
+            if len(self._heap) > 2 * len(self.jobs) + 16:
+                self._heap = [entry for entry in self._heap if not entry[2].cancelled]
+                heapq.heapify(self._heap)
+
+    def stats(self) -> Dict[Tuple[str, str, str], Dict[str, float]]:
+        """Return the metrics of all registered jobs, keyed by job key."""
+        with self._cond:
+            return {key: job.stats.as_dict() for key, job in self.jobs.items()}
+
+    def _stagger(self, job: PollJob) -> None:
+        """Assign the next free phase of its exchange to the new `job`, and schedule it.
+
+        Must be called while holding :attr:`_cond`.
+        """
+        now = self.clock()
+        anchor = self._anchors.setdefault(job.exchange, now)
+        free = self._free_slots.get(job.exchange)
+        if free:
+            job.slot = heapq.heappop(free)
+        else:
+            job.slot = self._slots.get(job.exchange, 0)
+            self._slots[job.exchange] = job.slot + 1
+        offset = anchor + phase(job.slot) * job.interval
+        # The first tick of this phase which is not in the past.
+        job.due = offset + max(0, -((offset - now) // job.interval)) * job.interval
+        heapq.heappush(self._heap, (job.due, next(self._counter), job))
+
+    def start(self) -> None:
+        """Start the dispatcher thread and the worker pool."""
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="bitex-poll")
+        self._thread = threading.Thread(
+            target=self._dispatch, name="bitex-scheduler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, wait: bool = True) -> None:
+        """Stop dispatching jobs and shut the worker pool down."""
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+    def __enter__(self) -> "PollingScheduler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def _dispatch(self) -> None:
+        """Pop due jobs off the heap and submit them to the worker pool."""
+        with self._cond:
+            while self._running:
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                due, _, job = self._heap[0]
+                if job.cancelled:
+                    # Stale entry of a removed job.
+                    heapq.heappop(self._heap)
+                    continue
+                now = self.clock()
+                if due > now:
+                    self._cond.wait(due - now)
+                    continue
+                heapq.heappop(self._heap)
+                self._reschedule(job, now)
+                if job.running:
+                    # The previous run has not finished yet; skip this tick.
+                    job.stats.skipped += 1
+                    continue
+                job.running = True
+                self._executor.submit(self._run, job, due)
+
+    def _reschedule(self, job: PollJob, now: float) -> None:
+        """Advance `job` to its next due time in the future, skipping overdue ticks."""
+        missed = int((now - job.due) // job.interval)
+        job.stats.skipped += missed
+        job.due += (missed + 1) * job.interval
+        heapq.heappush(self._heap, (job.due, next(self._counter), job))
+
+    def _run(self, job: PollJob, due: float) -> None:
+        """Execute a single run of `job`, record its metrics and deliver the result."""
+        started = self.clock()
+        failed = False
+        try:
+            result = getattr(self.session, job.endpoint)(job.exchange, job.pair, **job.kwargs)
+        except Exception as e:
+            log.exception("Job %r failed", job)
+            result = e
+            failed = True
+        finally:
+            job.running = False
+        job.stats.record(started - due, self.clock() - started, failed)
+        try:
+            job.deliver(result)
+        except Exception:
+            log.exception("Delivering the result of job %r failed", job)
@@ -1,10 +1,17 @@
 """A customized version of :class:`requests.Session`, tailored to the :mod:`bitex-framework` library."""
 # Built-in
+import collections
+import contextlib
 import logging
-from typing import Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
 
 # Third-party
 import requests
+from requests.auth import AuthBase
 from requests.compat import cookielib
 from requests.cookies import RequestsCookieJar, cookiejar_from_dict, merge_cookies
 from requests.sessions import merge_hooks, merge_setting
@@ -14,13 +21,78 @@ from requests.utils import get_netrc_auth
 # Home-brew
 from bitex.adapter import BitexHTTPAdapter
 from bitex.auth import BitexAuth
-from bitex.plugins import list_loaded_plugins
+from bitex.changes import ChangeDetector
+from bitex.codec import JSONCodec
+from bitex.compression import Compression
+from bitex.deadline import Deadline, DeadlineAuth
+from bitex.exceptions import MissingPlugin
+from bitex.orders import OrderResult
+from bitex.pagination import iter_trades
+from bitex.plugins import list_loaded_batch_orders, list_loaded_paginators, list_loaded_plugins
+from bitex.records import Trade
 from bitex.request import BitexPreparedRequest, BitexRequest
 from bitex.response import BitexResponse
+from bitex.retention import RetentionPolicy
 
 # Init Logging Facilities
 log = logging.getLogger(__name__)
 
+#: Locks serializing the signing of orders, by API key.
+_signing_locks: Dict[Optional[str], threading.Lock] = {}
+#: The latest nonce signed while holding one of :data:`_signing_locks`, by API key.
+_last_nonces: Dict[Optional[str], str] = {}
+
+
+@contextlib.contextmanager
+def _signing(auth: Any) -> Iterator[None]:
+    """Hold the signing lock of the API key of `auth`.
+
+    Requests signed within get a later nonce than any signed within before.
+    """
+    key = getattr(auth, "key", None)
+    with _signing_locks.setdefault(key, threading.Lock()):
+        if isinstance(auth, BitexAuth):
+            # Nonces have millisecond resolution; wait for the next one.
+            while auth.nonce() == _last_nonces.get(key):
+                time.sleep(0.0002)
+        try:
+            yield
+        finally:
+            if isinstance(auth, BitexAuth):
+                _last_nonces[key] = auth.nonce()
+
+
+def _ordered_nonces(auth: Any) -> bool:
+    """Check whether requests signed by `auth` must reach the exchange in nonce order."""
+    return isinstance(auth, BitexAuth) and auth.ordered_nonces
+
+
+class _SigningAuth(AuthBase):
+    """Sign requests via `auth`, while holding the signing lock of its API key."""
+
+    def __init__(self, auth: BitexAuth) -> None:
+        self.auth = auth
+
+    def __call__(self, request: requests.PreparedRequest) -> requests.PreparedRequest:
+        with _signing(self.auth):
+            return self.auth(request)
+
+
+class _ReadOnlyHeaders(CaseInsensitiveDict):
+    """Headers of a frozen :class:`BitexSession`."""
+
+    def __init__(self, headers: Mapping[str, str]) -> None:
+        super(_ReadOnlyHeaders, self).__init__(headers)
+        self._locked = True
+
+    def __setitem__(self, key: str, value: str) -> None:
+        if getattr(self, "_locked", False):
+            raise TypeError("The headers of a frozen session are read-only!")
+        super(_ReadOnlyHeaders, self).__setitem__(key, value)
+
+    def __delitem__(self, key: str) -> None:
+        raise TypeError("The headers of a frozen session are read-only!")
+
 
 class BitexSession(requests.Session):
     """Custom :class:`requests.Session` object for keep-alive http connections to API endpoints.
@@ -36,13 +108,152 @@ class BitexSession(requests.Session):
     Using the bitex short-hand is not mandatory, but supported. You may as well
     construct the entire url of an endpoint you'd like to reach manually, and
     :mod:`bitex-framework` will do the right thing.
+
+    :param BitexAuth auth: The default authentication object.
+    :param JSONCodec codec:
+        The codec used to encode JSON request bodies and decode JSON responses;
+        see :mod:`bitex.codec`. Defaults to the fastest installed codec.
+    :param RetentionPolicy retention:
+        Tracks and releases the bodies of received responses; see
+        :mod:`bitex.retention`. Responses are retained as they are by default.
+    :param Compression compression:
+        Negotiates the `Accept-Encoding` of requests per exchange, and records
+        compression statistics; see :mod:`bitex.compression`.
+    :param ChangeDetector changes:
+        Marks responses identical to the previous response to the same URL as
+        unchanged, and sends conditional requests; see :mod:`bitex.changes`.
+
+    A session may be shared by several threads once its configuration is
+    complete and :meth:`freeze` was called; see there.
     """
 
-    def __init__(self, auth: Optional[BitexAuth] = None) -> None:
+    #: Attributes which are pickled; see :meth:`__setstate__`.
+    __attrs__ = requests.Session.__attrs__ + [
+        "codec",
+        "retention",
+        "compression",
+        "changes",
+        "_plugins",
+        "_exchange_auths",
+        "_frozen",
+    ]
+
+    def __init__(
+        self,
+        auth: Optional[BitexAuth] = None,
+        codec: Optional[JSONCodec] = None,
+        retention: Optional[RetentionPolicy] = None,
+        compression: Optional[Compression] = None,
+        changes: Optional[ChangeDetector] = None,
+    ) -> None:
         super(BitexSession, self).__init__()
         self.auth = auth
+        self.codec = codec
+        self.retention = retention
+        self.compression = compression
+        self.changes = changes
         self.adapters["http://"] = BitexHTTPAdapter()
         self.adapters["https://"] = BitexHTTPAdapter()
+        self._plugins: Optional[Dict[str, Dict[str, Any]]] = None
+        self._exchange_auths: Dict[Tuple[str, str, str], BitexAuth] = {}
+        self._auth_lock = threading.Lock()
+        self._frozen = False
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = super(BitexSession, self).__getstate__()
+        if self._frozen:
+            # Read-only views can't be pickled; :meth:`__setstate__` freezes the copies again.
+            state["headers"] = CaseInsensitiveDict(self.headers)
+            state["params"] = dict(self.params)
+            state["hooks"] = {event: list(hooks) for event, hooks in self.hooks.items()}
+            state["proxies"] = dict(self.proxies)
+            state["adapters"] = collections.OrderedDict(self.adapters)
+            state["_plugins"] = None
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Restore a pickled session, re-creating its lock; frozen sessions are frozen again."""
+        state = dict(state)
+        frozen = state.pop("_frozen", False)
+        super(BitexSession, self).__setstate__(state)
+        self._auth_lock = threading.Lock()
+        self._frozen = False
+        if frozen:
+            self.freeze()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if self.__dict__.get("_frozen", False):
+            raise AttributeError(f"Cannot set {name!r} of a frozen session!")
+        super(BitexSession, self).__setattr__(name, value)
+
+    @property
+    def frozen(self) -> bool:
+        """Whether :meth:`freeze` was called."""
+        return self._frozen
+
+    def freeze(self) -> "BitexSession":
+        """Make the configuration of the session immutable, for sharing across threads.
+
+        Afterwards, no attributes may be assigned, and :attr:`headers`,
+        :attr:`params`, :attr:`hooks`, :attr:`proxies` and :attr:`adapters`
+        are read-only. Cookies present are kept, but cookies set by responses
+        are no longer stored. The classes announced by plugins are looked up
+        once, instead of on every request.
+
+        Preparing and sending requests then only reads shared state, except for
+        the creation of per-exchange auth objects (see :meth:`auth_for`) and
+        the connection pools of the adapters, which are synchronized.
+
+        :return: The session itself.
+        """
+        if self._frozen:
+            return self
+        plugins = list_loaded_plugins()
+        for adapter in self.adapters.values():
+            if isinstance(adapter, BitexHTTPAdapter):
+                adapter.plugins = plugins
+        cookies = RequestsCookieJar(policy=cookielib.DefaultCookiePolicy(allowed_domains=[]))
+        for cookie in self.cookies:
+            cookies.set_cookie(cookie)
+        self.cookies = cookies
+        self.headers = _ReadOnlyHeaders(self.headers)
+        self.params = MappingProxyType(dict(self.params))
+        self.hooks = MappingProxyType({event: tuple(hooks) for event, hooks in self.hooks.items()})
+        self.proxies = MappingProxyType(dict(self.proxies))
+        self.adapters = MappingProxyType(self.adapters)
+        self._plugins = plugins
+        self._frozen = True
+        return self
+
+    def auth_for(self, exchange: Optional[str], private: bool = True) -> Any:
+        """Return the session's auth object for requests to `exchange`.
+
+        If :attr:`auth` is a plain :class:`BitexAuth`, i.e. merely holds the API
+        credentials, private requests to an exchange with a plugin are signed
+        by the plugin's auth class instead. It is instantiated with these
+        credentials once per exchange, without modifying the session.
+        """
+        auth = self.auth
+        if not private or type(auth) is not BitexAuth:
+            return auth
+        custom_classes = self._plugin_classes().get(exchange)
+        if not custom_classes:
+            return auth
+        cache_key = (exchange, auth.key, auth.secret)
+        exchange_auth = self._exchange_auths.get(cache_key)
+        if exchange_auth is None:
+            with self._auth_lock:
+                exchange_auth = self._exchange_auths.get(cache_key)
+                if exchange_auth is None:
+                    exchange_auth = custom_classes["Auth"](auth.key, auth.secret)
+                    self._exchange_auths[cache_key] = exchange_auth
+        return exchange_auth
+
+    def _plugin_classes(self) -> Dict[str, Dict[str, Any]]:
+        """Return the classes announced by plugins, as looked up by :meth:`freeze`."""
+        if self._plugins is not None:
+            return self._plugins
+        return list_loaded_plugins()
 
     def request(
         self,
@@ -63,12 +274,19 @@ class BitexSession(requests.Session):
         verify=None,
         cert=None,
         json=None,
+        deadline=None,
     ) -> BitexResponse:
         """Construct a :class:`BitexRequest`, prepare and send it.
 
         `url` may either be a URL starting with http/https, or a :mod:`bitex-framework`
         short-hand url in the format of `<exchange>:<instrument>/<data>/<action>`.
+
+        `deadline` bounds the entire request, either as a :class:`bitex.deadline.Deadline`
+        or in seconds from now; see :mod:`bitex.deadline`.
+
+        :raises DeadlineExceeded: If the deadline expired before the request completed.
         """
+        deadline = Deadline.coerce(deadline)
         # Create the Request.
         req = BitexRequest(
             method=method.upper(),
@@ -83,7 +301,12 @@ class BitexSession(requests.Session):
             hooks=hooks,
             private=private,
         )
-        prep = self.prepare_request(req)
+        if deadline is not None:
+            req.deadline = deadline
+            with deadline.stage("prepare"):
+                prep = self.prepare_request(req)
+        else:
+            prep = self.prepare_request(req)
 
         proxies = proxies or {}
 
@@ -96,6 +319,28 @@ class BitexSession(requests.Session):
 
         return resp
 
+    def send(self, request: BitexPreparedRequest, **kwargs: Any) -> BitexResponse:
+        """Send the given :class:`BitexPreparedRequest`.
+
+        If the request carries a :class:`bitex.deadline.Deadline`, the timeout
+        is clamped to the remaining time, and reading the response is accounted
+        to stage ``read`` of the deadline. The response is tracked by
+        :attr:`retention`, if set, after :attr:`changes` compared it against the
+        previous response.
+        """
+        deadline = getattr(request, "deadline", None)
+        if not isinstance(deadline, Deadline):
+            response = super(BitexSession, self).send(request, **kwargs)
+        else:
+            with deadline.stage("read"):
+                kwargs["timeout"] = deadline.clamp(kwargs.get("timeout"), "read")
+                response = super(BitexSession, self).send(request, **kwargs)
+        if self.changes is not None and isinstance(response, BitexResponse):
+            self.changes.observe(response)
+        if self.retention is not None and isinstance(response, BitexResponse):
+            self.retention.track(response)
+        return response
+
     def prepare_request(self, request: BitexRequest) -> BitexPreparedRequest:
         """Prepare a :class:`BitexPreparedRequest` object for transmission.
 
@@ -117,30 +362,45 @@ class BitexSession(requests.Session):
         auth = request.auth
         if self.trust_env and not auth and not self.auth:
             auth = get_netrc_auth(request.url)
+        deadline = getattr(request, "deadline", None)
         # Inject any custom classes for handling the exchange stated in the
         # BitexRequest object.
-        custom_classes = list_loaded_plugins().get(request.exchange, None)
+        custom_classes = self._plugin_classes().get(request.exchange, None)
         if custom_classes:
             p = custom_classes["PreparedRequest"](request.exchange)
-            # Only use the custom auth class if no auth object was
-            # provided explicitly. Otherwise we would overwrite user-specified
-            # auth objects passed to self.request.
-            if not self.auth and request.private:
-                self.auth = custom_classes["Auth"](self.key, self.secret)
         else:
             p = BitexPreparedRequest(request.exchange)
+        if self.codec is not None:
+            p.codec = self.codec
+        # Auth objects passed to self.request take precedence over the session's.
+        auth = merge_setting(auth, self.auth_for(request.exchange, request.private))
+        headers = merge_setting(request.headers, self.headers, dict_class=CaseInsensitiveDict)
+        if self.compression is not None:
+            p.compression = self.compression
+            # Don't override encodings requested explicitly.
+            if "Accept-Encoding" not in CaseInsensitiveDict(request.headers or {}):
+                headers["Accept-Encoding"] = self.compression.accept_encoding(request.exchange)
+        if isinstance(deadline, Deadline):
+            p.deadline = deadline
+            if auth:
+                auth = DeadlineAuth(auth, deadline)
         p.prepare(
             method=request.method.upper(),
             url=request.url,
             files=request.files,
             data=request.data,
             json=request.json,
-            headers=merge_setting(request.headers, self.headers, dict_class=CaseInsensitiveDict),
+            headers=headers,
             params=merge_setting(request.params, self.params),
-            auth=merge_setting(auth, self.auth),
+            auth=auth,
             cookies=merged_cookies,
             hooks=merge_hooks(request.hooks, self.hooks),
         )
+        # The URL is only final once prepared; signed requests are left untouched.
+        if self.changes is not None and not request.private:
+            explicit = CaseInsensitiveDict(request.headers or {})
+            if "If-None-Match" not in explicit and "If-Modified-Since" not in explicit:
+                p.headers.update(self.changes.conditional_headers(p.method, p.url))
         return p
 
     @property
@@ -157,6 +417,8 @@ class BitexSession(requests.Session):
 
         :type value: str
         """
+        if self._frozen:
+            raise AttributeError("Cannot set 'key' of a frozen session!")
         self.auth.key = value
 
     @property
@@ -173,6 +435,8 @@ class BitexSession(requests.Session):
 
         :type value: str
         """
+        if self._frozen:
+            raise AttributeError("Cannot set 'secret' of a frozen session!")
         self.auth.secret = value
 
     def ticker(self, exchange: str, pair: str, method: str = "GET", **kwargs) -> BitexResponse:
@@ -214,9 +478,51 @@ class BitexSession(requests.Session):
         """
         return self.request(method, f"{exchange}://{pair}/trades", **kwargs)
 
+    def iter_trades(
+        self,
+        exchange: str,
+        pair: str,
+        start: float,
+        end: Optional[float] = None,
+        prefetch: int = 4,
+        **kwargs,
+    ) -> Iterator[Trade]:
+        """Yield the trades of `pair` at `exchange` from `start` until `end`, in order.
+
+        Pages are requested via :meth:`trades`, following the pagination scheme
+        announced by the exchange's plugin; see :mod:`bitex.pagination`.
+
+        :param str exchange: The exchange you'd like to request data from.
+        :param str pair: The currency pair to request data for.
+        :param float start: Time of the first trade, in the unit used by the plugin.
+        :param float end: Stop before this time; by default, at the latest trade.
+        :param int prefetch:
+            The maximum number of pages requested concurrently, if the
+            exchange's pagination scheme allows it.
+        :param Any kwargs:
+            Additional keyword arguments which are passed on to :meth:`trades`.
+        :raises MissingPlugin: If no plugin announced pagination for `exchange`.
+        """
+        paginator = list_loaded_paginators().get(exchange)
+        if paginator is None:
+            raise MissingPlugin(exchange)
+        params = kwargs.pop("params", None) or {}
+
+        def fetch(page_params):
+            response = self.trades(exchange, pair, params={**params, **page_params}, **kwargs)
+            response.raise_for_status()
+            return response
+
+        return iter_trades(fetch, paginator, pair, start, end, prefetch)
+
     def new_order(self, exchange: str, pair: str, method: str = "POST", **kwargs) -> BitexResponse:
         """Create a new order for `pair` at the given `exchange`.
 
+        The order is signed while holding the signing lock of the API key, as
+        are the orders of :meth:`new_orders`. If the exchange requires nonces
+        in order (see :attr:`bitex.auth.BitexAuth.ordered_nonces`), the lock is
+        held until the response was received.
+
         :param str exchange: The exchange you'd like to request data from.
         :param str pair: The currency pair to place the order for.
         :param str method:
@@ -226,13 +532,15 @@ class BitexSession(requests.Session):
             :meth:`requests.Session.request`.
         :rtype: BitexResponse
         """
-        return self.request(method, f"{exchange}://{pair}/order/new", **kwargs)
+        return self._order(exchange, f"{exchange}://{pair}/order/new", method, kwargs)
 
     def cancel_order(
         self, exchange: str, pair: str, method: str = "DELETE", **kwargs
     ) -> BitexResponse:
         """Cancel an order with the given `order_id` for `pair` at the given `exchange`.
 
+        The request is signed as described for :meth:`new_order`.
+
         :param str exchange: The exchange you'd like to request data from.
         :param str pair: The currency pair to place the order for.
         :param order_id: The order id of the order you'd like to cancel.
@@ -243,7 +551,154 @@ class BitexSession(requests.Session):
             :meth:`requests.Session.request`.
         :rtype: BitexResponse
         """
-        return self.request(method, f"{exchange}://{pair}/order/cancel", **kwargs)
+        return self._order(exchange, f"{exchange}://{pair}/order/cancel", method, kwargs)
+
+    def _order(
+        self, exchange: str, url: str, method: str, kwargs: Dict[str, Any]
+    ) -> BitexResponse:
+        auth = kwargs.get("auth") or self.auth_for(exchange, kwargs.get("private", False))
+        if _ordered_nonces(auth):
+            with _signing(auth):
+                return self.request(method, url, **kwargs)
+        if isinstance(auth, BitexAuth):
+            kwargs = {**kwargs, "auth": _SigningAuth(auth)}
+        return self.request(method, url, **kwargs)
+
+    def new_orders(
+        self,
+        exchange: str,
+        orders: Sequence[Mapping[str, Any]],
+        method: str = "POST",
+        max_workers: int = 8,
+    ) -> List[OrderResult]:
+        """Place several orders at the given `exchange` at once.
+
+        Each order is given as a mapping holding its `pair`, along with the
+        keyword arguments to pass to :meth:`new_order` for it (e.g. `params`).
+
+        If the exchange's plugin announces a batch endpoint (see
+        :class:`bitex.orders.BatchOrdersEndpoint`), orders are sent via it, in as
+        few requests as possible. Otherwise, the orders are signed one after the
+        other, with strictly increasing nonces. If the exchange requires nonces
+        in order (see :attr:`bitex.auth.BitexAuth.ordered_nonces`), each order is
+        signed right before it is sent, and the next one only once its response
+        was received; otherwise, the orders are sent concurrently.
+
+        :param str exchange: The exchange to place the orders at.
+        :param orders: The orders to place.
+        :param str method: The HTTP method used for individual orders.
+        :param int max_workers:
+            The maximum number of individual orders sent concurrently, if the
+            exchange does not require nonces in order.
+        :return: The result of each order, in the same order as `orders`.
+        """
+        return self._batch_orders(exchange, orders, "new", method, max_workers)
+
+    def cancel_orders(
+        self,
+        exchange: str,
+        orders: Sequence[Mapping[str, Any]],
+        method: str = "DELETE",
+        max_workers: int = 8,
+    ) -> List[OrderResult]:
+        """Cancel several orders at the given `exchange` at once.
+
+        Orders are given and sent as described for :meth:`new_orders`, with the
+        keyword arguments for :meth:`cancel_order` instead.
+
+        :return: The result of each cancellation, in the same order as `orders`.
+        """
+        return self._batch_orders(exchange, orders, "cancel", method, max_workers)
+
+    def _batch_orders(
+        self,
+        exchange: str,
+        orders: Sequence[Mapping[str, Any]],
+        action: str,
+        method: str,
+        max_workers: int,
+    ) -> List[OrderResult]:
+        endpoint = list_loaded_batch_orders().get(exchange)
+        if endpoint is not None:
+            results = []
+            for index in range(0, len(orders), endpoint.max_batch):
+                batch = orders[index : index + endpoint.max_batch]
+                try:
+                    response = endpoint.request(self, action, batch)
+                    response.raise_for_status()
+                    results.extend(endpoint.results(response, batch))
+                except Exception as e:
+                    results.extend(OrderResult(order, error=e) for order in batch)
+            return results
+
+        session_auth = self.auth_for(exchange)
+        auths = [order.get("auth") or session_auth for order in orders]
+        if any(_ordered_nonces(auth) for auth in auths):
+            # Sending concurrently could deliver a later nonce first.
+            results = []
+            for order, auth in zip(orders, auths):
+                with _signing(auth):
+                    prep = self._prepare_order(exchange, order, action, method)
+                    if isinstance(prep, Exception):
+                        results.append(OrderResult(order, error=prep))
+                    else:
+                        results.append(self._send_order(order, prep))
+            return results
+
+        prepared = []
+        for order, auth in zip(orders, auths):
+            with _signing(auth):
+                prepared.append(self._prepare_order(exchange, order, action, method))
+        pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bitex-orders")
+        with pool:
+            futures = [
+                None if isinstance(prep, Exception) else pool.submit(self._send_order, order, prep)
+                for order, prep in zip(orders, prepared)
+            ]
+            return [
+                future.result() if future is not None else OrderResult(order, error=prep)
+                for order, prep, future in zip(orders, prepared, futures)
+            ]
+
+    def _prepare_order(
+        self, exchange: str, order: Mapping[str, Any], action: str, method: str
+    ) -> Union[BitexPreparedRequest, Exception]:
+        """Prepare and sign the request for `order`, or return the exception raised doing so."""
+        kwargs = dict(order)
+        pair = kwargs.pop("pair")
+        try:
+            req = BitexRequest(
+                method=method.upper(),
+                url=f"{exchange}://{pair}/order/{action}",
+                headers=kwargs.get("headers"),
+                files=kwargs.get("files"),
+                data=kwargs.get("data") or {},
+                json=kwargs.get("json"),
+                params=kwargs.get("params") or {},
+                auth=kwargs.get("auth"),
+                cookies=kwargs.get("cookies"),
+                hooks=kwargs.get("hooks"),
+                private=True,
+            )
+            return self.prepare_request(req)
+        except Exception as e:
+            return e
+
+    def _send_order(self, order: Mapping[str, Any], prep: BitexPreparedRequest) -> OrderResult:
+        try:
+            settings = self.merge_environment_settings(prep.url, {}, None, None, None)
+            response = self.send(prep, timeout=order.get("timeout"), **settings)
+        except Exception as e:
+            return OrderResult(order, error=e)
+        try:
+            response.raise_for_status()
+        except requests.HTTPError as e:
+            return OrderResult(order, response, error=e)
+        try:
+            records = response.records()
+        except NotImplementedError:
+            records = []
+        return OrderResult(order, response, records[0] if records else None)
 
     def order_status(
         self, exchange: str, pair: str, method: str = "GET", **kwargs
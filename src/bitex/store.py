@@ -0,0 +1,262 @@
+"""Shared-memory store for the latest ticker and top-of-book values.
+
+A single collector process writes the latest values per ``(exchange, pair)``
+into a fixed-layout shared memory segment, and any number of processes on the
+same host read them without locks and without issuing requests of their own::
+
+    >>># Collector process
+    >>>store = SharedQuoteStore.create("bitex-quotes", capacity=1024)
+    >>>store.update(session.ticker("kraken", "BTCUSD"))
+
+    >>># Any other process
+    >>>store = SharedQuoteStore.attach("bitex-quotes")
+    >>>store.read("kraken", "BTCUSD")
+    {'bid': 3809.0, 'bid_size': 1.0, 'ask': 3809.1, 'ask_size': 1.0, 'last': nan, 'timestamp': ...}
+
+The segment consists of a header, a directory of slot keys and the slots
+themselves. Each slot starts with a sequence counter, which implements a seqlock:
+the writer makes the counter odd before and even again after updating the slot,
+and readers retry whenever the counter was odd or changed while they read.
+Should the writer die mid-update, leaving the counter odd, readers of that
+slot give up after a timeout.
+
+There must only ever be a single writer per segment.
+
+.. Note::
+
+    This module requires Python 3.8 or later, for
+    :class:`multiprocessing.shared_memory.SharedMemory`. On earlier versions,
+    it may be imported, but creating or attaching to a store raises an
+    :exc:`ImportError`.
+"""
+# Built-in
+import math
+import os
+import struct
+import sys
+import time
+from typing import Dict, List, Mapping, Optional, Tuple
+
+# Home-brew
+from bitex.response import BitexResponse
+
+try:
+    # Built-in
+    from multiprocessing import resource_tracker
+    from multiprocessing.shared_memory import SharedMemory
+except ImportError:  # pragma: no cover
+    # Python < 3.8
+    resource_tracker = SharedMemory = None
+
+#: The values stored per slot, in order. Missing values are stored as NaN.
+FIELDS = ("bid", "bid_size", "ask", "ask_size", "last", "timestamp")
+
+_MAGIC = b"BITEXSHM"
+_VERSION = 1
+#: magic, version, capacity, number of fields, number of used slots.
+_HEADER = struct.Struct("<8sIIII")
+_HEADER_SIZE = 64
+_KEY_SIZE = 64
+_SEQ_SIZE = 8
+#: Attempts at reading a slot between two checks of the timeout, which yield the CPU.
+_SPINS = 100
+
+
+def _require_shared_memory() -> None:
+    if SharedMemory is None:
+        raise ImportError("SharedQuoteStore requires Python 3.8 or later")
+
+
+class SharedQuoteStore:
+    """Latest values per ``(exchange, pair)`` in a shared memory segment.
+
+    Use :meth:`create` in the writing process and :meth:`attach` in readers,
+    instead of instantiating this class directly.
+
+    :param SharedMemory shm: The shared memory segment backing the store.
+    :param bool owner: Whether this instance created the segment.
+    """
+
+    def __init__(self, shm: "SharedMemory", owner: bool = False) -> None:
+        self.shm = shm
+        self.owner = owner
+        magic, version, capacity, n_fields, _ = _HEADER.unpack_from(shm.buf, 0)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"Shared memory segment {shm.name!r} is not a SharedQuoteStore!")
+        self.capacity = capacity
+        self._values = struct.Struct(f"@{n_fields}d")
+        self._slot_size = _SEQ_SIZE + self._values.size
+        self._slots_offset = _HEADER_SIZE + capacity * _KEY_SIZE
+        self._index: Dict[Tuple[str, str], int] = {}
+        # Sequence counters are accessed through a view of native 8-byte words,
+        # which reads and writes each counter with a single memory access. Slots
+        # are 8-byte aligned. (:meth:`struct.Struct.pack_into` is unsuitable, as
+        # it zero-fills the target before writing.)
+        self._words = shm.buf.cast("Q")
+
+    @staticmethod
+    def size(capacity: int) -> int:
+        """Return the number of bytes required for a store with `capacity` slots."""
+        return _HEADER_SIZE + capacity * (_KEY_SIZE + _SEQ_SIZE + 8 * len(FIELDS))
+
+    @classmethod
+    def create(cls, name: Optional[str] = None, capacity: int = 1024) -> "SharedQuoteStore":
+        """Create a new segment with room for `capacity` pairs and return its writer."""
+        _require_shared_memory()
+        shm = SharedMemory(name=name, create=True, size=cls.size(capacity))
+        # Fresh segments are zero-filled: all keys are empty and all seqs are 0.
+        _HEADER.pack_into(shm.buf, 0, _MAGIC, _VERSION, capacity, len(FIELDS), 0)
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedQuoteStore":
+        """Attach to the existing segment `name` for reading.
+
+        The segment is not registered with the :mod:`multiprocessing` resource
+        tracker of this process, which would otherwise destroy it once this
+        process exits, even though the owner still uses it.
+        """
+        _require_shared_memory()
+        if sys.version_info >= (3, 13):
+            shm = SharedMemory(name=name, track=False)
+        else:
+            shm = SharedMemory(name=name)
+            if os.name == "posix":
+                resource_tracker.unregister(shm._name, "shared_memory")
+        try:
+            return cls(shm)
+        except Exception:
+            shm.close()
+            raise
+
+    @property
+    def name(self) -> str:
+        """Return the name of the underlying shared memory segment."""
+        return self.shm.name
+
+    @property
+    def used(self) -> int:
+        """Return the number of slots in use."""
+        return _HEADER.unpack_from(self.shm.buf, 0)[4]
+
+    def close(self) -> None:
+        """Detach from the segment; the owner also destroys it."""
+        self._index.clear()
+        self._words.release()
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+    def __enter__(self) -> "SharedQuoteStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @staticmethod
+    def _encode_key(exchange: str, pair: str) -> bytes:
+        key = f"{exchange}:{pair}".encode("utf-8")
+        if len(key) > _KEY_SIZE:
+            raise ValueError(f"Key {key!r} exceeds {_KEY_SIZE} bytes!")
+        return key.ljust(_KEY_SIZE, b"\0")
+
+    def _scan(self) -> None:
+        """Refresh the local slot index from the segment's directory."""
+        buf = self.shm.buf
+        for slot in range(len(self._index), self.used):
+            offset = _HEADER_SIZE + slot * _KEY_SIZE
+            raw = bytes(buf[offset : offset + _KEY_SIZE]).rstrip(b"\0")
+            exchange, _, pair = raw.decode("utf-8").partition(":")
+            self._index[(exchange, pair)] = slot
+
+    def _slot(self, exchange: str, pair: str) -> Optional[int]:
+        try:
+            return self._index[(exchange, pair)]
+        except KeyError:
+            self._scan()
+            return self._index.get((exchange, pair))
+
+    def keys(self) -> List[Tuple[str, str]]:
+        """Return the ``(exchange, pair)`` keys present in the store."""
+        self._scan()
+        return list(self._index)
+
+    def write(self, exchange: str, pair: str, values: Mapping[str, Optional[float]]) -> None:
+        """Store the given `values` for `exchange` and `pair`.
+
+        Keys of `values` not listed in :data:`FIELDS` are ignored.
+        """
+        buf = self.shm.buf
+        slot = self._slot(exchange, pair)
+        if slot is None:
+            slot = self.used
+            if slot >= self.capacity:
+                raise ValueError(f"SharedQuoteStore {self.name!r} is full!")
+            offset = _HEADER_SIZE + slot * _KEY_SIZE
+            buf[offset : offset + _KEY_SIZE] = self._encode_key(exchange, pair)
+            # Publish the key only after it was written completely.
+            struct.pack_into("<I", buf, _HEADER.size - 4, slot + 1)
+            self._index[(exchange, pair)] = slot
+        offset = self._slots_offset + slot * self._slot_size
+        word = offset // _SEQ_SIZE
+        seq = self._words[word]
+        packed = [math.nan if values.get(f) is None else float(values[f]) for f in FIELDS]
+        self._words[word] = seq + 1
+        self._values.pack_into(buf, offset + _SEQ_SIZE, *packed)
+        self._words[word] = seq + 2
+
+    def update(self, response: BitexResponse) -> None:
+        """Store the values of a ticker `response`, as given by its `key_value_dict()`.
+
+        The reception time of the response is used as `timestamp`, unless the
+        data supplies a `timestamp` itself.
+        """
+        data = response.key_value_dict()
+        values = dict(data)
+        values.setdefault("timestamp", data.get("received", response.received))
+        self.write(response.request.exchange, data["pair"], values)
+
+    def read(
+        self, exchange: str, pair: str, timeout: float = 1.0
+    ) -> Optional[Dict[str, float]]:
+        """Return the latest values for `exchange` and `pair`, or `None` if there are none.
+
+        This never blocks the writer; should the slot be updated while reading,
+        the read is retried.
+
+        :param float timeout:
+            Seconds to retry for. Updates take microseconds; a slot still being
+            updated after that long was left behind by a writer which died.
+        :raises TimeoutError: If the slot could not be read within `timeout` seconds.
+        """
+        slot = self._slot(exchange, pair)
+        if slot is None:
+            return None
+        buf = self.shm.buf
+        words = self._words
+        offset = self._slots_offset + slot * self._slot_size
+        word = offset // _SEQ_SIZE
+        spins = 0
+        deadline = None
+        while True:
+            before = words[word]
+            if not before & 1:
+                values = self._values.unpack_from(buf, offset + _SEQ_SIZE)
+                if words[word] == before:
+                    break
+            spins += 1
+            if spins % _SPINS == 0:
+                now = time.monotonic()
+                if deadline is None:
+                    deadline = now + timeout
+                elif now >= deadline:
+                    raise TimeoutError(
+                        f"Slot of {exchange}:{pair} in {self.name!r} is still being written "
+                        f"after {timeout}s; did the writer die?"
+                    )
+                # Let the writer finish, should it share our CPU.
+                time.sleep(0)
+        if before == 0:
+            # Slot reserved, but no values written yet.
+            return None
+        return dict(zip(FIELDS, values))
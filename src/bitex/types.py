@@ -5,4 +5,5 @@ from typing import Any, Dict, List, Tuple, Union
 DecodedParams = Tuple[Tuple[str, List[Any]], ...]
 RegexMatchDict = Dict[str, Union[str, None]]
 Triple = Tuple[int, str, Union[str, int, float]]
+ScaledTriple = Tuple[int, str, Union[str, int]]
 KeyValuePairs = Dict[str, Union[str, int, float]]
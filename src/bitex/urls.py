@@ -0,0 +1,253 @@
+"""Compiled URL templates for resolving :mod:`bitex-framework` short-hand URLs.
+
+Short-hand URLs in the format of ``<exchange>:<instrument>/<endpoint>[/<action>]``
+are resolved to fully qualified URLs by :class:`bitex.request.BitexPreparedRequest`,
+if the exchange's plugin announces a :class:`URLTemplates` via
+:meth:`bitex.plugins.AnnounceURLTemplatesHookSpec.announce_url_templates`::
+
+    >>>templates = URLTemplates(
+    ...    "https://api.uberex.com/v1",
+    ...    {
+    ...        "ticker": "{base}/ticker/{symbol}",
+    ...        "book": "{base}/depth?symbol={symbol}",
+    ...        ("order", "new"): "{base}/orders",
+    ...    },
+    ...    symbols=SymbolFormat(separator="-", case="lower", aliases={"BTC": "XBT"}),
+    ...)
+    >>>templates.resolve("BTC/USD", "ticker")
+    'https://api.uberex.com/v1/ticker/xbt-usd'
+
+Templates are keyed by endpoint, or by ``(endpoint, action)`` for endpoints
+with actions; a template keyed by the endpoint alone applies to all of its
+actions without a template of their own. They may use these fields:
+
+- ``{base}``: the base URL of the exchange's API.
+- ``{symbol}``: the instrument, formatted by :class:`SymbolFormat`.
+- ``{instrument}``: the instrument as given in the short-hand.
+- ``{endpoint}`` and ``{action}``: as given in the short-hand.
+
+Templates are compiled once: ``{base}`` is substituted right away, and the
+remaining fields are filled in via a bound :meth:`str.format`. Resolved URLs
+are cached per ``(instrument, endpoint, action)``, and by short-hand in
+:data:`registry`, so resolving a short-hand seen before costs a dict lookup.
+"""
+# Built-in
+import logging
+import re
+import string
+import threading
+from typing import Callable, Dict, Mapping, NamedTuple, Optional, Tuple, Union
+
+# Home-brew
+from bitex.constants.private import (
+    BITEX_SHORTHAND_NO_ACTION_REGEX,
+    BITEX_SHORTHAND_WITH_ACTION_REGEX,
+)
+
+# Init Logging Facilities
+log = logging.getLogger(__name__)
+
+#: Fields available to templates, besides ``{base}``.
+FIELDS = ("symbol", "instrument", "endpoint", "action")
+
+#: Separators splitting an instrument into its base and quote currency.
+INSTRUMENT_SEPARATORS = re.compile(r"[/\-_:]")
+
+TemplateKey = Union[str, Tuple[str, str]]
+
+
+class Resolved(NamedTuple):
+    """A short-hand URL, resolved to a fully qualified `url`."""
+
+    url: str
+    exchange: str
+    instrument: str
+    endpoint: str
+    action: Optional[str]
+
+
+class SymbolFormat:
+    """Formatting rules of an exchange's instrument symbols.
+
+    Instruments given with a separator (``/``, ``-``, ``_`` or ``:``) are split
+    into their currencies, which are renamed via `aliases` and joined with
+    `separator`. Instruments given without one are only renamed as a whole.
+
+    :param str separator: Joins the base and quote currency.
+    :param str case: ``"upper"``, ``"lower"`` or `None` to keep the case.
+    :param Mapping aliases: Exchange-specific names of currencies or instruments.
+    """
+
+    def __init__(
+        self,
+        separator: str = "",
+        case: Optional[str] = "upper",
+        aliases: Optional[Mapping[str, str]] = None,
+    ) -> None:
+        if case not in ("upper", "lower", None):
+            raise ValueError(f"Unknown case {case!r}!")
+        self.separator = separator
+        self.case = case
+        self.aliases = {name.upper(): alias for name, alias in (aliases or {}).items()}
+
+    def __call__(self, instrument: str) -> str:
+        """Return the exchange's symbol of `instrument`."""
+        parts = INSTRUMENT_SEPARATORS.split(instrument)
+        aliases = self.aliases
+        symbol = self.separator.join(aliases.get(part.upper(), part) for part in parts)
+        if self.case == "upper":
+            return symbol.upper()
+        if self.case == "lower":
+            return symbol.lower()
+        return symbol
+
+
+class URLTemplates:
+    """The URL templates of an exchange's endpoints.
+
+    :param str base: The base URL of the exchange's API.
+    :param Mapping templates: Templates by endpoint, or ``(endpoint, action)``.
+    :param Callable symbols: Formats instruments; a :class:`SymbolFormat` by default.
+    :raises ValueError: If a template uses an unknown field.
+    """
+
+    def __init__(
+        self,
+        base: str,
+        templates: Mapping[TemplateKey, str],
+        symbols: Optional[Callable[[str], str]] = None,
+    ) -> None:
+        self.base = base.rstrip("/")
+        self.templates = dict(templates)
+        self.symbols = symbols or SymbolFormat()
+        self._formatters = {key: self.compile(template) for key, template in templates.items()}
+        self._cache: Dict[Tuple[str, str, Optional[str]], str] = {}
+
+    def compile(self, template: str) -> Callable[..., str]:
+        """Compile `template` into a function taking the fields of :data:`FIELDS`."""
+        fields = {name for _, name, _, _ in string.Formatter().parse(template) if name}
+        unknown = fields - set(FIELDS) - {"base"}
+        if unknown:
+            raise ValueError(f"Unknown fields {sorted(unknown)} in URL template {template!r}!")
+        # Substitute the base URL now; escape its braces for the second pass.
+        base = self.base.replace("{", "{{").replace("}", "}}")
+        compiled = template.replace("{base}", base)
+        if not fields - {"base"}:
+            static = compiled.format()
+            return lambda **fields: static
+        return compiled.format
+
+    def formatter(self, endpoint: str, action: Optional[str]) -> Optional[Callable[..., str]]:
+        """Return the compiled template of `endpoint` and `action`, if there is one."""
+        formatter = self._formatters.get((endpoint, action)) if action else None
+        return formatter or self._formatters.get(endpoint)
+
+    def resolve(self, instrument: str, endpoint: str, action: Optional[str] = None) -> str:
+        """Return the URL of `endpoint` and `action`, for `instrument`.
+
+        :raises KeyError: If there is no template for `endpoint` and `action`.
+        """
+        key = (instrument, endpoint, action)
+        url = self._cache.get(key)
+        if url is None:
+            formatter = self.formatter(endpoint, action)
+            if formatter is None:
+                raise KeyError(f"No URL template for {endpoint!r} (action {action!r})!")
+            url = formatter(
+                symbol=self.symbols(instrument),
+                instrument=instrument,
+                endpoint=endpoint,
+                action=action or "",
+            )
+            self._cache[key] = url
+        return url
+
+
+class URLRegistry:
+    """URL templates by exchange, resolving short-hand URLs.
+
+    Templates announced by plugins are looked up once, when the first
+    short-hand URL is resolved; templates may also be registered explicitly.
+
+    :param int max_cached: The number of resolved short-hands to cache.
+    """
+
+    def __init__(self, max_cached: int = 4096) -> None:
+        self.max_cached = max_cached
+        self._templates: Optional[Dict[str, URLTemplates]] = None
+        self._resolved: Dict[str, Optional[Resolved]] = {}
+        self._lock = threading.Lock()
+
+    def templates(self) -> Dict[str, URLTemplates]:
+        """Return the URL templates by exchange."""
+        if self._templates is None:
+            # Imported here, as bitex.plugins imports this module.
+            from bitex.plugins import list_loaded_url_templates
+
+            with self._lock:
+                if self._templates is None:
+                    self._templates = list_loaded_url_templates()
+        return self._templates
+
+    def register(self, exchange: str, templates: URLTemplates) -> None:
+        """Register the URL `templates` of `exchange`."""
+        self.templates()[exchange] = templates
+        self._resolved.clear()
+
+    def unregister(self, exchange: str) -> None:
+        """Remove the URL templates of `exchange`, if any."""
+        self.templates().pop(exchange, None)
+        self._resolved.clear()
+
+    def reload(self) -> None:
+        """Discard all templates and cached URLs, and look up plugins again."""
+        with self._lock:
+            self._templates = None
+            self._resolved.clear()
+
+    def resolve(self, url: str) -> Optional[Resolved]:
+        """Resolve the short-hand `url`.
+
+        Any query string of the short-hand, e.g. ``kraken:BTCUSD/wallet/withdraw?amount=1``,
+        is appended to the resolved URL.
+
+        :return: `None` if `url` is no short-hand, or its exchange has no templates.
+        """
+        if url.startswith(("http://", "https://")):
+            return None
+        try:
+            return self._resolved[url]
+        except KeyError:
+            pass
+        resolved = self._resolve(url)
+        if len(self._resolved) >= self.max_cached:
+            self._resolved.clear()
+        self._resolved[url] = resolved
+        return resolved
+
+    def _resolve(self, url: str) -> Optional[Resolved]:
+        match = BITEX_SHORTHAND_WITH_ACTION_REGEX.match(url)
+        match = match or BITEX_SHORTHAND_NO_ACTION_REGEX.match(url)
+        if match is None:
+            return None
+        groups = match.groupdict()
+        exchange = groups["exchange"]
+        templates = self.templates().get(exchange)
+        if templates is None:
+            return None
+        # Short-hands built as `<exchange>://<instrument>/...` are valid, too.
+        instrument = groups["instrument"].lstrip("/")
+        endpoint, action = groups["endpoint"], groups.get("action")
+        try:
+            resolved = templates.resolve(instrument, endpoint, action)
+        except KeyError:
+            log.debug("No URL template of %r for %r", exchange, url)
+            return None
+        rest = url[match.end() :]
+        if rest.startswith("?"):
+            resolved += ("&" if "?" in resolved else "?") + rest[1:]
+        return Resolved(resolved, exchange, instrument, endpoint, action)
+
+
+#: The registry used by :class:`bitex.request.BitexPreparedRequest`.
+registry = URLRegistry()
@@ -0,0 +1,99 @@
+# Built-in
+from unittest.mock import MagicMock
+
+# Third-party
+import pytest
+
+# Home-brew
+from bitex.aggregator import ASK, BID, ConsolidatedPair, MarketAggregator
+from bitex.response import BitexResponse
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def ticker_response(exchange, **data):
+    response = BitexResponse()
+    response.request = MagicMock(exchange=exchange)
+    response.key_value_dict = lambda: data
+    return response
+
+
+class TestConsolidatedPair:
+    def test_best_bid_and_ask_pick_the_best_venue(self, clock):
+        pair = ConsolidatedPair(clock=clock)
+        pair.update_quote("a", bid="100", ask="102", bid_size="1", ask_size="2")
+        pair.update_quote("b", bid="101", ask="103")
+        assert pair.best_bid() == ("b", 101.0, None)
+        assert pair.best_ask() == ("a", 102.0, 2.0)
+
+    def test_updates_replace_a_venues_previous_quote(self, clock):
+        pair = ConsolidatedPair(clock=clock)
+        pair.update_quote("a", bid="100", ask="102")
+        pair.update_quote("b", bid="101", ask="103")
+        pair.update_quote("b", bid="99", ask="101")
+        assert pair.best_bid() == ("a", 100.0, None)
+        assert pair.best_ask() == ("b", 101.0, None)
+
+    def test_heaps_stay_bounded_by_the_number_of_venues(self, clock):
+        pair = ConsolidatedPair(clock=clock)
+        pair.update_quote("best", bid="200", ask="201")
+        for i in range(10000):
+            pair.update_quote("worse", bid=str(100 + i % 7), ask=str(300 + i % 7))
+            assert pair.best_bid() == ("best", 200.0, None)
+        assert all(len(heap) <= 2 * 2 + 8 for heap in pair._heaps.values())
+        pair.update_quote("best", bid="99", ask="400")
+        assert pair.best_bid() == ("worse", 103.0, None)
+        assert pair.best_ask() == ("worse", 303.0, None)
+
+    def test_stale_venues_are_excluded(self, clock):
+        pair = ConsolidatedPair(max_age=5, clock=clock)
+        pair.update_quote("a", bid="100", ask="102")
+        clock.now = 3
+        pair.update_quote("b", bid="99", ask="103")
+        pair.update_book("b", bids=[("99", "1")], asks=[("103", "1")])
+        clock.now = 6
+        assert pair.stale_venues() == ["a"]
+        assert pair.best_bid() == ("b", 99.0, None)
+        clock.now = 10
+        assert pair.best_bid() is None
+        assert pair.depth(BID) == []
+
+    def test_depth_aggregates_sizes_across_venues(self, clock):
+        pair = ConsolidatedPair(clock=clock)
+        pair.update_book("a", bids=[("100", "1"), ("99", "2")], asks=[("101", "1")])
+        pair.update_book("b", bids=[("100", "3")], asks=[("102", "1"), ("101", "4")])
+        assert pair.depth(BID) == [(100.0, 4.0, {"a": 1.0, "b": 3.0}), (99.0, 2.0, {"a": 2.0})]
+        assert pair.depth(ASK, levels=1) == [(101.0, 5.0, {"a": 1.0, "b": 4.0})]
+
+        pair.update_book("a", bids=[("98", "1")], asks=[])
+        assert pair.depth(BID) == [(100.0, 3.0, {"b": 3.0}), (98.0, 1.0, {"a": 1.0})]
+
+        pair.remove_venue("b")
+        assert pair.depth(ASK) == []
+
+
+class TestMarketAggregator:
+    def test_update_uses_key_value_dict_of_responses(self, clock):
+        aggregator = MarketAggregator(clock=clock)
+        aggregator.update(ticker_response("kraken", pair="BTCUSD", bid="10", ask="12"))
+        aggregator.update(ticker_response("bitstamp", pair="BTCUSD", bid="11", ask="13"))
+        assert aggregator.best_bid("BTCUSD") == ("bitstamp", 11.0, None)
+        assert aggregator.best_ask("BTCUSD") == ("kraken", 12.0, None)
+        assert aggregator.best_bid("ETHUSD") is None
+
+    def test_update_book_also_updates_the_top_of_book_quote(self, clock):
+        aggregator = MarketAggregator(clock=clock)
+        aggregator.update_book("a", "BTCUSD", bids=[("9", "1"), ("10", "2")], asks=[("11", "1")])
+        assert aggregator.best_bid("BTCUSD") == ("a", 10.0, 2.0)
+        assert aggregator.depth("BTCUSD", BID) == [(10.0, 2.0, {"a": 2.0}), (9.0, 1.0, {"a": 1.0})]
@@ -0,0 +1,142 @@
+# Built-in
+import json
+import os
+from unittest import mock
+
+# Third-party
+import pytest
+
+# Home-brew
+from bitex.backfill import BackfillEngine, BackfillState, Chunk, RateLimiter
+from bitex.pagination import TimePaginator
+from bitex.records import Trade
+
+
+class Page:
+    def __init__(self, trades):
+        self.trades = trades
+
+    def records(self):
+        return self.trades
+
+    def raise_for_status(self):
+        pass
+
+
+class Paginator(TimePaginator):
+    def params(self, pair, start, end):
+        return {"since": start, "until": end}
+
+
+class FakeSession:
+    def __init__(self, fail_at=None):
+        self.fail_at = fail_at
+        self.calls = []
+
+    def trades(self, exchange, pair, params):
+        self.calls.append(params["since"])
+        if params["since"] == self.fail_at:
+            raise ConnectionError("boom")
+        timestamps = range(params["since"], params["until"])
+        return Page([Trade(pair, float(ts), ts, "1.0", "0.1") for ts in timestamps])
+
+
+@pytest.fixture
+def paginators():
+    with mock.patch(
+        "bitex.backfill.list_loaded_paginators", return_value={"uberex": Paginator(5)}
+    ):
+        yield
+
+
+def test_rate_limiter_waits_for_tokens():
+    now = [0.0]
+    waits = []
+    limiter = RateLimiter(2.0, burst=2, clock=lambda: now[0], sleep=waits.append)
+    assert [limiter.acquire() for _ in range(4)] == [0.0, 0.0, 0.5, 1.0]
+    now[0] = 10.0
+    assert limiter.acquire() == 0.0
+
+
+def test_add_splits_ranges_into_chunks(tmp_path):
+    engine = BackfillEngine(FakeSession(), tmp_path, chunk_size=10)
+    assert engine.add("uberex", "BTCUSD", 0, 25) == [
+        Chunk("uberex", "BTCUSD", 0, 10),
+        Chunk("uberex", "BTCUSD", 10, 20),
+        Chunk("uberex", "BTCUSD", 20, 25),
+    ]
+
+
+def test_run_writes_chunks_and_resumes_after_failures(tmp_path, paginators):
+    session = FakeSession(fail_at=10)
+    engine = BackfillEngine(session, tmp_path, chunk_size=10, retries=0, default_rate=1000)
+    engine.add("uberex", "BTCUSD", 0, 30)
+    reports = []
+    assert engine.run(report=reports.append) is False
+    assert len(reports) == 3
+    progress = engine.progress()["uberex"]
+    assert (progress["done"], progress["failed"], progress["trades"]) == (2, 1, 20)
+    assert not engine.path(Chunk("uberex", "BTCUSD", 10, 20)).exists()
+    lines = engine.path(Chunk("uberex", "BTCUSD", 0, 10)).read_bytes().splitlines()
+    assert [json.loads(line)["trade_id"] for line in lines] == list(range(10))
+
+    # A new engine resumes from the state file, and only fetches the missing chunk.
+    session = FakeSession()
+    engine = BackfillEngine(session, tmp_path, chunk_size=10, default_rate=1000)
+    engine.add("uberex", "BTCUSD", 0, 30)
+    assert engine.run() is True
+    assert session.calls == [10, 15]
+    assert engine.progress()["uberex"]["skipped"] == 2
+    assert BackfillState(tmp_path / "backfill.state.json").done == {
+        "uberex:BTCUSD:0:10": 10,
+        "uberex:BTCUSD:10:20": 10,
+        "uberex:BTCUSD:20:30": 10,
+    }
+
+
+def test_chunks_are_identified_alike_whether_bounded_by_ints_or_floats(tmp_path):
+    engine = BackfillEngine(FakeSession(), tmp_path)
+    chunk, same = Chunk("uberex", "BTCUSD", 1, 2.0), Chunk("uberex", "BTCUSD", 1.0, 2)
+    assert chunk.key == same.key == "uberex:BTCUSD:1:2"
+    assert engine.path(chunk) == engine.path(same)
+    assert Chunk("uberex", "BTCUSD", 0.5, 1.5).key == "uberex:BTCUSD:0.5:1.5"
+
+
+def test_chunk_files_are_flushed_to_disk_before_being_recorded(tmp_path, paginators):
+    engine = BackfillEngine(FakeSession(), tmp_path, chunk_size=10, default_rate=1000)
+    engine.add("uberex", "BTCUSD", 0, 10)
+    events = []
+    fsync, mark_done = os.fsync, engine.state.mark_done
+
+    def record_fsync(fd):
+        events.append("fsync")
+        fsync(fd)
+
+    def record_mark_done(chunk, trades):
+        events.append("done")
+        mark_done(chunk, trades)
+
+    with mock.patch("bitex.backfill.os.fsync", side_effect=record_fsync):
+        with mock.patch.object(engine.state, "mark_done", side_effect=record_mark_done):
+            assert engine.run() is True
+    # The chunk file and its directory, before the state file is written.
+    assert events[:3] == ["fsync", "fsync", "done"]
+
+
+def test_failed_chunks_are_retried_after_a_backoff(tmp_path, paginators):
+    class FlakySession(FakeSession):
+        failures = 2
+
+        def trades(self, exchange, pair, params):
+            if self.failures:
+                self.failures -= 1
+                raise ConnectionError("boom")
+            return super().trades(exchange, pair, params)
+
+    engine = BackfillEngine(
+        FlakySession(), tmp_path, chunk_size=10, default_rate=1000, retries=2, backoff=0.5
+    )
+    engine.add("uberex", "BTCUSD", 0, 10)
+    with mock.patch.object(engine._stopped, "wait", return_value=False) as wait:
+        assert engine.run() is True
+    assert [call.args[0] for call in wait.call_args_list] == [0.5, 1.0]
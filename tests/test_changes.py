@@ -0,0 +1,132 @@
+# Third-party
+import pytest
+
+# Home-brew
+from bitex.changes import ChangeDetector
+from bitex.memory import InMemoryAdapter, Reply
+from bitex.response import BitexResponse
+from bitex.retention import RetentionPolicy
+from bitex.session import BitexSession
+
+
+class TickerResponse(BitexResponse):
+    calls = 0
+
+    def triples(self):
+        TickerResponse.calls += 1
+        data = self.json()
+        return [(data["ts"], "bid", data["bid"])]
+
+
+@pytest.fixture
+def replies():
+    return []
+
+
+@pytest.fixture
+def adapter(replies):
+    adapter = InMemoryAdapter(plugins={})
+    adapter.requests_seen = []
+
+    @adapter.route(None)
+    def exchange(request):
+        adapter.requests_seen.append(request)
+        return replies.pop(0)
+
+    return adapter
+
+
+def make_session(adapter, **kwargs):
+    session = BitexSession(**kwargs)
+    session.trust_env = False
+    adapter.install(session)
+    return session
+
+
+def test_identical_bodies_are_unchanged_and_share_parsed_results(adapter, replies):
+    changes = ChangeDetector()
+    session = make_session(adapter, changes=changes)
+    replies.extend([b'{"ts": 1, "bid": "1"}'] * 2 + [b'{"ts": 2, "bid": "2"}'])
+
+    first = session.get("http://uberex.com/ticker")
+    assert not first.unchanged
+    data = first.json()
+    assert first.json() is data
+
+    second = session.get("http://uberex.com/ticker")
+    assert second.unchanged and second.json() is data
+
+    third = session.get("http://uberex.com/ticker")
+    assert not third.unchanged and third.json() == {"ts": 2, "bid": "2"}
+    assert changes.stats() == {"urls": 1, "changed": 2, "unchanged": 1, "not_modified": 0}
+
+
+def test_formatters_are_not_recomputed_for_unchanged_bodies(adapter, replies):
+    adapter.plugins = {None: {"Response": TickerResponse}}
+    session = make_session(adapter, changes=ChangeDetector())
+    replies.extend([b'{"ts": 1, "bid": "1"}'] * 3)
+
+    calls = TickerResponse.calls
+    triples = [session.get("http://uberex.com/ticker").triples() for _ in range(3)]
+    assert triples == [[(1, "bid", "1")]] * 3
+    assert TickerResponse.calls == calls + 1
+
+
+def test_urls_are_compared_separately_and_forgotten_lru(adapter, replies):
+    changes = ChangeDetector(max_urls=1)
+    session = make_session(adapter, changes=changes)
+    replies.extend([b"{}"] * 3 + [Reply(500, b"{}"), b"{}"])
+
+    assert not session.get("http://uberex.com/a").unchanged
+    assert not session.get("http://uberex.com/b").unchanged
+    assert not session.get("http://uberex.com/a").unchanged
+    assert not session.get("http://uberex.com/a").unchanged
+    assert session.get("http://uberex.com/a").unchanged
+    assert changes.stats()["urls"] == 1
+
+
+def test_conditional_requests_restore_the_previous_body(adapter, replies):
+    changes = ChangeDetector()
+    session = make_session(adapter, changes=changes, retention=RetentionPolicy())
+    replies.extend(
+        [
+            Reply(200, b'{"bid": "1"}', {"ETag": '"v1"', "Last-Modified": "Tue, 1 Jan 2030"}),
+            Reply(304, b""),
+            Reply(200, b'{"bid": "2"}'),
+            Reply(200, b'{"bid": "2"}'),
+        ]
+    )
+
+    assert session.get("http://uberex.com/ticker").json() == {"bid": "1"}
+    response = session.get("http://uberex.com/ticker")
+    request = adapter.requests_seen[-1]
+    assert request.headers["If-None-Match"] == '"v1"'
+    assert request.headers["If-Modified-Since"] == "Tue, 1 Jan 2030"
+    assert (response.status_code, response.unchanged) == (200, True)
+    assert response.headers["ETag"] == '"v1"'
+    assert response.json() == {"bid": "1"} and response.released
+
+    session.get("http://uberex.com/ticker", headers={"If-None-Match": '"v0"'})
+    assert adapter.requests_seen[-1].headers["If-None-Match"] == '"v0"'
+    assert "If-Modified-Since" not in adapter.requests_seen[-1].headers
+
+    # The last response had no validators, so the next request is unconditional.
+    assert session.get("http://uberex.com/ticker").unchanged
+    assert "If-None-Match" not in adapter.requests_seen[-1].headers
+    assert changes.stats() == {"urls": 1, "changed": 2, "unchanged": 2, "not_modified": 1}
+
+
+def test_conditional_requests_can_be_disabled(adapter, replies):
+    session = make_session(adapter, changes=ChangeDetector(conditional=False))
+    replies.extend([Reply(200, b"{}", {"ETag": '"v1"'})] * 2)
+    session.get("http://uberex.com/ticker")
+    assert session.get("http://uberex.com/ticker").unchanged
+    assert "If-None-Match" not in adapter.requests_seen[-1].headers
+
+
+def test_responses_are_not_memoized_without_a_detector(adapter, replies):
+    session = make_session(adapter)
+    replies.extend([b"{}"] * 2)
+    response = session.get("http://uberex.com/ticker")
+    assert response.json() is not response.json()
+    assert not session.get("http://uberex.com/ticker").unchanged
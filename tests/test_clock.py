@@ -0,0 +1,77 @@
+# Built-in
+import datetime
+from unittest import mock
+
+# Third-party
+import pytest
+
+# Home-brew
+from bitex.auth import BitexAuth
+from bitex.clock import ClockSync, ServerTimeEndpoint
+from bitex.exceptions import MissingPlugin
+from bitex.response import BitexResponse
+
+
+def test_first_sample_sets_offset_and_rtt():
+    clock = ClockSync()
+    estimate = clock.add_sample("uberex", sent=100.0, server_time=105.5, received=101.0)
+    assert (estimate.offset, estimate.rtt) == (5.0, 1.0)
+    assert clock.offset("unknown") == 0.0 and clock.rtt("unknown") is None
+
+
+def test_estimate_converges_to_the_lowest_rtt_sample():
+    clock = ClockSync(window=4, alpha=0.5)
+    clock.add_sample("uberex", 0.0, 5.0, 0.2)  # rtt 0.2, offset 4.9
+    # Slow samples with an asymmetric delay are outweighed by the fast one.
+    for i in range(3):
+        clock.add_sample("uberex", 10.0, 17.0, 12.0)  # rtt 2.0, offset 6.0
+    assert clock.offset("uberex") == pytest.approx(4.9)
+    assert clock.rtt("uberex") > 0.2
+
+
+def test_now_latency_and_auth_timestamps_are_corrected():
+    clock = ClockSync(clock=lambda: 1000.0)
+    clock.add_sample("uberex", 99.0, 102.0, 101.0)
+    assert clock.now("uberex") == 1002.0
+    assert clock.latency("uberex", server_time=1001.5) == 0.5
+
+    auth = BitexAuth("key", "secret")
+    assert auth.timestamp("uberex") != 1002.0
+    auth.clock = clock
+    assert auth.timestamp("uberex") == 1002.0
+
+
+def test_observe_uses_the_date_header_of_responses():
+    clock = ClockSync()
+    response = BitexResponse()
+    response.request = mock.Mock(exchange="uberex")
+    response.headers["Date"] = "Mon, 01 Jun 2020 00:00:10 GMT"
+    response.elapsed = datetime.timedelta(seconds=0.2)
+    received = datetime.datetime(2020, 6, 1, 0, 0, 0, 100000, tzinfo=datetime.timezone.utc)
+    response.received = str(received.timestamp())
+    clock.observe(response)
+    # 00:00:10.5 (middle of the second) minus 00:00:00 (midpoint of the request).
+    assert clock.offset("uberex") == pytest.approx(10.5)
+    assert clock.received(response) == pytest.approx(received.timestamp() + 10.5)
+
+
+def test_sync_queries_the_announced_server_time_endpoint():
+    class ServerTime(ServerTimeEndpoint):
+        def request(self, session):
+            return mock.Mock()
+
+        def server_time(self, response):
+            return 2000.0
+
+    times = iter([100.0, 100.2, 100.3, 100.4])
+    clock = ClockSync(clock=lambda: next(times))
+    with mock.patch("bitex.plugins.list_loaded_server_time", return_value={}):
+        with pytest.raises(MissingPlugin):
+            clock.sync(None, "uberex")
+    endpoints = {"uberex": ServerTime()}
+    with mock.patch("bitex.plugins.list_loaded_server_time", return_value=endpoints):
+        estimate = clock.sync(None, "uberex", samples=2)
+    assert estimate.samples == 2
+    # The second sample has the lower rtt; the estimate moves 30% towards it.
+    first, second = 2000.0005 - 100.1, 2000.0005 - 100.35
+    assert estimate.offset == pytest.approx(first + 0.3 * (second - first))
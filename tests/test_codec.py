@@ -0,0 +1,82 @@
+# Built-in
+from decimal import Decimal
+
+# Third-party
+import pytest
+
+# Home-brew
+from bitex import codec as codec_module
+from bitex.codec import CODECS, JSONCodec, OrjsonCodec, get_codec, register_codec, set_default_codec
+
+DOCUMENT = b'{"price": 3809.10, "size": 1, "pair": "BTCUSD"}'
+
+AVAILABLE = [JSONCodec]
+if codec_module.orjson is not None:
+    AVAILABLE.append(OrjsonCodec)
+
+
+@pytest.mark.parametrize("codec_class", AVAILABLE)
+@pytest.mark.parametrize(
+    "numbers, expected",
+    argvalues=[
+        ("native", {"price": 3809.1, "size": 1, "pair": "BTCUSD"}),
+        ("str", {"price": "3809.10", "size": "1", "pair": "BTCUSD"}),
+        ("decimal", {"price": Decimal("3809.10"), "size": 1, "pair": "BTCUSD"}),
+    ],
+)
+def test_codecs_decode_numbers_according_to_their_number_mode(codec_class, numbers, expected):
+    decoded = codec_class(numbers).loads(DOCUMENT)
+    assert decoded == expected
+    assert [type(v) for v in decoded.values()] == [type(v) for v in expected.values()]
+
+
+@pytest.mark.parametrize("codec_class", AVAILABLE)
+def test_codecs_encode_to_utf8_bytes_and_decimals_as_strings(codec_class):
+    encoded = codec_class().dumps({"price": Decimal("1.10"), "pair": "€"})
+    assert isinstance(encoded, bytes)
+    assert JSONCodec().loads(encoded) == {"price": "1.10", "pair": "€"}
+
+
+@pytest.mark.parametrize("codec_class", AVAILABLE)
+def test_codecs_encode_non_string_keys_as_strings(codec_class):
+    encoded = codec_class().dumps({1: "a", "nested": [{2.5: "b"}]})
+    assert JSONCodec().loads(encoded) == {"1": "a", "nested": [{"2.5": "b"}]}
+
+
+@pytest.mark.parametrize("codec_class", AVAILABLE)
+@pytest.mark.parametrize("value", [float("nan"), float("inf"), -float("inf")])
+def test_codecs_reject_non_finite_floats(codec_class, value):
+    with pytest.raises(ValueError):
+        codec_class().dumps({"orders": [{"price": value}]})
+
+
+def test_invalid_number_modes_raise_value_error():
+    with pytest.raises(ValueError):
+        JSONCodec("float")
+
+
+def test_get_codec_caches_instances_and_honours_the_default():
+    assert get_codec("json", "str") is get_codec("json", "str")
+    assert get_codec().name == next(iter(CODECS))
+    try:
+        set_default_codec("json")
+        assert type(get_codec()) is JSONCodec
+    finally:
+        set_default_codec(None)
+    with pytest.raises(KeyError):
+        set_default_codec("unknown")
+
+
+def test_register_codec_can_prefer_a_codec():
+    class CustomCodec(JSONCodec):
+        name = "custom"
+
+    original = dict(CODECS)
+    try:
+        register_codec(CustomCodec, preferred=True)
+        assert next(iter(CODECS)) == "custom"
+        assert isinstance(get_codec(), CustomCodec)
+    finally:
+        CODECS.clear()
+        CODECS.update(original)
+        codec_module._instances.clear()
@@ -0,0 +1,89 @@
+# Built-in
+import time
+
+# Third-party
+import pytest
+
+# Home-brew
+from bitex.collector import CollectorResult, ShardedCollector
+
+
+class DummyResponse:
+    status_code = 200
+
+    def __init__(self, exchange, pair):
+        self.exchange = exchange
+        self.pair = pair
+
+    def key_value_dict(self):
+        return {"pair": self.pair, "bid": "1"}
+
+
+class DummySession:
+    def ticker(self, exchange, pair, **kwargs):
+        return DummyResponse(exchange, pair)
+
+
+@pytest.fixture
+def collector():
+    collector = ShardedCollector(
+        DummySession, processes=2, threads=1, start_method="fork", monitor_interval=0.05
+    )
+    yield collector
+    collector.stop()
+
+
+def test_jobs_are_sharded_across_workers_by_request_rate(collector):
+    collector.add_job("ex", "A", "ticker", interval=0.05)
+    collector.add_job("ex", "B", "ticker", interval=0.05)
+    collector.add_job("ex", "C", "ticker", interval=0.1)
+    collector.start()
+    assert sorted(len(worker.jobs) for worker in collector._workers) == [1, 2]
+    with pytest.raises(ValueError):
+        collector.add_job("ex", "A", "ticker", interval=1)
+
+
+def test_workers_funnel_formatted_results_back(collector):
+    collector.add_job("ex", "A", "ticker", interval=0.05)
+    collector.start()
+    result = collector.get(timeout=5)
+    assert isinstance(result, CollectorResult)
+    assert (result.exchange, result.pair, result.endpoint) == ("ex", "A", "ticker")
+    assert result.status_code == 200
+    assert result.payload == {"pair": "A", "bid": "1"}
+    stats = collector.throughput()
+    assert sum(worker["results"] for worker in stats.values()) >= 1
+
+
+def test_dead_workers_are_respawned_with_their_jobs(collector):
+    collector.add_job("ex", "A", "ticker", interval=0.05)
+    collector.add_job("ex", "B", "ticker", interval=0.05)
+    collector.start()
+    victim = next(worker for worker in collector._workers if worker.jobs)
+    victim.process.terminate()
+    victim.process.join()
+    deadline = time.monotonic() + 5
+    while victim in collector._workers and time.monotonic() < deadline:
+        time.sleep(0.05)
+    replacement = next(worker for worker in collector._workers if worker.id == victim.id)
+    assert replacement is not victim
+    assert replacement.jobs == victim.jobs
+    assert collector.throughput()[victim.id]["alive"] is True
+
+
+def test_jobs_cannot_be_added_while_all_workers_are_dead():
+    collector = ShardedCollector(
+        DummySession, processes=1, threads=1, start_method="fork", monitor_interval=60
+    )
+    collector.start()
+    try:
+        (worker,) = collector._workers
+        worker.process.terminate()
+        worker.process.join()
+        with pytest.raises(RuntimeError):
+            collector.add_job("ex", "A", "ticker", interval=0.05)
+        collector.rebalance()
+        collector.add_job("ex", "A", "ticker", interval=0.05)
+        assert collector.get(timeout=5).pair == "A"
+    finally:
+        collector.stop()
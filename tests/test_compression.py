@@ -0,0 +1,82 @@
+# Built-in
+import gzip
+import io
+import json
+from unittest import mock
+
+# Third-party
+import pytest
+from urllib3.response import HTTPResponse
+
+# Home-brew
+from bitex.adapter import BitexHTTPAdapter
+from bitex.compression import ENCODINGS, Compression, available_encodings
+from bitex.request import BitexPreparedRequest, BitexRequest
+from bitex.session import BitexSession
+
+PAYLOAD = json.dumps({"bids": [["9500.1", "1.5"]] * 500}).encode()
+
+
+def raw_response(body, encoding=None):
+    headers = {"Content-Encoding": encoding} if encoding else {}
+    return HTTPResponse(
+        body=io.BytesIO(body), headers=headers, status=200, preload_content=False
+    )
+
+
+def test_available_encodings_are_ordered_by_preference():
+    available = available_encodings()
+    assert available[-2:] == ["gzip", "deflate"]
+    assert available == [e for e in ENCODINGS if e in available]
+
+
+def test_accept_encoding_is_negotiated_per_exchange():
+    compression = Compression(preferences={"uberex": ["snappy", "gzip"], "plainex": []})
+    assert compression.accept_encoding("uberex") == "gzip"
+    assert compression.accept_encoding("plainex") == "identity"
+    assert compression.accept_encoding("other") == ", ".join(available_encodings())
+    assert Compression(default=["deflate"]).accept_encoding("other") == "deflate"
+
+
+def test_decoding_is_instrumented():
+    ticks = iter(range(1000))
+    compression = Compression(clock=lambda: next(ticks))
+    request = BitexPreparedRequest("uberex")
+    request.prepare(method="GET", url="http://uberex.com/book")
+    request.compression = compression
+    compressed = gzip.compress(PAYLOAD)
+
+    response = BitexHTTPAdapter().build_response(request, raw_response(compressed, "gzip"))
+    assert response.content == PAYLOAD
+    stats = compression.stats()["uberex"]
+    assert stats["responses"] == 1 and stats["encodings"] == {"gzip": 1}
+    assert stats["wire_bytes"] == len(compressed)
+    assert stats["decoded_bytes"] == len(PAYLOAD)
+    assert stats["ratio"] == pytest.approx(len(PAYLOAD) / len(compressed))
+    assert stats["decode_seconds"] > 0
+
+    BitexHTTPAdapter().build_response(request, raw_response(PAYLOAD)).content
+    stats = compression.stats()["uberex"]
+    assert stats["encodings"] == {"gzip": 1, "identity": 1}
+    assert stats["wire_bytes"] == len(compressed)
+
+
+@mock.patch("bitex.session.list_loaded_plugins", return_value={})
+class TestSessionCompression:
+
+    def test_accept_encoding_is_set_unless_given_explicitly(self, _):
+        session = BitexSession(compression=Compression(default=["gzip"]))
+        prep = session.prepare_request(BitexRequest(method="GET", url="http://uberex.com"))
+        assert prep.headers["Accept-Encoding"] == "gzip"
+        assert prep.compression is session.compression
+
+        request = BitexRequest(
+            method="GET", url="http://uberex.com", headers={"accept-encoding": "br"}
+        )
+        assert session.prepare_request(request).headers["Accept-Encoding"] == "br"
+
+    def test_requests_are_unchanged_without_compression(self, _):
+        session = BitexSession()
+        prep = session.prepare_request(BitexRequest(method="GET", url="http://uberex.com"))
+        assert prep.headers["Accept-Encoding"] == session.headers["Accept-Encoding"]
+        assert prep.compression is None
@@ -0,0 +1,165 @@
+# Built-in
+from unittest import mock
+
+# Third-party
+import pytest
+from requests.adapters import HTTPAdapter
+from requests.auth import HTTPBasicAuth
+from requests.exceptions import ReadTimeout
+
+# Home-brew
+from bitex.auth import BitexAuth
+from bitex.deadline import Deadline, DeadlineAuth
+from bitex.exceptions import DeadlineExceeded
+from bitex.response import BitexResponse
+from bitex.session import BitexSession
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_coerce_creates_deadlines_from_seconds():
+    assert Deadline.coerce(None) is None
+    deadline = Deadline(1.0)
+    assert Deadline.coerce(deadline) is deadline
+    assert 1.5 < Deadline.coerce(2.0).remaining() <= 2.0
+
+
+def test_check_raises_once_expired():
+    clock = FakeClock()
+    deadline = Deadline(1.0, clock=clock)
+    assert deadline.check("prepare") == 1.0
+    clock.now = 1.0
+    assert deadline.expired
+    with pytest.raises(DeadlineExceeded, match="Deadline exceeded during 'send'!") as e:
+        deadline.check("send")
+    assert e.value.stage == "send"
+    assert isinstance(e.value, TimeoutError)
+
+
+def test_nested_stages_account_time_exclusively():
+    clock = FakeClock()
+    deadline = Deadline(10.0, clock=clock)
+    with deadline.stage("prepare"):
+        clock.now += 1.0
+        with deadline.stage("sign"):
+            clock.now += 2.0
+        clock.now += 0.5
+    with deadline.stage("sign"):
+        clock.now += 1.0
+    assert deadline.stages == {"prepare": 1.5, "sign": 3.0}
+
+
+def test_stages_of_concurrent_requests_are_tracked_per_thread():
+    import threading
+
+    clock = FakeClock()
+    deadline = Deadline(10.0, clock=clock)
+    entered, left = threading.Event(), threading.Event()
+
+    def other_request():
+        with deadline.stage("read"):
+            entered.set()
+            left.wait(5)
+            clock.now += 2.0
+
+    with deadline.stage("send"):
+        clock.now += 0.5
+        thread = threading.Thread(target=other_request)
+        thread.start()
+        entered.wait(5)
+        clock.now += 1.0
+        # The other thread's stage was entered later, but is left first.
+        left.set()
+        thread.join()
+    # Neither stage is nested in the other.
+    assert deadline.stages == {"read": 3.0, "send": 3.5}
+    assert deadline._active == []
+
+
+def test_errors_after_expiry_are_raised_as_deadline_exceeded():
+    clock = FakeClock()
+    deadline = Deadline(1.0, clock=clock)
+    with pytest.raises(DeadlineExceeded) as e:
+        with deadline.stage("read"):
+            clock.now = 2.0
+            raise ReadTimeout()
+    assert e.value.stage == "read"
+    assert e.value.stages == {"read": 2.0}
+    assert "read=2.000s" in str(e.value)
+
+    # Errors within the deadline are raised as they are.
+    deadline = Deadline(1.0, clock=clock)
+    with pytest.raises(ValueError):
+        with deadline.stage("read"):
+            raise ValueError()
+
+
+@pytest.mark.parametrize(
+    "timeout, expected",
+    [(None, 2.0), (1.0, 1.0), (5.0, 2.0), ((1.0, 5.0), (1.0, 2.0)), ((None, 1.0), (2.0, 1.0))],
+)
+def test_clamp_limits_timeouts_to_the_remaining_time(timeout, expected):
+    assert Deadline(2.0, clock=FakeClock()).clamp(timeout) == expected
+
+
+def test_deadline_auth_accounts_signing_time():
+    clock = FakeClock()
+    deadline = Deadline(1.0, clock=clock)
+
+    def sign(request):
+        clock.now += 0.25
+        return request
+
+    request = mock.Mock()
+    assert DeadlineAuth(sign, deadline)(request) is request
+    assert deadline.stages == {"sign": 0.25}
+    assert isinstance(DeadlineAuth(("user", "pw"), deadline).auth, HTTPBasicAuth)
+
+
+class SlowAuth(BitexAuth):
+    def __init__(self, clock, seconds):
+        super(SlowAuth, self).__init__("key", "secret")
+        self.fake_clock = clock
+        self.seconds = seconds
+
+    def __call__(self, request):
+        self.fake_clock.now += self.seconds
+        return request
+
+
+@mock.patch.object(HTTPAdapter, "send")
+class TestSessionDeadlines:
+
+    def test_timeout_is_clamped_and_stages_are_recorded(self, mock_send):
+        mock_send.return_value = BitexResponse()
+        clock = FakeClock()
+        session = BitexSession(auth=SlowAuth(clock, 0.5))
+        deadline = Deadline(2.0, clock=clock)
+        session.request("GET", "http://test.com", timeout=(5.0, 1.0), deadline=deadline)
+
+        request = mock_send.call_args[0][0]
+        assert request.deadline is deadline
+        assert mock_send.call_args[1]["timeout"] == (1.5, 1.0)
+        assert set(deadline.stages) == {"prepare", "sign", "read", "send"}
+        assert deadline.stages["sign"] == 0.5
+
+    def test_expiry_during_signing_prevents_sending(self, mock_send):
+        clock = FakeClock()
+        session = BitexSession(auth=SlowAuth(clock, 3.0))
+        with pytest.raises(DeadlineExceeded) as e:
+            session.request("GET", "http://test.com", deadline=Deadline(2.0, clock=clock))
+        mock_send.assert_not_called()
+        assert e.value.stage == "read"
+        assert max(e.value.stages, key=e.value.stages.get) == "sign"
+
+    def test_requests_without_deadline_are_unaffected(self, mock_send):
+        mock_send.return_value = BitexResponse()
+        BitexSession().request("GET", "http://test.com", timeout=5.0)
+        assert mock_send.call_args[0][0].deadline is None
+        assert mock_send.call_args[1]["timeout"] == 5.0
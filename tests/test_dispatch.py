@@ -0,0 +1,85 @@
+# Built-in
+import threading
+from unittest import mock
+
+# Third-party
+import pytest
+
+# Home-brew
+from bitex.dispatch import CANCEL, NEW_ORDER, PUBLIC, RequestDispatcher
+
+
+class Gate:
+    """Blocks requests until released, and records the order they ran in."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.started = threading.Semaphore(0)
+        self.order = []
+
+    def __call__(self, name):
+        self.order.append(name)
+        self.started.release()
+        self.release.wait(5)
+        return name
+
+
+def test_higher_priority_requests_are_dispatched_first():
+    gate = Gate()
+    with RequestDispatcher(mock.Mock(), slots=1, reserved=0, aging=None) as dispatcher:
+        first = dispatcher.submit(PUBLIC, "uberex", gate, "blocker")
+        assert gate.started.acquire(timeout=5)
+        futures = [dispatcher.submit(PUBLIC, "uberex", gate, f"book{i}") for i in range(3)]
+        futures.append(dispatcher.submit(NEW_ORDER, "uberex", gate, "new"))
+        futures.append(dispatcher.submit(CANCEL, "uberex", gate, "cancel"))
+        assert dispatcher.pending("uberex") == {
+            "cancel": 1, "new_order": 1, "private": 0, "public": 3
+        }
+        gate.release.set()
+        assert [f.result(5) for f in [first] + futures][-1] == "cancel"
+    assert gate.order == ["blocker", "cancel", "new", "book0", "book1", "book2"]
+    stats = dispatcher.stats()
+    assert stats["public"]["count"] == 4 and stats["cancel"]["count"] == 1
+
+
+def test_reserved_slots_keep_capacity_for_orders():
+    gate = Gate()
+    with RequestDispatcher(mock.Mock(), slots=2, reserved=1) as dispatcher:
+        books = [dispatcher.submit(PUBLIC, "uberex", gate, f"book{i}") for i in range(2)]
+        assert gate.started.acquire(timeout=5)
+        cancel = dispatcher.submit(CANCEL, "uberex", gate, "cancel")
+        # The cancel runs alongside the first book, while the second book waits.
+        assert gate.started.acquire(timeout=5)
+        assert gate.order == ["book0", "cancel"]
+        gate.release.set()
+        assert cancel.result(5) == "cancel"
+        assert [f.result(5) for f in books] == ["book0", "book1"]
+
+
+def test_aging_prevents_starvation():
+    now = [0.0]
+    gate = Gate()
+    with RequestDispatcher(
+        mock.Mock(), slots=1, reserved=0, aging=1.0, clock=lambda: now[0]
+    ) as dispatcher:
+        dispatcher.submit(PUBLIC, "uberex", gate, "blocker")
+        assert gate.started.acquire(timeout=5)
+        dispatcher.submit(PUBLIC, "uberex", gate, "old-book")
+        now[0] = 10.0
+        dispatcher.submit(CANCEL, "uberex", gate, "cancel")
+        gate.release.set()
+    assert gate.order == ["blocker", "old-book", "cancel"]
+
+
+def test_call_uses_the_endpoint_priority_and_close_cancels_pending_requests():
+    session = mock.Mock()
+    session.cancel_order.return_value = "cancelled"
+    dispatcher = RequestDispatcher(session)
+    assert dispatcher.call("cancel_order", "uberex", "BTCUSD").result(5) == "cancelled"
+    session.cancel_order.assert_called_once_with("uberex", "BTCUSD")
+    assert dispatcher.stats()["cancel"]["count"] == 1
+    dispatcher.close()
+    with pytest.raises(RuntimeError):
+        dispatcher.call("ticker", "uberex", "BTCUSD")
+    with pytest.raises(ValueError):
+        RequestDispatcher(session).submit(42, "uberex", print)
@@ -0,0 +1,129 @@
+# Built-in
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Third-party
+import pytest
+
+# Home-brew
+from bitex.adapter import BitexHTTPAdapter
+from bitex.dns import DNSCache, HostEntry
+from bitex.session import BitexSession
+
+
+class StubResolver:
+    def __init__(self, addresses, ttl=60.0):
+        self.addresses = addresses
+        self.ttl = ttl
+        self.calls = []
+
+    def __call__(self, host, port):
+        self.calls.append((host, port))
+        return self.addresses, self.ttl
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def local_server():
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"{}")
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class TestDNSCache:
+    def test_hosts_are_resolved_once(self):
+        resolver = StubResolver(["10.0.0.1"])
+        cache = DNSCache(resolver=resolver, prober=None)
+        assert cache.addresses("exchange.test", 443) == ["10.0.0.1"]
+        assert cache.addresses("exchange.test", 443) == ["10.0.0.1"]
+        assert resolver.calls == [("exchange.test", 443)]
+        cache.close()
+
+    def test_resolver_ttl_takes_precedence_over_the_default_ttl(self):
+        clock = FakeClock()
+        cache = DNSCache(resolver=StubResolver(["10.0.0.1"], ttl=10), ttl=300, clock=clock)
+        entry = cache.resolve("exchange.test", 443, probe=False)
+        assert entry.expires == 10
+        assert entry.refresh_at == 8
+
+    def test_expired_entries_are_served_for_at_most_max_stale_seconds(self):
+        clock = FakeClock()
+        resolver = StubResolver(["10.0.0.1"], ttl=10)
+        cache = DNSCache(resolver=resolver, prober=None, max_stale=5, clock=clock)
+        cache._start = lambda: None
+        assert cache.addresses("exchange.test", 443) == ["10.0.0.1"]
+
+        def failing(host, port):
+            raise OSError("resolver down")
+
+        cache.resolver = failing
+        clock.now = 15
+        assert cache.addresses("exchange.test", 443) == ["10.0.0.1"]
+        clock.now = 15.1
+        with pytest.raises(OSError):
+            cache.addresses("exchange.test", 443)
+
+        cache.resolver = StubResolver(["10.0.0.2"], ttl=10)
+        assert cache.addresses("exchange.test", 443) == ["10.0.0.2"]
+        assert cache.entry("exchange.test", 443).expires == 25.1
+
+    def test_addresses_are_ordered_by_probed_latency(self):
+        latencies = {"10.0.0.1": 0.3, "10.0.0.2": 0.1}
+
+        def prober(address, port, timeout):
+            if address == "10.0.0.3":
+                raise OSError("unreachable")
+            return latencies[address]
+
+        cache = DNSCache(resolver=StubResolver(["10.0.0.1", "10.0.0.2", "10.0.0.3"]), prober=prober)
+        entry = cache.resolve("exchange.test", 443)
+        assert entry.addresses == ["10.0.0.2", "10.0.0.1", "10.0.0.3"]
+
+    def test_latency_reports_are_smoothed_and_reorder_addresses(self):
+        cache = DNSCache(prober=None)
+        entry = HostEntry(["a", "b"], expires=10, refresh_at=8)
+        cache.report_latency(entry, "a", 1.0)
+        cache.report_latency(entry, "b", 0.5)
+        assert entry.addresses == ["b", "a"]
+        cache.report_latency(entry, "b", 2.0)
+        assert entry.latencies["b"] == pytest.approx(0.95)
+        assert entry.addresses == ["b", "a"]
+        cache.report_latency(entry, "b", float("inf"))
+        assert entry.addresses == ["a", "b"]
+
+
+def test_adapter_connects_to_cached_addresses_and_skips_dead_ones(local_server):
+    port = local_server.server_address[1]
+    # 127.0.0.2 is part of the loopback range, but nobody listens there.
+    resolver = StubResolver(["127.0.0.2", "127.0.0.1"])
+    cache = DNSCache(resolver=resolver, prober=None, fallback_timeout=0.5)
+    session = BitexSession()
+    session.mount("http://", BitexHTTPAdapter(dns_cache=cache))
+    try:
+        response = session.get(f"http://exchange.test:{port}/ticker")
+        assert response.status_code == 200
+        assert resolver.calls == [("exchange.test", port)]
+        entry = cache.entry("exchange.test", port)
+        assert entry.addresses == ["127.0.0.1", "127.0.0.2"]
+    finally:
+        session.close()
+        cache.close()
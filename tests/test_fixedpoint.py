@@ -0,0 +1,97 @@
+# Built-in
+from array import array
+from decimal import Decimal
+
+# Third-party
+import pytest
+
+# Home-brew
+from bitex.fixedpoint import (
+    add,
+    fits_int64,
+    is_number,
+    multiply,
+    parse_many,
+    rescale,
+    to_decimal,
+    to_scaled,
+    to_str,
+)
+
+
+@pytest.mark.parametrize(
+    "value, scale, expected",
+    [
+        ("3809.10", 2, 380910),
+        ("3809.1", 2, 380910),
+        ("3809", 2, 380900),
+        ("-0.5", 1, -5),
+        (".25", 2, 25),
+        ("0.10000000", 1, 1),
+        ("1e-5", 8, 1000),
+        (0.1, 8, 10000000),
+        (Decimal("1.23"), 2, 123),
+        (42, 3, 42000),
+    ],
+)
+def test_to_scaled_converts_values_exactly(value, scale, expected):
+    assert to_scaled(value, scale) == expected
+
+
+@pytest.mark.parametrize(
+    "value", ["0.123", "1.5e-3", "abc", "1_000.5", " 1.5", "1.5\n", "+", ".", "NaN", float("inf")]
+)
+def test_to_scaled_raises_value_error_on_precision_loss_or_invalid_input(value):
+    with pytest.raises(ValueError):
+        to_scaled(value, 2)
+
+
+def test_parse_many_returns_int64_array():
+    result = parse_many(["1.5", "2.25", "0"], 2)
+    assert result == array("q", [150, 225, 0])
+    with pytest.raises(OverflowError):
+        parse_many(["1" * 20], 0)
+
+
+def test_conversion_back_to_decimal_and_str_is_exact():
+    assert to_decimal(380910, 2) == Decimal("3809.10")
+    assert to_str(380910, 2) == "3809.10"
+    assert to_str(-5, 3) == "-0.005"
+    assert to_str(7, 0) == "7"
+
+
+def test_arithmetic_helpers_are_exact():
+    assert rescale(15, 1, 3) == 1500
+    assert rescale(1500, 3, 1) == 15
+    with pytest.raises(ValueError):
+        rescale(1501, 3, 1)
+    assert add(15, 1, 25, 2) == (175, 2)
+    # 0.1 * 0.2 == 0.02
+    assert multiply(1, 1, 2, 1) == (2, 2)
+    assert fits_int64(2 ** 63 - 1) and not fits_int64(2 ** 63)
+
+
+def test_to_scaled_rejects_negative_scales():
+    with pytest.raises(ValueError):
+        to_scaled(5, -1)
+    with pytest.raises(ValueError):
+        to_scaled("5", -1)
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("3809.10", True),
+        ("-1e-5", True),
+        (42, True),
+        (Decimal("1.5"), True),
+        (True, False),
+        (float("nan"), False),
+        (Decimal("Infinity"), False),
+        ("1_000", False),
+        ("BTCUSD", False),
+        (None, False),
+    ],
+)
+def test_is_number(value, expected):
+    assert is_number(value) is expected
@@ -0,0 +1,124 @@
+# Built-in
+import math
+from array import array
+from unittest import mock
+
+# Third-party
+import pytest
+
+# Home-brew
+from bitex.frame import Column, FrameBuilder, infer_kind
+from bitex.response import BitexResponse
+
+
+@pytest.mark.parametrize(
+    "values, parse_numbers, expected",
+    [
+        ([1, 2], True, "int"),
+        ([1, 2.5], True, "float"),
+        ([1, None], True, "float"),
+        (["1", "2"], True, "int"),
+        (["1", "2.5"], True, "float"),
+        (["1", "2.5"], False, "object"),
+        ([True, False], True, "bool"),
+        ([True, None], True, "object"),
+        ([1, "BTCUSD"], True, "object"),
+        ([None], True, "float"),
+    ],
+)
+def test_infer_kind(values, parse_numbers, expected):
+    assert infer_kind(values, parse_numbers) == expected
+
+
+def test_columns_are_widened_when_values_do_not_fit():
+    column = Column("int")
+    column.append(1)
+    column.append("2")
+    assert (column.kind, column.data) == ("int", array("q", [1, 2]))
+    column.append("2.5")
+    assert (column.kind, column.data) == ("float", array("d", [1, 2, 2.5]))
+    column.append(None)
+    assert math.isnan(column.data[-1])
+    column.append("n/a")
+    assert column.kind == "object" and column.data[:3] == [1.0, 2.0, 2.5]
+    assert column.data[-1] == "n/a" and len(column) == 5
+
+    column = Column("bool")
+    column.append(True)
+    column.append(None)
+    assert (column.kind, column.data) == ("object", [True, None])
+
+    with pytest.raises(ValueError, match="Unknown column type"):
+        Column("decimal")
+
+
+def test_types_are_inferred_from_the_first_rows():
+    builder = FrameBuilder(batch_rows=2)
+    builder.append({"pair": "BTCUSD", "bid": "9500.1", "timestamp": 1})
+    assert len(builder) == 1 and not builder.columns
+    builder.append({"pair": "ETHUSD", "bid": "200", "timestamp": 2})
+    assert builder.schema == {"pair": "object", "bid": "float", "timestamp": "int"}
+
+    builder.append({"pair": "XRPUSD", "timestamp": 3, "halted": True})
+    assert len(builder) == 3
+    columns = builder.to_columns()
+    assert list(columns) == ["pair", "bid", "timestamp", "halted"]
+    assert columns["pair"] == ["BTCUSD", "ETHUSD", "XRPUSD"]
+    assert columns["bid"][:2] == array("d", [9500.1, 200.0]) and math.isnan(columns["bid"][2])
+    assert columns["timestamp"] == array("q", [1, 2, 3])
+    assert columns["halted"] == [None, None, True]
+
+
+def test_schema_overrides_inference():
+    builder = FrameBuilder(schema={"timestamp": "float", "bid": "object"}, parse_numbers=False)
+    builder.extend([{"timestamp": 1, "bid": "9500.1", "ask": "9500.2"}])
+    assert builder.schema == {"timestamp": "float", "bid": "object", "ask": "object"}
+    assert builder.to_columns()["timestamp"] == array("d", [1.0])
+
+
+def test_responses_are_appended_via_their_formatters():
+    response = mock.Mock(spec=BitexResponse)
+    response.key_value_dict.return_value = {"pair": "BTCUSD", "bid": "9500.1"}
+    response.triples.return_value = [
+        (1, "pair", "BTCUSD"), (1, "bid", "9500.1"), (2, "pair", "BTCUSD"), (2, "bid", "9500.2")
+    ]
+    builder = FrameBuilder()
+    builder.append_response(response)
+    builder.append_response(response, "triples")
+    response.key_value_dict.return_value = [{"pair": "ETHUSD", "bid": "200"}] * 2
+    builder.append_response(response)
+    columns = builder.to_columns()
+    assert columns["pair"] == ["BTCUSD"] * 3 + ["ETHUSD"] * 2
+    assert columns["bid"] == array("d", [9500.1, 9500.1, 9500.2, 200, 200])
+    assert columns["timestamp"][1:3] == array("d", [1, 2])
+
+    with pytest.raises(ValueError, match="Unknown formatter"):
+        builder.append_response(response, "records")
+
+
+def test_to_numpy_shares_the_buffers():
+    numpy = pytest.importorskip("numpy")
+    builder = FrameBuilder(batch_rows=1)
+    builder.extend({"ts": i, "bid": i / 2, "live": i % 2 == 0, "pair": "BTCUSD"} for i in range(4))
+    arrays = builder.to_numpy()
+    assert arrays["ts"].dtype == numpy.int64 and arrays["ts"].tolist() == [0, 1, 2, 3]
+    assert arrays["bid"].dtype == numpy.float64 and arrays["live"].dtype == numpy.bool_
+    assert arrays["pair"].dtype == object and arrays["pair"].tolist() == ["BTCUSD"] * 4
+    builder.columns["bid"].data[0] = 9.0
+    assert arrays["bid"][0] == 9.0
+
+
+def test_to_pandas():
+    pytest.importorskip("pandas")
+    builder = FrameBuilder()
+    builder.extend({"ts": i, "bid": str(i)} for i in range(3))
+    df = builder.to_pandas()
+    assert list(df.columns) == ["ts", "bid"] and df["bid"].sum() == 3.0
+
+
+def test_missing_optional_dependencies_are_reported():
+    builder = FrameBuilder()
+    with mock.patch("bitex.frame.numpy", None), pytest.raises(ImportError, match="numpy"):
+        builder.to_numpy()
+    with mock.patch("bitex.frame.pandas", None), pytest.raises(ImportError, match="pandas"):
+        builder.to_pandas()
@@ -0,0 +1,138 @@
+# Built-in
+from unittest.mock import patch
+
+# Third-party
+import pytest
+
+# Home-brew
+from bitex.request import BitexPreparedRequest
+from bitex.response import BitexResponse
+
+httpx = pytest.importorskip("httpx")
+
+# Home-brew
+from bitex.http2 import BitexHTTP2Adapter  # noqa: E402
+
+
+def make_request(url="https://bitex.com/ticker", method="GET"):
+    request = BitexPreparedRequest("TestExchange")
+    request.prepare(method=method, url=url, headers={"Connection": "keep-alive", "X-Test": "1"})
+    return request
+
+
+def make_adapter(handler):
+    return BitexHTTP2Adapter(client=httpx.Client(transport=httpx.MockTransport(handler)))
+
+
+def h2_response(status=200, **kwargs):
+    return httpx.Response(status, extensions={"http_version": b"HTTP/2"}, **kwargs)
+
+
+def test_send_builds_a_bitex_response_from_the_http2_response():
+    seen = {}
+
+    def handler(request):
+        seen["headers"] = request.headers
+        return h2_response(json={"bid": "1"}, headers={"X-Reply": "yes"})
+
+    adapter = make_adapter(handler)
+    response = adapter.send(make_request())
+    assert isinstance(response, BitexResponse)
+    assert response.status_code == 200
+    assert response.headers["X-Reply"] == "yes"
+    assert response.json() == {"bid": "1"}
+    assert seen["headers"]["X-Test"] == "1"
+    assert adapter.http1_hosts == set()
+
+
+@patch("bitex.adapter.BitexHTTPAdapter.send", return_value="HTTP/1.1 response")
+def test_hosts_negotiating_http1_are_served_via_http1_pools_from_then_on(mock_send):
+    adapter = make_adapter(lambda request: httpx.Response(200, content=b"{}"))
+    adapter.send(make_request())
+    assert adapter.http1_hosts == {"bitex.com"}
+    assert not mock_send.called
+
+    assert adapter.send(make_request()) == "HTTP/1.1 response"
+
+
+@patch("bitex.adapter.BitexHTTPAdapter.send", return_value="HTTP/1.1 response")
+def test_protocol_errors_fall_back_to_http1(mock_send):
+    def handler(request):
+        raise httpx.RemoteProtocolError("h2 not supported", request=request)
+
+    adapter = make_adapter(handler)
+    assert adapter.send(make_request()) == "HTTP/1.1 response"
+    assert adapter.http1_hosts == {"bitex.com"}
+
+
+@patch("bitex.adapter.BitexHTTPAdapter.send", return_value="HTTP/1.1 response")
+def test_protocol_errors_of_unsafe_requests_are_not_resent(mock_send):
+    from requests.exceptions import ConnectionError
+
+    def handler(request):
+        raise httpx.RemoteProtocolError("connection reset", request=request)
+
+    adapter = make_adapter(handler)
+    with pytest.raises(ConnectionError):
+        adapter.send(make_request("https://bitex.com/order", method="POST"))
+    assert not mock_send.called
+    # Subsequent requests to the host use HTTP/1.1 right away.
+    assert adapter.http1_hosts == {"bitex.com"}
+    assert adapter.send(make_request("https://bitex.com/order", method="POST")) == (
+        "HTTP/1.1 response"
+    )
+
+
+def test_timeouts_are_raised_as_requests_exceptions():
+    from requests.exceptions import ConnectTimeout, ReadTimeout
+
+    def connect_timeout(request):
+        raise httpx.ConnectTimeout("connect", request=request)
+
+    def read_timeout(request):
+        raise httpx.ReadTimeout("read", request=request)
+
+    with pytest.raises(ConnectTimeout):
+        make_adapter(connect_timeout).send(make_request(), timeout=(1, 2))
+    with pytest.raises(ReadTimeout):
+        make_adapter(read_timeout).send(make_request(), timeout=1)
+
+
+def test_requests_are_sent_with_their_own_tls_settings():
+    import ssl
+
+    def handler(request):
+        return h2_response(json={})
+
+    adapter = make_adapter(handler)
+    contexts = []
+
+    def new_client(verify):
+        contexts.append(verify)
+        return httpx.Client(transport=httpx.MockTransport(handler))
+
+    adapter._new_client = new_client
+    adapter.send(make_request())
+    assert contexts == []
+    adapter.send(make_request(), verify=False)
+    adapter.send(make_request(), verify=False)
+    (context,) = contexts
+    assert isinstance(context, ssl.SSLContext)
+    assert context.verify_mode == ssl.CERT_NONE
+    assert adapter.client_for(False) is not adapter.client
+    with pytest.raises(OSError):
+        adapter.send(make_request(), verify="/no/such/ca-bundle.pem")
+
+
+def test_cookies_set_by_responses_are_not_replayed():
+    seen = []
+
+    def handler(request):
+        seen.append(request.headers.get("Cookie"))
+        return h2_response(json={}, headers={"Set-Cookie": "session=secret; Path=/"})
+
+    adapter = make_adapter(handler)
+    adapter.send(make_request())
+    adapter.send(make_request())
+    assert seen == [None, None]
+    assert not list(adapter.client.cookies.jar)
@@ -0,0 +1,90 @@
+# Third-party
+import pytest
+
+# Home-brew
+from bitex.mapping import Field, MappedResponse, ResponseMap, parse_path
+
+TICKER = b'{"error": [], "result": {"XXBTZUSD": {"a": ["3809.4", "1"], "b": ["3809.1", "2"]}}}'
+BOOK = b'{"bids": [["3809.1", "2", 10]], "asks": [["3809.4", "1", 11], ["3810.0", "3", 12]]}'
+
+
+def response(content, mapping):
+    class Response(MappedResponse):
+        pass
+
+    Response.mapping = mapping
+    resp = Response()
+    resp._content = content
+    resp.received = "1.5"
+    return resp
+
+
+def test_parse_path_converts_indices():
+    assert parse_path("result.*.b.0") == ("result", "*", "b", 0)
+    assert parse_path("-1") == (-1,)
+    assert parse_path("") == ()
+
+
+def test_object_layout_is_mapped_to_triples_and_key_value_dict():
+    resp = response(
+        TICKER,
+        ResponseMap(
+            {
+                "bid": Field("result.*.b.0", float),
+                "ask": "result.*.a.0",
+                "last": Field("result.*.c.0", float, optional=True),
+            }
+        ),
+    )
+    assert resp.key_value_dict() == {
+        "timestamp": "1.5",
+        "bid": 3809.1,
+        "ask": "3809.4",
+        "last": None,
+        "received": "1.5",
+    }
+    assert resp.triples() == [
+        ("1.5", "bid", 3809.1),
+        ("1.5", "ask", "3809.4"),
+        ("1.5", "last", None),
+        ("1.5", "received", "1.5"),
+    ]
+
+
+def test_row_layout_with_groups_is_returned_in_columns():
+    resp = response(
+        BOOK,
+        ResponseMap(
+            {"price": Field("0", float), "size": "1"},
+            rows={"bid": "bids", "ask": "asks"},
+            timestamp="2",
+        ),
+    )
+    assert resp.key_value_dict() == {
+        "timestamp": [10, 11, 12],
+        "side": ["bid", "ask", "ask"],
+        "price": [3809.1, 3809.4, 3810.0],
+        "size": ["2", "1", "3"],
+        "received": "1.5",
+    }
+    assert resp.triples()[:3] == [(10, "side", "bid"), (10, "price", 3809.1), (10, "size", "2")]
+    assert resp.triples()[-1] == ("1.5", "received", "1.5")
+
+
+def test_missing_values_raise_unless_optional():
+    resp = response(b'{"bids": []}', ResponseMap({"price": "0"}, rows="asks"))
+    with pytest.raises(KeyError):
+        resp.key_value_dict()
+    resp = response(b"{}", ResponseMap({"price": "0"}, rows="bids"))
+    with pytest.raises(KeyError):
+        resp.triples()
+
+
+def test_mapping_without_rows_yields_empty_columns():
+    resp = response(b'{"bids": []}', ResponseMap({"price": "0"}, rows="bids"))
+    assert resp.key_value_dict() == {"timestamp": [], "price": [], "received": "1.5"}
+
+
+def test_unmapped_response_raises_not_implemented_error():
+    with pytest.raises(NotImplementedError):
+        MappedResponse().triples()
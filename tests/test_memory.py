@@ -0,0 +1,119 @@
+# Built-in
+from unittest import mock
+
+# Third-party
+import pytest
+import requests
+
+# Home-brew
+from bitex.auth import BitexAuth
+from bitex.deadline import Deadline
+from bitex.exceptions import DeadlineExceeded
+from bitex.memory import InMemoryAdapter, Reply
+from bitex.request import BitexPreparedRequest
+from bitex.response import BitexResponse
+from bitex.session import BitexSession
+from bitex.urls import URLTemplates, registry
+
+
+class UberExRequest(BitexPreparedRequest):
+    pass
+
+
+class UberExResponse(BitexResponse):
+    pass
+
+
+class UberExAuth(BitexAuth):
+    def __call__(self, request):
+        request.headers["X-Signed"] = self.key
+        return request
+
+
+PLUGINS = {
+    "uberex": {"Auth": UberExAuth, "PreparedRequest": UberExRequest, "Response": UberExResponse}
+}
+
+
+@pytest.fixture
+def adapter():
+    adapter = InMemoryAdapter()
+
+    @adapter.route("uberex", "ticker")
+    def ticker(request):
+        return {"instrument": request.url.split("/")[2], "bid": "9500.1"}
+
+    adapter.route("uberex", "order", "new", lambda request: Reply(201, b'{"id": 1}'))
+    adapter.route("uberex", "order", handler=lambda request: b"[]")
+    return adapter
+
+
+@pytest.fixture
+def session(adapter):
+    with mock.patch("bitex.session.list_loaded_plugins", return_value=PLUGINS), mock.patch(
+        "bitex.memory.list_loaded_plugins", return_value=PLUGINS
+    ):
+        session = BitexSession(auth=BitexAuth("key", "secret"))
+        session.trust_env = False
+        adapter.install(session)
+        yield session
+
+
+def test_routes_to_handlers_by_endpoint_and_action(session, adapter):
+    response = session.ticker("uberex", "BTCUSD")
+    assert isinstance(response, UberExResponse)
+    assert isinstance(response.request, UberExRequest)
+    assert response.status_code == 200
+    assert response.headers["Content-Type"] == "application/json"
+    assert response.json() == {"instrument": "BTCUSD", "bid": "9500.1"}
+
+    response = session.request("POST", "uberex://BTCUSD/order/new", private=True)
+    assert (response.status_code, response.json()) == (201, {"id": 1})
+    assert response.request.headers["X-Signed"] == "key"
+
+    response = session.request("POST", "uberex://BTCUSD/order/cancel", private=True)
+    assert (response.status_code, response.content) == (200, b"[]")
+    assert adapter.requests == 3
+
+
+def test_unrouted_requests_fall_back_to_the_default_handler_or_404(session, adapter):
+    response = session.request("GET", "uberex://BTCUSD/trades")
+    assert response.status_code == 404
+    with pytest.raises(requests.HTTPError):
+        response.raise_for_status()
+
+    adapter.route("uberex", handler=lambda request: Reply(503, b"", {"Retry-After": "1"}))
+    response = session.request("GET", "uberex://BTCUSD/trades")
+    assert (response.status_code, response.headers["retry-after"]) == (503, "1")
+
+
+def test_routes_by_resolved_url_templates(session, adapter):
+    adapter.handler = mock.Mock(wraps=adapter.handler)
+    registry.register("uberex", URLTemplates("https://api.uberex.com", {"ticker": "{base}/t"}))
+    try:
+        response = session.ticker("uberex", "BTCUSD")
+    finally:
+        registry.unregister("uberex")
+    assert response.url == "https://api.uberex.com/t"
+    assert response.json()["instrument"] == "api.uberex.com"
+    request = adapter.handler.call_args[0][0]
+    assert (request.instrument, request.endpoint) == ("BTCUSD", "ticker")
+
+
+def test_handler_exceptions_propagate(session, adapter):
+    adapter.route("uberex", "book", handler=mock.Mock(side_effect=requests.ConnectionError))
+    with pytest.raises(requests.ConnectionError):
+        session.orderbook("uberex", "BTCUSD")
+
+
+def test_expired_deadlines_are_not_sent(session, adapter):
+    clock = mock.Mock(side_effect=[0.0] + [2.0] * 20)
+    with pytest.raises(DeadlineExceeded):
+        session.ticker("uberex", "BTCUSD", deadline=Deadline(1.0, clock=clock))
+    assert adapter.requests == 0
+
+
+def test_frozen_session_uses_the_snapshot_of_plugins(session, adapter):
+    session.freeze()
+    with mock.patch("bitex.memory.list_loaded_plugins", side_effect=AssertionError):
+        assert isinstance(session.ticker("uberex", "BTCUSD"), UberExResponse)
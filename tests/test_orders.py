@@ -0,0 +1,135 @@
+# Built-in
+from unittest import mock
+
+# Third-party
+import pytest
+
+# Home-brew
+from bitex.orders import OpenOrdersEndpoint, OrderTracker
+from bitex.records import OrderStatus
+
+
+class Response:
+    ok = True
+
+    def __init__(self, *records):
+        self._records = list(records)
+
+    def records(self):
+        return self._records
+
+    def raise_for_status(self):
+        pass
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class OpenOrders(OpenOrdersEndpoint):
+    def __init__(self, open_orders):
+        self.open_orders = open_orders
+
+    def request(self, session, pair=None):
+        return Response(*self.open_orders)
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def session():
+    session = mock.Mock()
+    session.new_order.side_effect = lambda exchange, pair, **kw: Response(
+        OrderStatus(pair, kw["params"]["id"], "open")
+    )
+    return session
+
+
+def open_orders(endpoints):
+    return mock.patch("bitex.plugins.list_loaded_open_orders", return_value=endpoints)
+
+
+def test_new_and_cancelled_orders_are_tracked_from_responses(session, clock):
+    changes = []
+    tracker = OrderTracker(session, clock=clock, on_change=lambda *args: changes.append(args))
+    tracker.new_order("uberex", "BTCUSD", params={"id": "1"})
+    assert tracker.get("uberex", "1") == OrderStatus("BTCUSD", "1", "open")
+    assert changes == [("uberex", None, OrderStatus("BTCUSD", "1", "open"))]
+
+    session.cancel_order.return_value = Response(OrderStatus("BTCUSD", "1", "canceled"))
+    tracker.cancel_order("uberex", "BTCUSD", "1")
+    assert session.cancel_order.call_args[1]["params"] == {"order_id": "1"}
+    assert tracker.get("uberex", "1").status == "canceled"
+    assert tracker.orders(live=True) == []
+    with open_orders({}):
+        assert tracker.poll() == 0
+
+
+def test_poll_intervals_grow_while_orders_remain_unchanged(session, clock):
+    tracker = OrderTracker(session, min_interval=1.0, max_interval=5.0, ramp=2.0, clock=clock)
+    tracker.new_order("uberex", "BTCUSD", params={"id": "1"})
+    session.order_status.return_value = Response(OrderStatus("BTCUSD", "1", "open"))
+    polls = []
+    with open_orders({}):
+        for _ in range(200):
+            clock.now += 0.1
+            if tracker.poll():
+                polls.append(round(clock.now, 1))
+    gaps = [round(b - a, 1) for a, b in zip(polls, polls[1:])]
+    # Polls happen on 0.1s ticks, so gaps may exceed the interval by one tick.
+    assert all(b >= a - 0.1 for a, b in zip(gaps, gaps[1:]))
+    assert gaps[0] < 2 and 5.0 <= gaps[-1] <= 5.1
+    assert session.order_status.call_args[1]["params"] == {"order_id": "1"}
+
+
+def test_bulk_endpoint_coalesces_polls_and_queries_closed_orders(session, clock):
+    tracker = OrderTracker(session, clock=clock)
+    for order_id in "123":
+        tracker.new_order("uberex", "BTCUSD", params={"id": order_id})
+    endpoint = OpenOrders(
+        [OrderStatus("BTCUSD", "1", "open"), OrderStatus("BTCUSD", "2", "partial")]
+    )
+    session.order_status.return_value = Response(OrderStatus("BTCUSD", "3", "filled"))
+    clock.now = 10.0
+    with open_orders({"uberex": endpoint}):
+        assert tracker.poll() == 2
+    assert session.order_status.call_count == 1
+    assert [o.status for o in tracker.orders()] == ["open", "partial", "filled"]
+    assert tracker.requests == 2
+
+
+@pytest.mark.parametrize("records", [[], NotImplementedError])
+def test_orders_are_rescheduled_if_responses_state_no_records(session, clock, records):
+    tracker = OrderTracker(session, min_interval=1.0, clock=clock)
+    tracker.new_order("uberex", "BTCUSD", params={"id": "1"})
+    response = mock.Mock(spec=Response)
+    response.records.side_effect = [records]
+    session.order_status.return_value = response
+    clock.now = 10.0
+    with open_orders({}):
+        assert tracker.poll() == 1
+        clock.now += 0.01
+        assert tracker.poll() == 0
+    assert tracker.next_due() >= 11.0
+
+
+def test_orders_refreshed_in_bulk_are_rescheduled(session, clock):
+    tracker = OrderTracker(session, min_interval=1.0, clock=clock)
+    tracker.new_order("uberex", "BTCUSD", params={"id": "1"})
+    endpoint = OpenOrders([])
+    endpoint.orders = mock.Mock(return_value=[])
+    endpoint.request = mock.Mock(return_value=Response())
+    session.order_status.return_value = Response()
+    clock.now = 10.0
+    with open_orders({"uberex": endpoint}):
+        assert tracker.poll() == 2
+        clock.now += 0.01
+        assert tracker.poll() == 0
+    assert tracker.next_due() >= 11.0
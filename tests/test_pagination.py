@@ -0,0 +1,133 @@
+# Built-in
+import threading
+import time
+from unittest import mock
+
+# Third-party
+import pytest
+
+# Home-brew
+from bitex.exceptions import MissingPlugin
+from bitex.pagination import (
+    CursorPaginator,
+    IdPaginator,
+    TimePaginator,
+    iter_trades,
+    prefetched,
+)
+from bitex.records import Trade
+from bitex.session import BitexSession
+
+# One trade per second, with ids 0-99, but id 50 is missing.
+HISTORY = [Trade("BTCUSD", float(i), i, "1.0", "1.0") for i in range(100) if i != 50]
+
+
+class Page:
+    def __init__(self, trades, cursor=None):
+        self.trades = trades
+        self.cursor = cursor
+
+    def records(self):
+        return self.trades
+
+    def raise_for_status(self):
+        pass
+
+
+class Time(TimePaginator):
+    def params(self, pair, start, end):
+        return {"since": start, "until": end}
+
+
+class Id(IdPaginator):
+    def params(self, pair, start=None, from_id=None):
+        return {"since": start, "from_id": from_id}
+
+
+class Cursor(CursorPaginator):
+    def params(self, pair, start, cursor=None):
+        return {"cursor": start if cursor is None else cursor}
+
+    def next_cursor(self, response):
+        return response.cursor
+
+
+def fetch_time(params):
+    return Page([t for t in HISTORY if params["since"] <= t.timestamp < params["until"]])
+
+
+def fetch_id(params):
+    if params["from_id"] is None:
+        trades = [t for t in HISTORY if t.timestamp >= params["since"]]
+    else:
+        trades = [t for t in HISTORY if t.trade_id >= params["from_id"]]
+    return Page(trades[:10])
+
+
+def fetch_cursor(params):
+    trades = [t for t in HISTORY if t.timestamp >= params["cursor"]][:10]
+    return Page(trades, trades[-1].timestamp + 1 if trades else None)
+
+
+@pytest.mark.parametrize(
+    "paginator, fetch",
+    [(Time(7), fetch_time), (Id(10), fetch_id), (Cursor(), fetch_cursor)],
+)
+def test_iter_trades_yields_all_trades_in_range_in_order(paginator, fetch):
+    trades = list(iter_trades(fetch, paginator, "BTCUSD", 5, 95, prefetch=3))
+    assert trades == [t for t in HISTORY if 5 <= t.timestamp < 95]
+
+
+def test_iter_trades_stops_at_the_latest_trade_without_end():
+    trades = list(iter_trades(fetch_id, Id(10), "BTCUSD", 0))
+    assert trades == HISTORY
+
+
+def test_iter_trades_ends_at_the_current_time_in_the_unit_of_the_paginator():
+    class MillisecondTime(Time):
+        per_second = 1000
+
+    now_ms = 1_600_000_000_000
+    history = [Trade("BTCUSD", float(now_ms - 5000 + i * 1000), i, "1.0", "1.0") for i in range(5)]
+    requested = []
+
+    def fetch(params):
+        requested.append(params)
+        return Page([t for t in history if params["since"] <= t.timestamp < params["until"]])
+
+    with mock.patch("bitex.pagination.time.time", return_value=now_ms / 1000):
+        trades = list(iter_trades(fetch, MillisecondTime(2000), "BTCUSD", now_ms - 5000))
+    assert trades == history
+    assert requested[-1]["until"] == now_ms
+
+
+def test_prefetched_fetches_a_bounded_number_of_pages_concurrently():
+    active, peak = [0], [0]
+    lock = threading.Lock()
+
+    def fetch(item):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.01)
+        with lock:
+            active[0] -= 1
+        return item * 2
+
+    assert list(prefetched(fetch, range(20), 4)) == [(i, i * 2) for i in range(20)]
+    assert 1 < peak[0] <= 4
+
+
+def test_session_iter_trades_uses_the_announced_paginator():
+    session = BitexSession()
+    with mock.patch("bitex.session.list_loaded_paginators", return_value={}):
+        with pytest.raises(MissingPlugin):
+            session.iter_trades("uberex", "BTCUSD", 0)
+
+    with mock.patch(
+        "bitex.session.list_loaded_paginators", return_value={"uberex": Id(10)}
+    ), mock.patch.object(session, "trades") as trades:
+        trades.side_effect = lambda exchange, pair, params: fetch_id(params)
+        assert list(session.iter_trades("uberex", "BTCUSD", 90)) == HISTORY[89:]
+        assert trades.call_args_list[0][1]["params"] == {"since": 90, "from_id": None}
+        assert {"since": None, "from_id": 100} in [c[1]["params"] for c in trades.call_args_list]
@@ -0,0 +1,36 @@
+# Built-in
+import pickle
+
+# Third-party
+import pytest
+
+# Home-brew
+from bitex.records import BUY, Balance, BookLevel, OrderStatus, Ticker, Trade
+
+
+@pytest.mark.parametrize(
+    "record",
+    [
+        Ticker("BTCUSD", 1, bid="3809.1", ask="3809.4"),
+        Trade("BTCUSD", 1, 1000, "3809.1", "0.5", BUY),
+        BookLevel("BTCUSD", 1, "bid", "3809.1", "0.5"),
+        OrderStatus("BTCUSD", "abc", "open", price="3809.1", size="1"),
+        Balance("BTC", "1.5"),
+    ],
+)
+def test_records_have_no_instance_dict_and_survive_pickling(record):
+    assert not hasattr(record, "__dict__")
+    assert pickle.loads(pickle.dumps(record)) == record
+    assert record.as_dict() == dict(zip(record.__slots__, record.as_tuple()))
+
+
+def test_record_equality_and_repr():
+    ticker = Ticker("BTCUSD", 1, bid="1")
+    assert ticker == Ticker("BTCUSD", 1, bid="1")
+    assert ticker != Ticker("BTCUSD", 1, bid="2")
+    assert ticker != BookLevel("BTCUSD", 1, "bid", "1", None)
+    assert repr(Balance("BTC", "1")) == (
+        "Balance(currency='BTC', available='1', reserved=None, timestamp=None)"
+    )
+    with pytest.raises(TypeError):
+        hash(ticker)
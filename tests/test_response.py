@@ -19,3 +19,78 @@ def test_repr_magic_method_returns_correct_string():
     resp = BitexResponse()
     resp.status_code = 200
     assert repr(resp) == "<BitexResponse [200]>"
+
+
+def test_json_method_decodes_using_the_responses_codec():
+    from decimal import Decimal
+
+    from bitex.codec import JSONCodec
+
+    resp = BitexResponse()
+    resp._content = b'{"price": 1.10}'
+    assert resp.json() == {"price": 1.1}
+    resp.codec = JSONCodec("decimal")
+    assert resp.json() == {"price": Decimal("1.10")}
+
+
+def test_json_method_raises_requests_json_decode_error_on_invalid_json():
+    from requests.exceptions import JSONDecodeError
+
+    resp = BitexResponse()
+    resp._content = b'{"price": '
+    with pytest.raises(JSONDecodeError):
+        resp.json()
+
+
+def test_scaled_triples_converts_values_of_the_given_labels():
+    class Response(BitexResponse):
+        def triples(self):
+            return [(1, "pair", "BTCUSD"), (1, "bid", "3809.1"), (1, "bid_size", "0.5")]
+
+    resp = Response()
+    assert resp.scaled_triples({"bid": 1}) == [
+        (1, "pair", "BTCUSD"),
+        (1, "bid", 38091),
+        (1, "bid_size", "0.5"),
+    ]
+    assert resp.scaled_triples(2) == [
+        (1, "pair", "BTCUSD"),
+        (1, "bid", 380910),
+        (1, "bid_size", 50),
+    ]
+
+
+def test_scaled_triples_with_a_single_scale_skips_only_non_numeric_values_and_ids():
+    class Response(BitexResponse):
+        def triples(self):
+            return [
+                (1, "pair", "BTCUSD"),
+                (1, "trade_id", 12345),
+                (1, "id", "678"),
+                (1, "bid", 3809),
+                (1, "ask", "1_000.5"),
+                (1, "received", 1.5),
+            ]
+
+    assert Response().scaled_triples(2) == [
+        (1, "pair", "BTCUSD"),
+        (1, "trade_id", 12345),
+        (1, "id", "678"),
+        (1, "bid", 380900),
+        (1, "ask", "1_000.5"),
+        (1, "received", 1.5),
+    ]
+
+
+def test_scaled_triples_with_a_single_scale_raises_on_precision_loss():
+    class Response(BitexResponse):
+        def triples(self):
+            return [(1, "pair", "BTCUSD"), (1, "bid", "3809.123")]
+
+    with pytest.raises(ValueError):
+        Response().scaled_triples(2)
+
+
+def test_records_raises_not_implemented_error():
+    with pytest.raises(NotImplementedError):
+        BitexResponse().records()
@@ -0,0 +1,137 @@
+# Built-in
+import gc
+from unittest import mock
+
+# Third-party
+import pytest
+from requests.adapters import HTTPAdapter
+
+# Home-brew
+from bitex.request import BitexPreparedRequest
+from bitex.response import BitexResponse
+from bitex.retention import RetentionPolicy
+from bitex.session import BitexSession
+
+
+class TickerResponse(BitexResponse):
+    calls = 0
+
+    def triples(self):
+        TickerResponse.calls += 1
+        data = self.json()
+        return [(data["ts"], "bid", data["bid"])]
+
+
+def make_response(body=b'{"ts": 1, "bid": "9500.1"}', cls=TickerResponse):
+    response = cls()
+    response.status_code = 200
+    response._content = body
+    request = BitexPreparedRequest("uberex")
+    request.prepare(method="POST", url="http://uberex.com/ticker", data={"secret": "x" * 64})
+    response.request = request
+    return response
+
+
+def test_responses_are_retained_without_a_policy():
+    response = make_response()
+    assert response.json() is not response.json()
+    response.triples()
+    assert response.content and not response.released
+
+
+def test_parsed_only_releases_after_formatting_and_memoizes():
+    retention = RetentionPolicy()
+    response = make_response()
+    retention.track(response)
+    assert retention.usage()["bytes"] == len(response.content)
+
+    calls = TickerResponse.calls
+    assert response.triples() == [(1, "bid", "9500.1")]
+    assert response.triples() is response.triples()
+    assert TickerResponse.calls == calls + 1
+    assert response.json() == {"ts": 1, "bid": "9500.1"}
+
+    assert response.released and response.raw is None
+    assert response.request.body is None and response.request.exchange == "uberex"
+    with pytest.raises(RuntimeError):
+        response.content
+    assert retention.usage() == {
+        "responses": 0, "bytes": 0, "max_bytes": None, "released": 1, "evicted": 0
+    }
+
+
+def test_parsed_only_releases_after_the_outermost_formatter_returned():
+    class Response(BitexResponse):
+        def key_value_dict(self):
+            data = self.json()
+            return {**data, "body": self.request.body, "size": len(self.content)}
+
+    retention = RetentionPolicy()
+    response = make_response(cls=Response)
+    retention.track(response)
+    data = response.key_value_dict()
+    assert data["body"] == "secret=" + "x" * 64
+    assert data["size"] == len(b'{"ts": 1, "bid": "9500.1"}')
+    assert response.released
+
+
+def test_responses_are_kept_until_parsed_if_not_parsed_only():
+    retention = RetentionPolicy(parsed_only=False)
+    response = make_response()
+    retention.track(response)
+    response.json()
+    assert not response.released
+    assert retention.usage()["responses"] == 1
+
+
+def test_max_bytes_evicts_the_oldest_responses():
+    retention = RetentionPolicy(parsed_only=False, max_bytes=60)
+    responses = [make_response() for _ in range(3)]
+    for response in responses:
+        retention.track(response)
+    # Each body holds 26 bytes; only two fit.
+    assert [r.released for r in responses] == [True, False, False]
+    assert responses[0].json() == {"ts": 1, "bid": "9500.1"}
+    usage = retention.usage()
+    assert (usage["responses"], usage["bytes"], usage["evicted"]) == (2, 52, 1)
+
+
+def test_undecodable_bodies_are_released_on_eviction():
+    retention = RetentionPolicy(max_bytes=0)
+    response = make_response(b"<html>", BitexResponse)
+    retention.track(response)
+    assert response.released and retention.usage()["bytes"] == 0
+
+
+def test_collected_responses_are_no_longer_counted():
+    retention = RetentionPolicy()
+    retention.track(make_response())
+    gc.collect()
+    assert retention.usage()["responses"] == 0 and retention.usage()["bytes"] == 0
+
+
+def test_subclass_formatters_are_wrapped_once():
+    class Child(TickerResponse):
+        pass
+
+    class Override(TickerResponse):
+        def triples(self):
+            return super(Override, self).triples() + [(1, "ask", "9501")]
+
+    assert Child.triples is TickerResponse.triples
+    retention = RetentionPolicy()
+    response = make_response(cls=Override)
+    retention.track(response)
+    assert response.triples() == [(1, "bid", "9500.1"), (1, "ask", "9501")]
+    assert response.triples() is response.triples()
+
+
+@mock.patch.object(HTTPAdapter, "send")
+def test_session_tracks_received_responses(mock_send):
+    mock_send.return_value = make_response()
+    retention = RetentionPolicy()
+    response = BitexSession(retention=retention).request("GET", "http://uberex.com/ticker")
+    assert response.retention is retention
+    assert retention.usage()["responses"] == 1
+    response.triples()
+    assert retention.usage()["responses"] == 0
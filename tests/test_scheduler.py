@@ -0,0 +1,117 @@
+# Built-in
+import queue
+import threading
+import time
+
+# Third-party
+import pytest
+
+# Home-brew
+from bitex.scheduler import JobStats, PollingScheduler, phase
+
+
+class DummySession:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def ticker(self, exchange, pair, **kwargs):
+        with self.lock:
+            self.calls.append((time.monotonic(), exchange, pair, kwargs))
+        time.sleep(self.delay)
+        return f"{exchange}:{pair}"
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestPollingScheduler:
+    def test_add_job_rejects_unknown_endpoints_and_duplicates(self):
+        scheduler = PollingScheduler(DummySession())
+        with pytest.raises(ValueError):
+            scheduler.add_job("ex", "BTCUSD", "not_a_method", interval=1)
+        scheduler.add_job("ex", "BTCUSD", "ticker", interval=1)
+        with pytest.raises(ValueError):
+            scheduler.add_job("ex", "BTCUSD", "ticker", interval=1)
+
+    def test_jobs_of_the_same_exchange_are_staggered_across_their_interval(self):
+        scheduler = PollingScheduler(DummySession(), clock=lambda: 0.0)
+        jobs = [scheduler.add_job("ex", pair, "ticker", interval=4) for pair in "ABCD"]
+        other = scheduler.add_job("other", "A", "ticker", interval=4)
+        assert [job.due for job in jobs] == [0.0, 2.0, 1.0, 3.0]
+        assert other.due == 0.0
+
+    def test_adding_jobs_does_not_reschedule_existing_ones(self):
+        clock = Clock()
+        scheduler = PollingScheduler(DummySession(), clock=clock)
+        first = scheduler.add_job("ex", "A", "ticker", interval=4)
+        scheduler._heap.clear()
+        scheduler._reschedule(first, now=0.0)
+        clock.now = 5.0
+        second = scheduler.add_job("ex", "B", "ticker", interval=4)
+        # Phases are relative to the first job; the second one's next is at 6.
+        assert (first.due, second.due) == (4.0, 6.0)
+        assert sorted(due for due, _, _ in scheduler._heap) == [4.0, 6.0]
+
+        clock.now = 100.0
+        for pair in range(3000):
+            scheduler.add_job("ex", str(pair), "ticker", interval=4)
+        assert first.due == 4.0 and len(scheduler._heap) == len(scheduler.jobs)
+        assert all(100.0 <= job.due < 104.0 for job in scheduler.jobs.values() if job.slot > 1)
+
+    def test_removed_phases_are_reused_and_stale_entries_compacted(self):
+        scheduler = PollingScheduler(DummySession(), clock=lambda: 0.0)
+        jobs = [scheduler.add_job("ex", str(pair), "ticker", interval=8) for pair in range(8)]
+        scheduler.remove_job("ex", "2", "ticker")
+        assert scheduler.add_job("ex", "new", "ticker", interval=8).due == jobs[2].due
+        for pair in range(100):
+            scheduler.add_job("ex", "tmp", "ticker", interval=8)
+            scheduler.remove_job("ex", "tmp", "ticker")
+        assert len(scheduler._heap) <= 2 * len(scheduler.jobs) + 17
+
+    def test_overdue_ticks_are_skipped_instead_of_piled_up(self):
+        scheduler = PollingScheduler(DummySession(), clock=lambda: 0.0)
+        job = scheduler.add_job("ex", "A", "ticker", interval=1)
+        scheduler._reschedule(job, now=3.5)
+        assert job.stats.skipped == 3
+        assert job.due == 4.0
+
+    def test_results_are_delivered_to_callbacks_and_queues_with_lag_metrics(self):
+        session = DummySession()
+        results = queue.Queue()
+        received = []
+        with PollingScheduler(session, workers=2) as scheduler:
+            scheduler.add_job("ex", "A", "ticker", interval=0.05, queue=results, depth=1)
+            scheduler.add_job(
+                "ex", "B", "ticker", interval=0.05, callback=lambda job, res: received.append(res)
+            )
+            time.sleep(0.3)
+        job, result = results.get_nowait()
+        assert result == "ex:A"
+        assert job.kwargs == {"depth": 1}
+        assert "ex:B" in received
+        stats = scheduler.stats()[("ex", "A", "ticker")]
+        assert stats["runs"] >= 3
+        assert 0 <= stats["mean_lag"] <= stats["max_lag"]
+
+    def test_ticks_are_skipped_while_a_job_is_still_running(self):
+        session = DummySession(delay=0.2)
+        with PollingScheduler(session) as scheduler:
+            job = scheduler.add_job("ex", "A", "ticker", interval=0.05)
+            time.sleep(0.3)
+        assert job.stats.skipped >= 2
+        assert len(session.calls) <= 2
+
+
+def test_job_stats_mean_lag_is_zero_without_runs():
+    assert JobStats().mean_lag == 0.0
+
+
+def test_phases_halve_the_largest_gap():
+    assert [phase(slot) for slot in range(8)] == [0, 0.5, 0.25, 0.75, 0.125, 0.625, 0.375, 0.875]
@@ -333,3 +333,242 @@ class TestBitexSessionProperties:
         session.auth = BitexAuth('key', 'secret')
         session.key = 'chugaloo'
         assert session.auth.key == 'chugaloo'
+
+
+class TestBitexSessionBatchOrders:
+    class NonceAuth(BitexAuth):
+        def __call__(self, request):
+            request.headers["Nonce"] = self.nonce()
+            return request
+
+    @staticmethod
+    def respond(prep, **kwargs):
+        response = BitexResponse()
+        response.status_code = 400 if "fail" in str(prep.body) else 200
+        response.request = prep
+        return response
+
+    @patch("bitex.session.list_loaded_batch_orders", return_value={})
+    def test_orders_are_signed_with_increasing_nonces_and_returned_in_input_order(self, _):
+        session = BitexSession(auth=self.NonceAuth("key", "secret"))
+        orders = [{"pair": "BTCUSD", "data": {"id": i}} for i in range(5)]
+        orders[2]["data"] = {"id": "fail"}
+        with patch.object(session, "send", side_effect=self.respond):
+            results = session.new_orders("uberex", orders)
+        assert [result.order for result in results] == orders
+        assert [result.ok for result in results] == [True, True, False, True, True]
+        assert results[2].response.status_code == 400
+        nonces = [int(result.response.request.headers["Nonce"]) for result in results]
+        assert nonces == sorted(set(nonces))
+        assert results[0].response.request.url == "uberex://BTCUSD/order/new"
+
+    @patch("bitex.session.list_loaded_batch_orders", return_value={})
+    def test_orders_requiring_ordered_nonces_are_sent_one_at_a_time_in_nonce_order(self, _):
+        import threading
+        import time
+
+        active, sent = [], []
+        lock = threading.Lock()
+
+        def respond(prep, **kwargs):
+            with lock:
+                active.append(prep)
+                assert len(active) == 1
+            time.sleep(0.002 if "0" in str(prep.body) else 0)
+            sent.append(int(prep.headers["Nonce"]))
+            with lock:
+                active.remove(prep)
+            return self.respond(prep)
+
+        session = BitexSession(auth=self.NonceAuth("ordered-key", "secret"))
+        orders = [{"pair": "BTCUSD", "data": {"id": i}} for i in range(4)]
+        with patch.object(session, "send", side_effect=respond):
+            results = session.new_orders("uberex", orders)
+        assert all(result.ok for result in results)
+        assert sent == sorted(set(sent))
+
+    @patch("bitex.session.list_loaded_batch_orders", return_value={})
+    def test_orders_not_requiring_ordered_nonces_are_sent_concurrently(self, _):
+        import threading
+
+        class WindowAuth(self.NonceAuth):
+            ordered_nonces = False
+
+        barrier = threading.Barrier(2, timeout=5)
+
+        def respond(prep, **kwargs):
+            barrier.wait()
+            return self.respond(prep)
+
+        session = BitexSession(auth=WindowAuth("window-key", "secret"))
+        orders = [{"pair": "BTCUSD", "data": {"id": i}} for i in range(2)]
+        with patch.object(session, "send", side_effect=respond):
+            results = session.new_orders("uberex", orders)
+        assert all(result.ok for result in results)
+        nonces = [int(result.response.request.headers["Nonce"]) for result in results]
+        assert nonces[0] < nonces[1]
+
+    @patch("bitex.session.list_loaded_batch_orders", return_value={})
+    def test_orders_pass_on_files_and_cookies(self, _):
+        session = BitexSession(auth=self.NonceAuth("key", "secret"))
+        orders = [{"pair": "BTCUSD", "files": {"doc": b"content"}, "cookies": {"c": "v"}}]
+        with patch.object(session, "send", side_effect=self.respond):
+            (result,) = session.new_orders("uberex", orders)
+        assert b"content" in result.response.request.body
+        assert result.response.request.headers["Cookie"] == "c=v"
+
+    def test_single_orders_hold_the_signing_lock_of_the_api_key(self):
+        from bitex.session import _signing_locks
+
+        session = BitexSession(auth=self.NonceAuth("single-key", "secret"))
+
+        def respond(prep, **kwargs):
+            assert _signing_locks["single-key"].locked()
+            return self.respond(prep)
+
+        with patch.object(session, "send", side_effect=respond):
+            response = session.new_order("uberex", "BTCUSD", data={"id": 1})
+        assert "Nonce" in response.request.headers
+        assert not _signing_locks["single-key"].locked()
+
+    def test_orders_are_sent_via_announced_batch_endpoint(self):
+        from bitex.orders import BatchOrdersEndpoint, OrderResult
+
+        response = mock.Mock()
+
+        class Batch(BatchOrdersEndpoint):
+            max_batch = 2
+
+            def request(self, session, action, orders):
+                assert action == "cancel"
+                if len(orders) == 1:
+                    raise ConnectionError("boom")
+                return response
+
+            def results(self, response, orders):
+                return [OrderResult(order, response) for order in orders]
+
+        session = BitexSession()
+        orders = [{"pair": "BTCUSD", "params": {"id": i}} for i in range(3)]
+        with patch("bitex.session.list_loaded_batch_orders", return_value={"uberex": Batch()}):
+            results = session.cancel_orders("uberex", orders)
+        assert [result.response for result in results] == [response, response, None]
+        assert isinstance(results[2].error, ConnectionError)
+
+
+def test_sessions_survive_a_pickle_round_trip():
+    import pickle
+
+    from bitex.codec import JSONCodec
+
+    session = BitexSession(auth=BitexAuth("key", "secret"), codec=JSONCodec())
+    session.auth_for("uberex")
+    restored = pickle.loads(pickle.dumps(session))
+    assert isinstance(restored.codec, JSONCodec)
+    assert restored.auth.key == "key"
+    assert not restored.frozen
+    prep = restored.prepare_request(BitexRequest(method="GET", url="http://bitex.com/ticker"))
+    assert prep.codec is restored.codec
+
+    frozen = pickle.loads(pickle.dumps(BitexSession().freeze()))
+    assert frozen.frozen
+    frozen.prepare_request(BitexRequest(method="GET", url="http://bitex.com/ticker"))
+    with pytest.raises(AttributeError):
+        frozen.codec = None
+
+
+class TestFrozenSession:
+    class ExchangeAuth(BitexAuth):
+        instances = 0
+
+        def __init__(self, key, secret):
+            super().__init__(key, secret)
+            type(self).instances += 1
+
+        def __call__(self, request):
+            request.headers["Signed-For"] = request.exchange
+            return request
+
+    @staticmethod
+    def respond(prep, **kwargs):
+        response = BitexResponse()
+        response.status_code = 200
+        response._content = prep.url.encode()
+        response.request = prep
+        return response
+
+    def plugins(self):
+        return {
+            exchange: {
+                "Auth": self.ExchangeAuth,
+                "PreparedRequest": BitexPreparedRequest,
+                "Response": BitexResponse,
+            }
+            for exchange in ("uberex", "megaex")
+        }
+
+    def test_frozen_configuration_is_read_only(self):
+        session = BitexSession(auth=BitexAuth("key", "secret"))
+        session.headers["X-Custom"] = "yes"
+        session.cookies.set("sid", "1")
+        assert session.freeze() is session and session.frozen
+        with pytest.raises(AttributeError):
+            session.auth = None
+        with pytest.raises(AttributeError):
+            session.key = "other"
+        with pytest.raises(TypeError):
+            session.headers["X-Custom"] = "no"
+        with pytest.raises(TypeError):
+            session.params["a"] = 1
+        with pytest.raises(TypeError):
+            session.mount("http://", BitexHTTPAdapter())
+        assert session.headers["x-custom"] == "yes"
+        assert session.cookies.get("sid") == "1"
+
+    def test_private_requests_use_plugin_auth_without_mutating_the_session(self):
+        auth = BitexAuth("key", "secret")
+        session = BitexSession(auth=auth)
+        with patch("bitex.session.list_loaded_plugins", return_value=self.plugins()):
+            request = BitexRequest(method="GET", url="uberex://BTCUSD/ticker")
+            assert "Signed-For" not in session.prepare_request(request).headers
+            request = BitexRequest(method="POST", url="uberex://BTCUSD/order/new", private=True)
+            prep = session.prepare_request(request)
+        assert prep.headers["Signed-For"] == "uberex"
+        assert session.auth is auth
+        assert session.auth_for("uberex") is session.auth_for("uberex")
+
+    @patch("requests.adapters.HTTPAdapter.send")
+    def test_concurrent_requests_via_a_frozen_session(self, mock_send):
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+
+        mock_send.side_effect = self.respond
+        self.ExchangeAuth.instances = 0
+        session = BitexSession(auth=BitexAuth("key", "secret"))
+        for exchange in ("uberex", "megaex"):
+            session.mount(f"{exchange}://", BitexHTTPAdapter())
+        with patch("bitex.session.list_loaded_plugins", return_value=self.plugins()) as plugins:
+            session.freeze()
+        barrier = threading.Barrier(16)
+
+        def work(worker):
+            barrier.wait()
+            results = []
+            for i in range(50):
+                exchange = ("uberex", "megaex")[(worker + i) % 2]
+                url = f"{exchange}://BTCUSD/order/new?id={worker}-{i}"
+                response = session.request("POST", url, private=True)
+                results.append((exchange, url, response))
+            return results
+
+        with ThreadPoolExecutor(16) as pool:
+            results = [r for rs in pool.map(work, range(16)) for r in rs]
+        assert len(results) == 800
+        for exchange, url, response in results:
+            assert response.request.headers["Signed-For"] == exchange
+            assert response.content == response.request.url.encode()
+            assert url.split("?")[1] in response.request.url
+        # Plugins were looked up once, and one auth object created per exchange.
+        assert plugins.call_count == 1
+        assert self.ExchangeAuth.instances == 2
+        assert len(session.cookies) == 0
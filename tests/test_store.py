@@ -0,0 +1,112 @@
+# Built-in
+import math
+import multiprocessing
+import os
+import subprocess
+import sys
+from unittest.mock import MagicMock
+
+# Third-party
+import pytest
+
+# Home-brew
+from bitex.response import BitexResponse
+
+pytest.importorskip("multiprocessing.shared_memory")
+
+# Home-brew
+from bitex.store import FIELDS, SharedQuoteStore  # noqa: E402
+
+
+@pytest.fixture
+def store():
+    store = SharedQuoteStore.create(f"bitex-test-{os.getpid()}", capacity=4)
+    yield store
+    store.close()
+
+
+def test_values_written_are_visible_to_attached_readers(store):
+    store.write("kraken", "BTCUSD", {"bid": "100.5", "ask": 101, "unknown": 1})
+    reader = SharedQuoteStore.attach(store.name)
+    try:
+        values = reader.read("kraken", "BTCUSD")
+        assert values["bid"] == 100.5
+        assert values["ask"] == 101.0
+        assert math.isnan(values["last"])
+        assert set(values) == set(FIELDS)
+        assert reader.read("kraken", "ETHUSD") is None
+        assert reader.keys() == [("kraken", "BTCUSD")]
+    finally:
+        reader.close()
+
+
+def test_writes_beyond_capacity_raise_value_error(store):
+    for pair in "ABCD":
+        store.write("ex", pair, {"bid": 1})
+    with pytest.raises(ValueError):
+        store.write("ex", "E", {"bid": 1})
+    store.write("ex", "A", {"bid": 2})
+    assert store.read("ex", "A")["bid"] == 2
+
+
+def test_update_uses_key_value_dict_of_the_response(store):
+    response = BitexResponse()
+    response.request = MagicMock(exchange="kraken")
+    response.key_value_dict = lambda: {"pair": "BTCUSD", "bid": "1", "received": "1.5"}
+    store.update(response)
+    assert store.read("kraken", "BTCUSD")["timestamp"] == 1.5
+
+
+def test_attaching_to_a_foreign_segment_raises_value_error():
+    from multiprocessing.shared_memory import SharedMemory
+
+    shm = SharedMemory(create=True, size=SharedQuoteStore.size(1))
+    try:
+        with pytest.raises(ValueError):
+            SharedQuoteStore.attach(shm.name)
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def _writer(name, rounds):
+    store = SharedQuoteStore.attach(name)
+    for i in range(rounds):
+        store.write("ex", "A", {f: i for f in FIELDS})
+    store.close()
+
+
+def test_readers_never_observe_torn_writes(store):
+    store.write("ex", "A", {f: 0 for f in FIELDS})
+    writer = multiprocessing.get_context("fork").Process(target=_writer, args=(store.name, 20000))
+    writer.start()
+    while writer.is_alive():
+        values = store.read("ex", "A")
+        assert len(set(values.values())) == 1
+    writer.join()
+    assert store.read("ex", "A")["bid"] == 19999
+
+
+def test_segments_outlive_independent_processes_attached_to_them(store):
+    store.write("ex", "A", {"bid": 1})
+    script = (
+        "import sys; from bitex.store import SharedQuoteStore; "
+        "store = SharedQuoteStore.attach(sys.argv[1]); "
+        "print(store.read('ex', 'A')['bid']); store.close()"
+    )
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    reader = subprocess.run(
+        [sys.executable, "-c", script, store.name], env=env, capture_output=True, timeout=60
+    )
+    assert reader.stdout.strip() == b"1.0", reader.stderr
+    # The resource tracker of the reader did not destroy the segment on exit.
+    SharedQuoteStore.attach(store.name).close()
+    assert store.read("ex", "A")["bid"] == 1.0
+
+
+def test_reads_time_out_if_the_writer_died_mid_write(store):
+    store.write("kraken", "BTCUSD", {"bid": 1})
+    # Simulate a writer dying after marking the slot as being written.
+    store._words[store._slots_offset // 8] += 1
+    with pytest.raises(TimeoutError):
+        store.read("kraken", "BTCUSD", timeout=0.01)
@@ -0,0 +1,93 @@
+# Built-in
+from unittest import mock
+
+# Third-party
+import pytest
+
+# Home-brew
+from bitex.request import BitexPreparedRequest
+from bitex.urls import Resolved, SymbolFormat, URLRegistry, URLTemplates, registry
+
+
+@pytest.fixture
+def templates():
+    return URLTemplates(
+        "https://api.uberex.com/v1/",
+        {
+            "ticker": "{base}/ticker/{symbol}",
+            "book": "{base}/depth?symbol={symbol}&raw={instrument}",
+            "order": "{base}/order/{action}",
+            ("order", "new"): "{base}/orders",
+        },
+        symbols=SymbolFormat(separator="-", case="lower", aliases={"BTC": "XBT"}),
+    )
+
+
+@pytest.mark.parametrize(
+    "rules, instrument, expected",
+    [
+        ({}, "btcusd", "BTCUSD"),
+        ({"separator": "_"}, "BTC/USD", "BTC_USD"),
+        ({"case": None, "aliases": {"btc": "XBT"}}, "btc-usd", "XBTusd"),
+        ({"aliases": {"BTCUSD": "XXBTZUSD"}}, "BTCUSD", "XXBTZUSD"),
+    ],
+)
+def test_symbol_format(rules, instrument, expected):
+    assert SymbolFormat(**rules)(instrument) == expected
+
+
+def test_unknown_fields_and_cases_are_rejected():
+    with pytest.raises(ValueError, match="Unknown fields"):
+        URLTemplates("https://uberex.com", {"ticker": "{base}/{pair}"})
+    with pytest.raises(ValueError, match="Unknown case"):
+        SymbolFormat(case="title")
+
+
+def test_templates_resolve_and_cache(templates):
+    assert templates.resolve("BTC/USD", "ticker") == "https://api.uberex.com/v1/ticker/xbt-usd"
+    assert templates.resolve("BTC/USD", "book") == (
+        "https://api.uberex.com/v1/depth?symbol=xbt-usd&raw=BTC/USD"
+    )
+    assert templates.resolve("BTC/USD", "order", "new") == "https://api.uberex.com/v1/orders"
+    assert templates.resolve("BTC/USD", "order", "cancel") == (
+        "https://api.uberex.com/v1/order/cancel"
+    )
+    with pytest.raises(KeyError):
+        templates.resolve("BTC/USD", "trades")
+
+    templates.symbols = mock.Mock(side_effect=AssertionError("Not cached!"))
+    assert templates.resolve("BTC/USD", "ticker") == "https://api.uberex.com/v1/ticker/xbt-usd"
+
+
+def test_static_templates_keep_braces_of_the_base_url():
+    templates = URLTemplates("https://uberex.com/{v1}", {"ticker": "{base}/ticker"})
+    assert templates.resolve("BTCUSD", "ticker") == "https://uberex.com/{v1}/ticker"
+
+
+def test_registry_resolves_shorthands(templates):
+    with mock.patch("bitex.plugins.list_loaded_url_templates", return_value={}) as loaded:
+        urls = URLRegistry()
+        assert urls.resolve("uberex:BTCUSD/ticker") is None
+        urls.register("uberex", templates)
+        assert urls.resolve("uberex://BTCUSD/ticker") == Resolved(
+            "https://api.uberex.com/v1/ticker/btcusd", "uberex", "BTCUSD", "ticker", None
+        )
+        resolved = urls.resolve("uberex:BTCUSD/order/cancel?id=1")
+        assert resolved.url == "https://api.uberex.com/v1/order/cancel?id=1"
+        assert resolved.action == "cancel"
+        assert urls.resolve("uberex:BTCUSD/book?depth=5").url.endswith("raw=BTCUSD&depth=5")
+        assert urls.resolve("uberex:BTCUSD/trades") is None
+        assert urls.resolve("https://uberex.com/ticker") is None
+        assert urls.resolve("megaex:BTCUSD/ticker") is None
+    assert loaded.call_count == 1
+
+
+def test_prepared_requests_resolve_shorthands(templates):
+    registry.register("uberex", templates)
+    try:
+        request = BitexPreparedRequest("uberex")
+        request.prepare(method="GET", url="uberex:BTC-USD/ticker", params={"limit": 5})
+    finally:
+        registry.unregister("uberex")
+    assert request.url == "https://api.uberex.com/v1/ticker/xbt-usd?limit=5"
+    assert (request.instrument, request.endpoint, request.action) == ("BTC-USD", "ticker", None)